@@ -0,0 +1,79 @@
+"""add_hot_path_indexes
+
+Revision ID: 5b1e7c2d9a40
+Revises: 2333bff3264b
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = '2333bff3264b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SALES_WHERE = sa.text("status NOT IN ('cancelled', 'refunded')")
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    ('ix_orders_user_id_created_at', 'orders', ['user_id', 'created_at'], {}),
+    ('ix_orders_created_at', 'orders', ['created_at'], {}),
+    ('ix_orders_status_created_at', 'orders', ['status', 'created_at'], {}),
+    (
+        'ix_orders_created_at_sales',
+        'orders',
+        ['created_at'],
+        {
+            'postgresql_include': ['total_amount'],
+            'postgresql_where': SALES_WHERE,
+            'sqlite_where': SALES_WHERE,
+        },
+    ),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], {}),
+    ('ix_order_items_product_id', 'order_items', ['product_id'], {}),
+    ('ix_inventory_movements_created_at', 'inventory_movements', ['created_at'], {}),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    # Postgres'te CONCURRENTLY: tablo yazmaya kilitlenmez, ama transaction dışında çalışmalı.
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    if_not_exists=True,
+                    postgresql_concurrently=True,
+                    **kwargs,
+                )
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    if_exists=True,
+                    postgresql_concurrently=True,
+                )
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
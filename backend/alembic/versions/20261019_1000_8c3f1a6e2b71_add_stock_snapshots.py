@@ -0,0 +1,43 @@
+"""add_stock_snapshots
+
+Revision ID: 8c3f1a6e2b71
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3f1a6e2b71'
+down_revision: Union[str, None] = '5b1e7c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_snapshots',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_snapshots_taken_at'), 'stock_snapshots', ['taken_at'], unique=False)
+    op.create_index('ix_stock_snapshots_product_variant_taken_at', 'stock_snapshots', ['product_id', 'variant_id', 'taken_at'], unique=False)
+    op.create_index('ix_inventory_movements_product_id_created_at', 'inventory_movements', ['product_id', 'created_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_inventory_movements_variant_id_created_at', 'inventory_movements', ['variant_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_inventory_movements_variant_id_created_at', table_name='inventory_movements', if_exists=True)
+    op.drop_index('ix_inventory_movements_product_id_created_at', table_name='inventory_movements', if_exists=True)
+    op.drop_index('ix_stock_snapshots_product_variant_taken_at', table_name='stock_snapshots')
+    op.drop_index(op.f('ix_stock_snapshots_taken_at'), table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
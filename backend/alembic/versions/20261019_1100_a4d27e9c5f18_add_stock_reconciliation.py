@@ -0,0 +1,48 @@
+"""add_stock_reconciliation
+
+Revision ID: a4d27e9c5f18
+Revises: 8c3f1a6e2b71
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d27e9c5f18'
+down_revision: Union[str, None] = '8c3f1a6e2b71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('reconciliation_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('through', sa.DateTime(), nullable=False),
+    sa.Column('mode', sa.String(length=20), nullable=False),
+    sa.Column('checked', sa.Integer(), nullable=False),
+    sa.Column('mismatches', sa.Integer(), nullable=False),
+    sa.Column('repaired', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reconciliation_runs_finished_at'), 'reconciliation_runs', ['finished_at'], unique=False)
+    op.create_table('ledger_balances',
+    sa.Column('run_id', sa.UUID(), nullable=False),
+    sa.Column('sku_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['run_id'], ['reconciliation_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('run_id', 'sku_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ledger_balances')
+    op.drop_index(op.f('ix_reconciliation_runs_finished_at'), table_name='reconciliation_runs')
+    op.drop_table('reconciliation_runs')
@@ -0,0 +1,61 @@
+"""add_reorder_thresholds
+
+Revision ID: e2a9c47b6d13
+Revises: c6e81b3d0f52
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c47b6d13'
+down_revision: Union[str, None] = 'c6e81b3d0f52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BELOW_THRESHOLD = sa.text("stock <= reorder_threshold AND is_active")
+
+INDEXES = [
+    ('ix_products_below_reorder_threshold', 'products'),
+    ('ix_product_variants_below_reorder_threshold', 'product_variants'),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    # server_default sayesinde mevcut satırlar eski sabit eşik (10) ile dolar
+    for _, table in INDEXES:
+        op.add_column(table, sa.Column('reorder_threshold', sa.Integer(), server_default='10', nullable=False))
+
+    kwargs = {'postgresql_where': BELOW_THRESHOLD, 'sqlite_where': BELOW_THRESHOLD}
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table in INDEXES:
+                op.create_index(
+                    name, table, ['id'], unique=False, if_not_exists=True,
+                    postgresql_concurrently=True, **kwargs,
+                )
+    else:
+        for name, table in INDEXES:
+            op.create_index(name, table, ['id'], unique=False, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table in reversed(INDEXES):
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
+
+    for _, table in reversed(INDEXES):
+        op.drop_column(table, 'reorder_threshold')
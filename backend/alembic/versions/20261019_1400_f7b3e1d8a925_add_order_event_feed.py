@@ -0,0 +1,69 @@
+"""add_order_event_feed
+
+Revision ID: f7b3e1d8a925
+Revises: e2a9c47b6d13
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b3e1d8a925'
+down_revision: Union[str, None] = 'e2a9c47b6d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement başına tek NOTIFY: yük taşımaz, sadece dinleyiciyi uyandırır.
+# NOTIFY commit'te teslim edilir; rollback olan olay hiç duyurulmaz.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_order_events() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('order_events', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFY_TRIGGER = """
+CREATE TRIGGER order_events_notify
+AFTER INSERT ON order_events
+FOR EACH STATEMENT EXECUTE FUNCTION notify_order_events()
+"""
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        op.execute(NOTIFY_FUNCTION)
+        op.execute(NOTIFY_TRIGGER)
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_order_events_created_at_id', 'order_events', ['created_at', 'id'],
+                unique=False, if_not_exists=True, postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(
+            'ix_order_events_created_at_id', 'order_events', ['created_at', 'id'],
+            unique=False, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_order_events_created_at_id', table_name='order_events',
+                if_exists=True, postgresql_concurrently=True,
+            )
+        op.execute('DROP TRIGGER IF EXISTS order_events_notify ON order_events')
+        op.execute('DROP FUNCTION IF EXISTS notify_order_events()')
+    else:
+        op.drop_index('ix_order_events_created_at_id', table_name='order_events', if_exists=True)
@@ -0,0 +1,67 @@
+"""add_product_import
+
+Revision ID: 0d4c8a2f6e37
+Revises: f7b3e1d8a925
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d4c8a2f6e37'
+down_revision: Union[str, None] = 'f7b3e1d8a925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.add_column(sa.Column('sku', sa.String(length=100), nullable=True))
+        batch_op.create_unique_constraint('products_sku_key', ['sku'])
+
+    op.create_table('product_import_jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('format', sa.String(length=10), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('actor_id', sa.UUID(), nullable=True),
+    sa.Column('total_rows', sa.Integer(), nullable=True),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('products_created', sa.Integer(), nullable=False),
+    sa.Column('products_updated', sa.Integer(), nullable=False),
+    sa.Column('variants_created', sa.Integer(), nullable=False),
+    sa.Column('variants_updated', sa.Integer(), nullable=False),
+    sa.Column('error_count', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_import_jobs_status'), 'product_import_jobs', ['status'], unique=False)
+    op.create_table('product_import_errors',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('job_id', sa.UUID(), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['product_import_jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_product_import_errors_job_id_row_number', 'product_import_errors', ['job_id', 'row_number'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_import_errors_job_id_row_number', table_name='product_import_errors')
+    op.drop_table('product_import_errors')
+    op.drop_index(op.f('ix_product_import_jobs_status'), table_name='product_import_jobs')
+    op.drop_table('product_import_jobs')
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_constraint('products_sku_key', type_='unique')
+        batch_op.drop_column('sku')
@@ -0,0 +1,37 @@
+"""add_price_rule_runs
+
+Revision ID: 7e5f2b9c1a48
+Revises: 0d4c8a2f6e37
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e5f2b9c1a48'
+down_revision: Union[str, None] = '0d4c8a2f6e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('price_rule_runs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('rule', sa.JSON(), nullable=False),
+    sa.Column('products_updated', sa.Integer(), nullable=False),
+    sa.Column('variants_updated', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_rule_runs_created_at'), 'price_rule_runs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_price_rule_runs_created_at'), table_name='price_rule_runs')
+    op.drop_table('price_rule_runs')
@@ -0,0 +1,91 @@
+"""add_order_search_indexes
+
+Revision ID: c4e8a2f61b37
+Revises: 9b1d6f4e2c85
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2f61b37'
+down_revision: Union[str, None] = '9b1d6f4e2c85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRACKING_WHERE = sa.text("tracking_number IS NOT NULL")
+
+# (name, table, columns, extra kwargs)
+INDEXES = [
+    (
+        'ix_orders_tracking_number',
+        'orders',
+        ['tracking_number'],
+        {'postgresql_where': TRACKING_WHERE, 'sqlite_where': TRACKING_WHERE},
+    ),
+    ('ix_order_items_variant_id', 'order_items', ['variant_id'], {}),
+]
+
+# Yalnızca Postgres: müşteri e-posta / ad parçası araması (ILIKE '%...%')
+TRGM_INDEXES = [
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_users_full_name_trgm', 'users', 'full_name'),
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    # Postgres'te CONCURRENTLY: tablo yazmaya kilitlenmez, ama transaction dışında çalışmalı.
+    if _is_postgres():
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    if_not_exists=True,
+                    postgresql_concurrently=True,
+                    **kwargs,
+                )
+            for name, table, column in TRGM_INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    [column],
+                    unique=False,
+                    if_not_exists=True,
+                    postgresql_concurrently=True,
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                )
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    # pg_trgm eklentisi bırakılır; başka nesneler kullanıyor olabilir
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(TRGM_INDEXES):
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    if_exists=True,
+                    postgresql_concurrently=True,
+                )
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
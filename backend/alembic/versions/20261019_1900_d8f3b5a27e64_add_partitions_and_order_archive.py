@@ -0,0 +1,269 @@
+"""add_partitions_and_order_archive
+
+Revision ID: d8f3b5a27e64
+Revises: c4e8a2f61b37
+Create Date: 2026-10-19 19:00:00.000000
+
+Postgres:
+- Sipariş arşiv tabloları (*_archive) siparişin ayına göre aylık RANGE
+  partition'lı oluşturulur; ay partition'larını arşivleme komutu açar.
+- inventory_movements aylık partition'lı tabloya taşınır: yeni tablo yanında
+  kurulur, defterdeki aylar + MONTHS_AHEAD ay ve DEFAULT partition'ı açılır,
+  satırlar kopyalanır, eski tablo düşürülür. Kopya süresince tabloya yazma
+  kilitlidir (okuma serbest); büyük defterlerde bakım penceresinde
+  çalıştırın. PK (id, created_at) olur; ref_order_id FK'sı kaldırılır
+  (arşivlenen siparişin referansı korunur).
+
+SQLite: yalnızca arşiv tabloları ve order_archive_stats oluşturulur.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f3b5a27e64'
+down_revision: Union[str, None] = 'c4e8a2f61b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTHS_AHEAD = 3
+
+MOVEMENT_COLUMNS = 'id, product_id, variant_id, change, reason, ref_order_id, notes, created_at'
+
+MOVEMENT_INDEXES = [
+    ('ix_inventory_movements_id', ['id']),
+    ('ix_inventory_movements_product_id', ['product_id']),
+    ('ix_inventory_movements_variant_id', ['variant_id']),
+    ('ix_inventory_movements_created_at', ['created_at']),
+    ('ix_inventory_movements_product_id_created_at', ['product_id', 'created_at']),
+    ('ix_inventory_movements_variant_id_created_at', ['variant_id', 'created_at']),
+]
+
+ARCHIVE_TABLES = [
+    'refunds_archive',
+    'payments_archive',
+    'order_events_archive',
+    'order_items_archive',
+    'orders_archive',
+]
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def _order_created_at() -> sa.Column:
+    return sa.Column('order_created_at', sa.DateTime(timezone=True), nullable=False)
+
+
+def _create_archive_tables() -> None:
+    partitioned = {'postgresql_partition_by': 'RANGE (order_created_at)'}
+    op.create_table('orders_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('shipping_address_id', sa.UUID(), nullable=True),
+    sa.Column('tracking_number', sa.String(length=100), nullable=True),
+    sa.Column('carrier', sa.String(length=100), nullable=True),
+    sa.Column('shipped_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index('ix_orders_archive_user_id_created_at', 'orders_archive', ['user_id', 'created_at'], unique=False)
+    op.create_table('order_items_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('line_total', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    _order_created_at(),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    **partitioned,
+    )
+    op.create_index('ix_order_items_archive_order_id', 'order_items_archive', ['order_id'], unique=False)
+    op.create_table('order_events_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('actor_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    _order_created_at(),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    **partitioned,
+    )
+    op.create_index('ix_order_events_archive_order_id', 'order_events_archive', ['order_id'], unique=False)
+    op.create_table('payments_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('provider', sa.String(length=50), nullable=True),
+    sa.Column('intent_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=10), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    _order_created_at(),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    **partitioned,
+    )
+    op.create_index('ix_payments_archive_order_id', 'payments_archive', ['order_id'], unique=False)
+    op.create_table('refunds_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('payment_id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('provider_refund_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    _order_created_at(),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    **partitioned,
+    )
+    op.create_index('ix_refunds_archive_order_id', 'refunds_archive', ['order_id'], unique=False)
+    op.create_table('order_archive_stats',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'status'),
+    )
+
+
+def _partition_movements() -> None:
+    # Kopya bitene kadar yazma yok; okuma (stok, rapor) devam eder
+    op.execute('LOCK TABLE inventory_movements IN EXCLUSIVE MODE')
+    op.execute("UPDATE inventory_movements SET created_at = timezone('utc', now()) WHERE created_at IS NULL")
+    op.create_table('inventory_movements_partitioned',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=True),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('change', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=100), nullable=False),
+    sa.Column('ref_order_id', sa.UUID(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='inventory_movements_partitioned_pkey'),
+    postgresql_partition_by='RANGE (created_at)',
+    )
+    # Defterdeki ilk aydan bu ay + MONTHS_AHEAD aya kadar; sonrası app.db.partitions
+    op.execute(f"""
+    DO $$
+    DECLARE
+        this_month timestamp := date_trunc('month', timezone('utc', now()));
+        first_month timestamp;
+        m date;
+    BEGIN
+        SELECT coalesce(date_trunc('month', min(created_at)), this_month)
+        INTO first_month
+        FROM inventory_movements;
+        FOR m IN
+            SELECT series::date
+            FROM generate_series(first_month, this_month + interval '{MONTHS_AHEAD} months', interval '1 month') AS series
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF inventory_movements_partitioned FOR VALUES FROM (%L) TO (%L)',
+                'inventory_movements_p' || to_char(m, 'YYYYMM'),
+                m,
+                (m + interval '1 month')::date
+            );
+        END LOOP;
+    END $$
+    """)
+    op.execute('CREATE TABLE inventory_movements_default PARTITION OF inventory_movements_partitioned DEFAULT')
+    op.execute(
+        f'INSERT INTO inventory_movements_partitioned ({MOVEMENT_COLUMNS}) '
+        f'SELECT {MOVEMENT_COLUMNS} FROM inventory_movements'
+    )
+    op.drop_table('inventory_movements')
+    op.rename_table('inventory_movements_partitioned', 'inventory_movements')
+    op.execute(
+        'ALTER TABLE inventory_movements '
+        'RENAME CONSTRAINT inventory_movements_partitioned_pkey TO inventory_movements_pkey'
+    )
+    op.create_foreign_key(
+        'inventory_movements_product_id_fkey', 'inventory_movements', 'products',
+        ['product_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        'inventory_movements_variant_id_fkey', 'inventory_movements', 'product_variants',
+        ['variant_id'], ['id'], ondelete='SET NULL',
+    )
+    for name, columns in MOVEMENT_INDEXES:
+        op.create_index(name, 'inventory_movements', columns, unique=False)
+
+
+def _unpartition_movements() -> None:
+    op.execute('LOCK TABLE inventory_movements IN EXCLUSIVE MODE')
+    op.create_table('inventory_movements_plain',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=True),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('change', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=100), nullable=False),
+    sa.Column('ref_order_id', sa.UUID(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', name='inventory_movements_plain_pkey'),
+    )
+    # Arşivlenmiş siparişlere referans FK'yı geri koyamaz: eski davranış (SET NULL)
+    op.execute(
+        f'INSERT INTO inventory_movements_plain ({MOVEMENT_COLUMNS}) '
+        f'SELECT id, product_id, variant_id, change, reason, '
+        f'CASE WHEN ref_order_id IN (SELECT id FROM orders) THEN ref_order_id END, '
+        f'notes, created_at FROM inventory_movements'
+    )
+    op.drop_table('inventory_movements')  # partition'lar da düşer
+    op.rename_table('inventory_movements_plain', 'inventory_movements')
+    op.execute(
+        'ALTER TABLE inventory_movements '
+        'RENAME CONSTRAINT inventory_movements_plain_pkey TO inventory_movements_pkey'
+    )
+    op.create_foreign_key(
+        'inventory_movements_product_id_fkey', 'inventory_movements', 'products',
+        ['product_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        'inventory_movements_variant_id_fkey', 'inventory_movements', 'product_variants',
+        ['variant_id'], ['id'], ondelete='SET NULL',
+    )
+    op.create_foreign_key(
+        'inventory_movements_ref_order_id_fkey', 'inventory_movements', 'orders',
+        ['ref_order_id'], ['id'], ondelete='SET NULL',
+    )
+    for name, columns in MOVEMENT_INDEXES:
+        op.create_index(name, 'inventory_movements', columns, unique=False)
+
+
+def upgrade() -> None:
+    _create_archive_tables()
+    if _is_postgres():
+        _partition_movements()
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        # Arşivdeki siparişlerin sıcak tablolarda karşılığı yok: sessizce silinmesin
+        op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM orders_archive) THEN
+                RAISE EXCEPTION 'orders_archive is not empty; restore archived orders before downgrading';
+            END IF;
+        END $$
+        """)
+        _unpartition_movements()
+    op.drop_table('order_archive_stats')
+    for table in ARCHIVE_TABLES:
+        op.drop_table(table)
@@ -0,0 +1,144 @@
+"""add_stock_alerts
+
+Revision ID: f1c6d9a3b482
+Revises: d8f3b5a27e64
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6d9a3b482'
+down_revision: Union[str, None] = 'd8f3b5a27e64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Eşik geçişi: aktif ve stock <= reorder_threshold durumuna giriş / çıkış
+STOCK_ALERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION record_stock_alert() RETURNS trigger AS $$
+DECLARE
+    is_low boolean := COALESCE(NEW.is_active, true) AND COALESCE(NEW.stock, 0) <= NEW.reorder_threshold;
+    was_low boolean := false;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        was_low := COALESCE(OLD.is_active, true) AND COALESCE(OLD.stock, 0) <= OLD.reorder_threshold;
+    END IF;
+    IF is_low = was_low THEN
+        RETURN NULL;
+    END IF;
+    IF TG_TABLE_NAME = 'product_variants' THEN
+        INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at)
+        VALUES (gen_random_uuid(), CASE WHEN is_low THEN 'low_stock' ELSE 'restocked' END,
+                NEW.product_id, NEW.id, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold,
+                timezone('utc', clock_timestamp()));
+    ELSE
+        INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at)
+        VALUES (gen_random_uuid(), CASE WHEN is_low THEN 'low_stock' ELSE 'restocked' END,
+                NEW.id, NULL, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold,
+                timezone('utc', clock_timestamp()));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Statement başına tek NOTIFY: yük taşımaz, sadece dinleyiciyi uyandırır
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_stock_alerts() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('stock_alerts', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SKU_TABLES = (
+    ('products', 'NEW.id', 'NULL'),
+    ('product_variants', 'NEW.product_id', 'NEW.id'),
+)
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == 'postgresql'
+
+
+def _sqlite_triggers() -> list[str]:
+    is_low = "(COALESCE({row}.is_active, 1) AND COALESCE({row}.stock, 0) <= {row}.reorder_threshold)"
+    new_low, old_low = is_low.format(row='NEW'), is_low.format(row='OLD')
+    statements = []
+    for table, product_id, variant_id in SKU_TABLES:
+        insert = (
+            "INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at) "
+            f"VALUES (lower(hex(randomblob(16))), CASE WHEN {new_low} THEN 'low_stock' ELSE 'restocked' END, "
+            f"{product_id}, {variant_id}, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold, "
+            "strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+        )
+        statements.append(
+            f"CREATE TRIGGER {table}_stock_alert_insert AFTER INSERT ON {table} "
+            f"WHEN {new_low} BEGIN {insert}; END"
+        )
+        statements.append(
+            f"CREATE TRIGGER {table}_stock_alert_update "
+            f"AFTER UPDATE OF stock, reorder_threshold, is_active ON {table} "
+            f"WHEN {new_low} IS NOT {old_low} BEGIN {insert}; END"
+        )
+    return statements
+
+
+def upgrade() -> None:
+    op.create_table('stock_alerts',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('variant_id', sa.UUID(), nullable=True),
+    sa.Column('name', sa.String(length=255), nullable=True),
+    sa.Column('sku', sa.String(length=100), nullable=True),
+    sa.Column('stock', sa.Integer(), nullable=False),
+    sa.Column('reorder_threshold', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stock_alerts_product_id'), 'stock_alerts', ['product_id'], unique=False)
+    op.create_index(op.f('ix_stock_alerts_variant_id'), 'stock_alerts', ['variant_id'], unique=False)
+    op.create_index('ix_stock_alerts_created_at_id', 'stock_alerts', ['created_at', 'id'], unique=False)
+
+    if _is_postgres():
+        op.execute(STOCK_ALERT_FUNCTION)
+        op.execute(NOTIFY_FUNCTION)
+        for table, _, _ in SKU_TABLES:
+            op.execute(
+                f"CREATE TRIGGER {table}_stock_alert "
+                f"AFTER INSERT OR UPDATE OF stock, reorder_threshold, is_active ON {table} "
+                "FOR EACH ROW EXECUTE FUNCTION record_stock_alert()"
+            )
+        op.execute(
+            "CREATE TRIGGER stock_alerts_notify AFTER INSERT ON stock_alerts "
+            "FOR EACH STATEMENT EXECUTE FUNCTION notify_stock_alerts()"
+        )
+    else:
+        for statement in _sqlite_triggers():
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        for table, _, _ in SKU_TABLES:
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_stock_alert ON {table}')
+        op.execute('DROP TRIGGER IF EXISTS stock_alerts_notify ON stock_alerts')
+        op.execute('DROP FUNCTION IF EXISTS record_stock_alert()')
+        op.execute('DROP FUNCTION IF EXISTS notify_stock_alerts()')
+    else:
+        for table, _, _ in SKU_TABLES:
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_stock_alert_insert')
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_stock_alert_update')
+    op.drop_index('ix_stock_alerts_created_at_id', table_name='stock_alerts')
+    op.drop_index(op.f('ix_stock_alerts_variant_id'), table_name='stock_alerts')
+    op.drop_index(op.f('ix_stock_alerts_product_id'), table_name='stock_alerts')
+    op.drop_table('stock_alerts')
@@ -1,17 +1,30 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from app.core.config import settings
 from app.core.security import decode_access_token
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.crud.user import get_user
 
 
-async def get_db_session(db: AsyncSession = Depends(get_db)) -> AsyncSession:
-    return db
+# /batch alt istekleri (sıralı modda) batch'in session'larını paylaşır
+def _batch_db(request: Request, name: str = "batch_db") -> AsyncSession | None:
+    return getattr(request.state, name, None)
+
+
+async def get_db_session(request: Request, db: AsyncSession = Depends(get_db)) -> AsyncSession:
+    shared = _batch_db(request)
+    return shared if shared is not None else db
+
+
+# Okuma amaçlı endpoint'ler (stats, liste ve detay GET'leri) replikaya yönlenir.
+# Replika yoksa veya gecikmesi fazlaysa primary kullanılır.
+async def get_read_db_session(request: Request, db: AsyncSession = Depends(get_read_db)) -> AsyncSession:
+    shared = _batch_db(request, "batch_read_db")
+    return shared if shared is not None else db
 
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -20,9 +33,15 @@ oauth2_scheme = OAuth2PasswordBearer(
 
 
 async def get_current_user(
+    request: Request,
     db: AsyncSession = Depends(get_db_session),
     token: str = Depends(oauth2_scheme),
 ) -> User:
+    # /batch alt istekleri: kimlik batch isteğinde bir kez doğrulandı
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+
     try:
         payload = decode_access_token(token)
     except ValueError:
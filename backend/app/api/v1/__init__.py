@@ -12,6 +12,7 @@ from app.api.v1.routes_inventory import router as inventory_router
 from app.api.v1.routes_variants import router as variants_router
 from app.api.v1.routes_payments import router as payments_router
 from app.api.v1.routes_images import router as images_router
+from app.api.v1.routes_batch import router as batch_router
 
 api_router = APIRouter()
 
@@ -26,4 +27,5 @@ api_router.include_router(addresses_router, prefix="/addresses", tags=["addresse
 api_router.include_router(inventory_router, prefix="/inventory", tags=["inventory"])
 api_router.include_router(variants_router, prefix="", tags=["variants"])  # Contains /products/{id}/variants and /variants paths
 api_router.include_router(payments_router, prefix="/payments", tags=["payments"])
-api_router.include_router(images_router, prefix="/images", tags=["images"])
\ No newline at end of file
+api_router.include_router(images_router, prefix="/images", tags=["images"])
+api_router.include_router(batch_router, tags=["batch"])  # /batch
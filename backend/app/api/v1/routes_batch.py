@@ -0,0 +1,31 @@
+"""Routes for batching many API calls into one request."""
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user, get_db_session, get_read_db_session
+from app.models.user import User as UserModel
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.services.batch import run_batch
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch_endpoint(
+    body: BatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    read_db: AsyncSession = Depends(get_read_db_session),
+    current_user: UserModel = Depends(get_current_active_user),
+):
+    """
+    Alt istekleri tek çağrıda çalıştırır; her alt istek kendi status / body'sini
+    döner, biri başarısız olsa da batch 200 döner. Yetki kontrolleri alt istek
+    bazında, batch'i çağıran kullanıcıyla yapılır.
+    """
+    if getattr(request.state, "batch_user", None) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batch istekleri iç içe çağrılamaz.",
+        )
+    return {"responses": await run_batch(request, body, current_user, db, read_db)}
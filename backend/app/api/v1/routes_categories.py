@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, get_current_active_user
+from app.api.deps import get_db_session, get_read_db_session, get_current_active_user
 from app.crud.category import (
     get_categories,
     get_category,
@@ -28,7 +28,7 @@ def ensure_admin(user: UserModel):
 
 @router.get("/", response_model=List[CategoryOut])
 async def list_categories(
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user: UserModel = Depends(get_current_active_user),
 ):
     categories = await get_categories(db)
@@ -1,21 +1,34 @@
 """Routes for Inventory management - Admin only."""
+from contextlib import aclosing
+from datetime import date, datetime, time, timezone
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status, Query
+from fastapi.sse import EventSourceResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, get_current_active_admin
+from app.api.deps import get_db_session, get_read_db_session, get_current_active_admin
+from app.core.config import settings
+from app.core.serialization import list_response, with_total_param
 from app.crud.inventory import (
     get_inventory_movements,
+    count_inventory_movements,
     get_low_stock_products,
     get_low_stock_variants,
     adjust_product_stock,
     adjust_variant_stock,
+    stream_inventory_movements,
+    create_stock_snapshots,
+    get_stock_at,
+    get_stock_alert_feed,
 )
-from app.schemas.inventory import InventoryMovementOut
+from app.schemas.inventory import InventoryMovementOut, StockAtOut, StockSnapshotResult
 from app.schemas.product import ProductOut
 from app.schemas.variant import VariantOut
+from app.services.export import LEDGER_FIELDS, export_response, rows_csv, rows_ndjson
+from app.services.feed import follow_feed, parse_cursor
+from app.services.stock_alerts import TOPIC as ALERT_TOPIC
 
 router = APIRouter()
 
@@ -26,7 +39,8 @@ async def list_inventory_movements(
     limit: int = 50,
     product_id: UUID | None = None,
     variant_id: UUID | None = None,
-    db: AsyncSession = Depends(get_db_session),
+    with_total: bool = Depends(with_total_param),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_admin),
 ):
     """Get inventory movement history."""
@@ -37,13 +51,79 @@ async def list_inventory_movements(
         product_id=product_id,
         variant_id=variant_id,
     )
-    return movements
+    total = None
+    if with_total:
+        total = await count_inventory_movements(db, product_id=product_id, variant_id=variant_id)
+    return list_response(InventoryMovementOut, movements, total=total)
+
+
+@router.get("/movements/export")
+async def export_inventory_movements(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: date | None = Query(None, description="Başlangıç tarihi (YYYY-MM-DD, dahil)"),
+    end_date: date | None = Query(None, description="Bitiş tarihi (YYYY-MM-DD, dahil)"),
+    product_id: UUID | None = None,
+    variant_id: UUID | None = None,
+    reason: str | None = None,
+    db: AsyncSession = Depends(get_read_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """Stream the full inventory ledger (oldest first) as NDJSON or CSV."""
+    batches = stream_inventory_movements(
+        db,
+        start=datetime.combine(start_date, time.min) if start_date else None,
+        end=datetime.combine(end_date, time.max) if end_date else None,
+        product_id=product_id,
+        variant_id=variant_id,
+        reason=reason,
+    )
+    if format == "ndjson":
+        body = rows_ndjson(batches, LEDGER_FIELDS)
+    else:
+        body = rows_csv(batches, LEDGER_FIELDS)
+    return export_response(
+        request, body, format, f"inventory-ledger-{start_date or 'all'}-{end_date or 'all'}"
+    )
+
+
+@router.get("/stock-at", response_model=StockAtOut)
+async def get_stock_at_endpoint(
+    at: datetime = Query(..., description="Zaman noktası (ISO 8601, UTC)"),
+    product_id: UUID | None = None,
+    variant_id: UUID | None = None,
+    db: AsyncSession = Depends(get_read_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """Stock of a product or variant at a point in time, from the nearest checkpoint."""
+    if product_id is None and variant_id is None:
+        raise HTTPException(status_code=400, detail="product_id veya variant_id gerekli.")
+    if at.tzinfo is not None:
+        # Ledger naive UTC tutuyor
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    try:
+        return await get_stock_at(db, at, product_id=product_id, variant_id=variant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/snapshots", response_model=StockSnapshotResult, status_code=status.HTTP_201_CREATED)
+async def create_stock_snapshots_endpoint(
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """Checkpoint current stock of every product and variant."""
+    taken_at = datetime.utcnow()
+    count = await create_stock_snapshots(db, taken_at=taken_at)
+    return StockSnapshotResult(taken_at=taken_at, count=count)
 
 
 @router.get("/low-stock")
 async def get_low_stock_items(
-    threshold: int = Query(10, ge=0),
-    db: AsyncSession = Depends(get_db_session),
+    threshold: int | None = Query(
+        None, ge=0, description="Verilmezse her SKU'nun kendi reorder_threshold'u kullanılır"
+    ),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_admin),
 ):
     """Get products and variants with stock below threshold."""
@@ -57,6 +137,38 @@ async def get_low_stock_items(
     }
 
 
+@router.get("/alerts/stream", response_class=EventSourceResponse)
+async def stream_stock_alerts(
+    cursor: str | None = Query(None, description="Bu cursor'dan sonrasını yeniden oynat"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """
+    Eşik geçişlerini (low_stock / restocked) SSE olarak yayınlar; polling yerine.
+    Yeniden bağlanan istemci Last-Event-ID ile kaçırdıklarını alır. Kuyruğu
+    dolan istemciye "overflow" gönderilip akış kapanır; kaçırılan uyarı
+    STOCK_ALERT_REPLAY_LIMIT'i aşarsa "reset" gelir: /low-stock yeniden çekilmeli.
+    """
+    resume_from = cursor or last_event_id
+    try:
+        after = parse_cursor(resume_from) if resume_from else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    events = follow_feed(
+        db,
+        get_stock_alert_feed,
+        ALERT_TOPIC,
+        after,
+        max_queue=settings.STOCK_ALERT_MAX_QUEUE,
+        replay_limit=settings.STOCK_ALERT_REPLAY_LIMIT,
+    )
+    async with aclosing(events):
+        async for event in events:
+            yield event
+
+
 @router.post("/adjust/product/{product_id}", response_model=InventoryMovementOut)
 async def adjust_product_stock_endpoint(
     product_id: UUID,
@@ -1,21 +1,47 @@
-﻿from typing import List
+﻿from contextlib import aclosing
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.sse import EventSourceResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, get_current_active_user
+from app.api.deps import (
+    get_db_session,
+    get_read_db_session,
+    get_current_active_user,
+    get_current_active_admin,
+)
+from app.core.config import settings
+from app.core.serialization import fields_param, list_response, object_response, with_total_param
 from app.crud.order import (
     get_orders,
     get_orders_by_user,
+    count_orders,
     get_order,
+    get_archived_order,
     create_order,
     update_order_status,
+    bulk_update_order_status,
+    stream_order_export_rows,
 )
 from app.crud.user import get_user
 from app.crud.address import get_address
+from app.crud.inventory import get_order_feed
 from app.models.user import User as UserModel
-from app.schemas.order import OrderOut, OrderCreate, OrderUpdateStatus
+from app.schemas.order import (
+    OrderOut,
+    OrderCreate,
+    OrderUpdateStatus,
+    OrderBulkStatusUpdate,
+    OrderBulkStatusResult,
+    OrderSearch,
+)
+from app.services.export import export_response, order_csv, order_ndjson
+from app.services.feed import follow_feed, parse_cursor
+from app.services.order_feed import TOPIC as FEED_TOPIC
 
 router = APIRouter()
 
@@ -28,29 +54,153 @@ def ensure_admin(user: UserModel):
         )
 
 
+def order_search_params(
+    status_filter: str | None = Query(
+        None, alias="status", description="Virgülle ayrılmış durumlar (örn. paid,shipped)"
+    ),
+    start_date: date | None = Query(None, description="Başlangıç tarihi (YYYY-MM-DD, dahil)"),
+    end_date: date | None = Query(None, description="Bitiş tarihi (YYYY-MM-DD, dahil)"),
+    customer: str | None = Query(
+        None, min_length=3, max_length=255, description="Müşteri e-postası ya da adı (parça)"
+    ),
+    product_id: UUID | None = None,
+    sku: str | None = Query(None, max_length=100, description="Ürün ya da varyant SKU'su"),
+    tracking_number: str | None = Query(None, max_length=100),
+    min_total: Decimal | None = Query(None, ge=0),
+    max_total: Decimal | None = Query(None, ge=0),
+) -> OrderSearch | None:
+    """Sipariş listesi arama filtreleri; hiçbiri verilmezse None."""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Başlangıç tarihi bitiş tarihinden sonra olamaz.",
+        )
+    if min_total is not None and max_total is not None and min_total > max_total:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="En düşük tutar en yüksek tutardan büyük olamaz.",
+        )
+    search = OrderSearch(
+        statuses=[s.strip() for s in status_filter.split(",") if s.strip()] if status_filter else None,
+        start=datetime.combine(start_date, time.min) if start_date else None,
+        end=datetime.combine(end_date, time.max) if end_date else None,
+        customer=customer,
+        product_id=product_id,
+        sku=sku,
+        tracking_number=tracking_number,
+        min_total=min_total,
+        max_total=max_total,
+    )
+    return search if search.model_dump(exclude_none=True) else None
+
+
 @router.get("/", response_model=List[OrderOut])
 async def list_orders(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(OrderOut)),
+    search: OrderSearch | None = Depends(order_search_params),
+    with_total: bool = Depends(with_total_param),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user: UserModel = Depends(get_current_active_user),
 ):
     # Admin: tüm siparişleri görsün
     # Non-admin: sadece kendi siparişlerini
-    if current_user.is_superuser:
-        orders = await get_orders(db, skip=skip, limit=limit)
+    owner_id = None if current_user.is_superuser else current_user.id
+    if owner_id is None:
+        orders = await get_orders(db, skip=skip, limit=limit, fields=fields, search=search)
     else:
-        orders = await get_orders_by_user(db, current_user.id, skip=skip, limit=limit)
-    return orders
+        orders = await get_orders_by_user(
+            db, owner_id, skip=skip, limit=limit, fields=fields, search=search
+        )
+    total = await count_orders(db, user_id=owner_id, search=search) if with_total else None
+    # items + events ile büyük liste: response_model'in ikinci doğrulamasını atla
+    return list_response(OrderOut, orders, fields=fields, total=total)
+
+
+@router.get("/export")
+async def export_orders(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    start_date: date | None = Query(None, description="Başlangıç tarihi (YYYY-MM-DD, dahil)"),
+    end_date: date | None = Query(None, description="Bitiş tarihi (YYYY-MM-DD, dahil)"),
+    status_filter: str | None = Query(
+        None, alias="status", description="Virgülle ayrılmış durumlar (örn. paid,shipped)"
+    ),
+    user_id: UUID | None = None,
+    db: AsyncSession = Depends(get_read_db_session),
+    current_user: UserModel = Depends(get_current_active_admin),
+):
+    """
+    Siparişleri kalemleriyle birlikte server-side cursor üzerinden stream eder.
+    ndjson: sipariş başına bir satır; csv: kalem başına bir satır.
+    Accept-Encoding gzip içeriyorsa yanıt anlık sıkıştırılır.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Başlangıç tarihi bitiş tarihinden sonra olamaz.",
+        )
+
+    statuses = [s.strip() for s in status_filter.split(",") if s.strip()] if status_filter else None
+    batches = stream_order_export_rows(
+        db,
+        start=datetime.combine(start_date, time.min) if start_date else None,
+        end=datetime.combine(end_date, time.max) if end_date else None,
+        statuses=statuses,
+        user_id=user_id,
+    )
+    body = order_ndjson(batches) if format == "ndjson" else order_csv(batches)
+    return export_response(
+        request, body, format, f"orders-{start_date or 'all'}-{end_date or 'all'}"
+    )
+
+
+@router.get("/feed", response_class=EventSourceResponse)
+async def order_feed(
+    cursor: str | None = Query(None, description="Bu cursor'dan sonrasını yeniden oynat"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(get_current_active_admin),
+):
+    """
+    Sipariş olaylarını (created, durum, ödeme) commit edildikçe SSE ile iter;
+    listeyi periyodik yeniden çekmenin yerine. Yeniden bağlanan istemci
+    Last-Event-ID ile kaçırdıklarını alır. Kuyruğu dolan istemciye "overflow"
+    gönderilip akış kapanır; tarayıcı otomatik yeniden bağlanıp devam eder.
+    Kaçırılan olay ORDER_FEED_REPLAY_LIMIT'i aşarsa "reset" gelir: liste yeniden çekilmeli.
+    """
+    resume_from = cursor or last_event_id
+    try:
+        after = parse_cursor(resume_from) if resume_from else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    events = follow_feed(
+        db,
+        get_order_feed,
+        FEED_TOPIC,
+        after,
+        max_queue=settings.ORDER_FEED_MAX_QUEUE,
+        replay_limit=settings.ORDER_FEED_REPLAY_LIMIT,
+    )
+    async with aclosing(events):
+        async for event in events:
+            yield event
 
 
 @router.get("/{order_id}", response_model=OrderOut)
 async def get_order_by_id(
     order_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(OrderOut)),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user: UserModel = Depends(get_current_active_user),
 ):
-    order = await get_order(db, order_id)
+    # user_id sahiplik kontrolü için her zaman okunur
+    order = await get_order(db, order_id, fields=fields | {"user_id"} if fields else None)
+    if not order:
+        # Arşivlenmiş (kapanmış, eski) sipariş: salt okunur
+        order = await get_archived_order(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,6 +212,8 @@ async def get_order_by_id(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu siparişi görüntüleme yetkiniz yok.",
         )
+    if fields:
+        return object_response(OrderOut, order, fields)
     return order
 
 
@@ -140,3 +292,17 @@ async def update_order_status_endpoint(
 
     updated = await update_order_status(db, db_obj, body, actor_id=current_user.id)
     return updated
+
+
+@router.post("/bulk-status", response_model=OrderBulkStatusResult)
+async def bulk_update_order_status_endpoint(
+    body: OrderBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db_session),
+    current_user: UserModel = Depends(get_current_active_admin),
+):
+    """
+    Çok sayıda siparişin durumunu (ör. kurye teslim alımı sonrası shipped) tek istekte
+    günceller. Geçerli satırlar uygulanır; bulunamayan / geçersiz geçişli satırlar
+    "rejected" altında döner.
+    """
+    return await bulk_update_order_status(db, body.items, actor_id=current_user.id)
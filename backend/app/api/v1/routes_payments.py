@@ -4,6 +4,7 @@ from uuid import UUID
 from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db_session, get_current_active_user, get_current_active_admin
@@ -17,7 +18,7 @@ from app.crud.payment import (
     create_refund,
     get_refunds_by_order,
 )
-from app.crud.order import get_order
+from app.crud.order import get_order, confirm_order_payment
 from app.crud.inventory import create_order_event
 from app.schemas.payment import (
     PaymentOut,
@@ -124,25 +125,38 @@ async def stripe_webhook(
         if payment:
             await update_payment_status(db, payment, "succeeded")
             
-            # Update order status
-            order = await get_order(db, payment.order_id)
-            if order and order.status == "pending":
-                order.status = "paid"
-                await db.commit()
-                
-                # Create timeline event
+            # pending -> paid; stok rezervasyonu kalıcı düşüşe çevrilir
+            if await confirm_order_payment(db, payment.order_id):
                 await create_order_event(
                     db,
-                    order_id=order.id,
+                    order_id=payment.order_id,
                     event_type="paid",
                     description="Ödeme başarıyla alındı.",
                 )
+            else:
+                order_status = await db.scalar(
+                    select(Order.status).where(Order.id == payment.order_id)
+                )
+                if order_status == "cancelled":
+                    # Örn. rezervasyon süresi dolup stok bırakıldıktan sonra gelen ödeme
+                    await create_order_event(
+                        db,
+                        order_id=payment.order_id,
+                        event_type="payment_after_cancel",
+                        description="Sipariş iptal edildikten sonra ödeme alındı; iade gerekli.",
+                    )
     
     elif event["type"] == "payment_intent.payment_failed":
         intent = event["data"]["object"]
         payment = await get_payment_by_intent(db, intent["id"])
         if payment:
             await update_payment_status(db, payment, "failed")
+            await create_order_event(
+                db,
+                order_id=payment.order_id,
+                event_type="payment_failed",
+                description="Ödeme başarısız oldu.",
+            )
     
     return {"status": "success"}
 
@@ -1,22 +1,39 @@
-﻿from typing import List
+﻿import asyncio
+import os
+import shutil
+import uuid
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, get_current_active_admin, get_current_active_user
+from app.api.deps import get_db_session, get_read_db_session, get_current_active_admin, get_current_active_user
+from app.core.serialization import fields_param, list_response, object_response, with_total_param
 from app.models.order import OrderItem
 from app.crud.product import (
     get_product,
     get_products,
     get_active_products,
+    count_products,
     create_product,
     update_product,
     delete_product,
 )
+from app.crud.price_rule import apply_price_rule, get_price_rule_runs, preview_price_rule
+from app.crud.product_import import (
+    create_import_job,
+    get_import_job,
+    get_import_errors,
+    requeue_import_job,
+)
+from app.db.session import async_session_maker
+from app.schemas.price_rule import PriceRule, PriceRuleResult, PriceRuleRunOut
 from app.schemas.product import ProductOut, ProductCreate, ProductUpdate
+from app.schemas.product_import import ProductImportJobOut, ProductImportErrorOut
 from app.models.product import Product as ProductModel
+from app.services.product_import import FORMATS, import_dir, run_import_job
 
 router = APIRouter()
 
@@ -25,14 +42,19 @@ router = APIRouter()
 async def list_products(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(ProductOut)),
+    with_total: bool = Depends(with_total_param),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),  # Tüm auth'lu kullanıcılar görebilir.
 ):
     if current_user.is_superuser:
-        products = await get_products(db, skip=skip, limit=limit)
+        products = await get_products(db, skip=skip, limit=limit, fields=fields)
     else:
-        products = await get_active_products(db, skip=skip, limit=limit)
-    return products
+        products = await get_active_products(db, skip=skip, limit=limit, fields=fields)
+    total = None
+    if with_total:
+        total = await count_products(db, active_only=not current_user.is_superuser)
+    return list_response(ProductOut, products, fields=fields, total=total)
 
 
 @router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
@@ -45,13 +67,122 @@ async def create_product_endpoint(
     return product
 
 
+@router.post("/import", response_model=ProductImportJobOut, status_code=status.HTTP_202_ACCEPTED)
+async def import_products_endpoint(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """
+    CSV / JSONL katalog dosyasını arka planda içe aktarır (SKU üzerinden upsert).
+    İlerleme GET /products/import/{job_id}, satır hataları .../errors ile izlenir.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Geçersiz dosya tipi. İzin verilenler: {', '.join(FORMATS)}",
+        )
+
+    # Dosya belleğe alınmadan diske kopyalanır; iş yarıda kalırsa buradan devam eder
+    path = os.path.join(import_dir(), f"{uuid.uuid4()}{ext}")
+    with open(path, "wb") as out:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, out, 1024 * 1024)
+
+    job = await create_import_job(
+        db, path=path, format=FORMATS[ext], filename=file.filename, actor_id=current_user.id
+    )
+    background_tasks.add_task(run_import_job, async_session_maker, job.id)
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ProductImportJobOut)
+async def get_import_job_endpoint(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    job = await get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İçe aktarım bulunamadı.")
+    return job
+
+
+@router.get("/import/{job_id}/errors", response_model=List[ProductImportErrorOut])
+async def get_import_errors_endpoint(
+    job_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    return await get_import_errors(db, job_id, skip=skip, limit=limit)
+
+
+@router.post("/import/{job_id}/resume", response_model=ProductImportJobOut)
+async def resume_import_job_endpoint(
+    job_id: UUID,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """Başarısız içe aktarımı son commit edilen chunk'tan devam ettirir."""
+    job = await get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İçe aktarım bulunamadı.")
+    try:
+        job = await requeue_import_job(db, job)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    background_tasks.add_task(run_import_job, async_session_maker, job.id)
+    return job
+
+
+@router.post("/price-rules", response_model=PriceRuleResult)
+async def apply_price_rule_endpoint(
+    rule: PriceRule,
+    dry_run: bool = Query(True, description="true: sadece önizleme; uygulamak için false"),
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """
+    Filtrelenen ürünlere (ve override fiyatlı varyantlarına) yüzde / tutar /
+    kuruş yuvarlama kuralı uygular; ürün başına istek yerine tek UPDATE.
+    Varsayılan dry-run'dır: etkilenecek sayılar ve örnek fiyatlar döner.
+    """
+    if dry_run:
+        return await preview_price_rule(db, rule)
+
+    run = await apply_price_rule(db, rule, actor_id=current_user.id)
+    return PriceRuleResult(
+        dry_run=False,
+        products_matched=run.products_updated,
+        variants_matched=run.variants_updated,
+        run_id=run.id,
+    )
+
+
+@router.get("/price-rules", response_model=List[PriceRuleRunOut])
+async def list_price_rule_runs(
+    skip: int = 0,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db_session),
+    current_user = Depends(get_current_active_admin),
+):
+    """Uygulanmış fiyat kurallarının audit kaydı."""
+    return await get_price_rule_runs(db, skip=skip, limit=limit)
+
+
 @router.get("/{product_id}", response_model=ProductOut)
 async def get_product_by_id(
     product_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(ProductOut)),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),  # Tüm auth'lu kullanıcılar görebilir.
 ):
-    product = await get_product(db, product_id)
+    # is_active görünürlük kontrolü için her zaman okunur
+    product = await get_product(db, product_id, fields=fields | {"is_active"} if fields else None)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,6 +193,8 @@ async def get_product_by_id(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
+    if fields:
+        return object_response(ProductOut, product, fields)
     return product
 
 
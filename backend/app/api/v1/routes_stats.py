@@ -8,10 +8,9 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from app.api.deps import get_db_session, get_current_active_user, get_current_active_admin
+from app.api.deps import get_read_db_session, get_current_active_user, get_current_active_admin
 from app.schemas.stats import OverviewStats
-from app.crud.stats import get_overview_stats
-from app.models.order import Order, OrderItem
+from app.crud.stats import get_overview_stats, order_history, order_item_history
 from app.models.product import Product
 
 router = APIRouter()
@@ -36,7 +35,7 @@ class TopProduct(BaseModel):
 
 @router.get("/overview", response_model=OverviewStats)
 async def get_overview(
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user=Depends(get_current_active_user),
 ) -> OverviewStats:
     data = await get_overview_stats(db)
@@ -48,28 +47,31 @@ async def get_sales_trend(
     start_date: date = Query(..., description="Başlangıç tarihi (YYYY-MM-DD)"),
     end_date: date = Query(..., description="Bitiş tarihi (YYYY-MM-DD)"),
     group_by: str = Query("day", pattern="^(day|week|month)$"),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_admin),
 ):
     """Get sales trend data grouped by day, week, or month."""
+    # Arşivlenmiş siparişler dahil; aralık dışındaki arşiv partition'ları okunmaz
+    orders = order_history()
+
     # Build date format based on grouping
     if group_by == "day":
-        date_format = func.date(Order.created_at)
+        date_format = func.date(orders.c.created_at)
     elif group_by == "week":
-        date_format = func.date_trunc("week", Order.created_at)
+        date_format = func.date_trunc("week", orders.c.created_at)
     else:  # month
-        date_format = func.date_trunc("month", Order.created_at)
+        date_format = func.date_trunc("month", orders.c.created_at)
     
     stmt = (
         select(
             date_format.label("date_group"),
-            func.coalesce(func.sum(Order.total_amount), 0).label("revenue"),
-            func.count(Order.id).label("order_count"),
+            func.coalesce(func.sum(orders.c.total_amount), 0).label("revenue"),
+            func.count(orders.c.id).label("order_count"),
         )
         .where(
-            Order.created_at >= datetime.combine(start_date, datetime.min.time()),
-            Order.created_at <= datetime.combine(end_date, datetime.max.time()),
-            Order.status.notin_(["cancelled", "refunded"]),
+            orders.c.created_at >= datetime.combine(start_date, datetime.min.time()),
+            orders.c.created_at <= datetime.combine(end_date, datetime.max.time()),
+            orders.c.status.notin_(["cancelled", "refunded"]),
         )
         .group_by("date_group")
         .order_by("date_group")
@@ -93,31 +95,32 @@ async def get_top_products(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     limit: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_admin),
 ):
     """Get top selling products by revenue."""
+    # Arşivlenmiş siparişlerin kalemleri dahil
+    items = order_item_history()
     stmt = (
         select(
             Product.id,
             Product.name,
-            func.coalesce(func.sum(OrderItem.line_total), 0).label("total_revenue"),
-            func.coalesce(func.sum(OrderItem.quantity), 0).label("total_quantity"),
+            func.coalesce(func.sum(items.c.line_total), 0).label("total_revenue"),
+            func.coalesce(func.sum(items.c.quantity), 0).label("total_quantity"),
         )
-        .join(OrderItem, Product.id == OrderItem.product_id)
-        .join(Order, OrderItem.order_id == Order.id)
-        .where(Order.status.notin_(["cancelled", "refunded"]))
+        .join(items, Product.id == items.c.product_id)
+        .where(items.c.status.notin_(["cancelled", "refunded"]))
     )
     
     if start_date:
-        stmt = stmt.where(Order.created_at >= datetime.combine(start_date, datetime.min.time()))
+        stmt = stmt.where(items.c.created_at >= datetime.combine(start_date, datetime.min.time()))
     if end_date:
-        stmt = stmt.where(Order.created_at <= datetime.combine(end_date, datetime.max.time()))
+        stmt = stmt.where(items.c.created_at <= datetime.combine(end_date, datetime.max.time()))
     
     stmt = (
         stmt
         .group_by(Product.id, Product.name)
-        .order_by(func.sum(OrderItem.line_total).desc())
+        .order_by(func.sum(items.c.line_total).desc())
         .limit(limit)
     )
     
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
     get_db_session,
+    get_read_db_session,
     get_current_active_user,
     get_current_active_admin,  # 👈 yeni
 )
@@ -26,7 +27,7 @@ router = APIRouter()
 async def list_users(
     skip: int = 0,
     limit: int = 50,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user: UserModel = Depends(get_current_active_admin),  # 👈 admin şart
 ):
     users = await get_users(db, skip=skip, limit=limit)
@@ -54,7 +55,7 @@ async def read_own_profile(
 @router.get("/{user_id}", response_model=UserOut)
 async def get_user_by_id(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user: UserModel = Depends(get_current_active_admin),  # 👈 admin
 ):
     user = await get_user(db, user_id)
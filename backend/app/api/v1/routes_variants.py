@@ -5,7 +5,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db_session, get_current_active_admin, get_current_active_user
+from app.api.deps import get_db_session, get_read_db_session, get_current_active_admin, get_current_active_user
 from app.crud.variant import (
     get_variants_by_product,
     get_variant,
@@ -15,6 +15,7 @@ from app.crud.variant import (
     get_images_by_product,
     get_images_by_variant,
 )
+from app.core.serialization import fields_param, list_response, object_response
 from app.crud.product import get_product
 from app.schemas.variant import VariantOut, VariantCreate, VariantUpdate, ImageOut
 
@@ -26,14 +27,18 @@ router = APIRouter()
 @router.get("/products/{product_id}/variants", response_model=List[VariantOut])
 async def list_product_variants(
     product_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(VariantOut)),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),
 ):
     """Get all variants for a product."""
     product = await get_product(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Ürün bulunamadı.")
-    return await get_variants_by_product(db, product_id)
+    variants = await get_variants_by_product(db, product_id, fields=fields)
+    if fields:
+        return list_response(VariantOut, variants, fields=fields)
+    return variants
 
 
 @router.post("/variants", response_model=VariantOut, status_code=status.HTTP_201_CREATED)
@@ -52,12 +57,15 @@ async def create_variant_endpoint(
 @router.get("/variants/{variant_id}", response_model=VariantOut)
 async def get_variant_endpoint(
     variant_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    fields: frozenset[str] | None = Depends(fields_param(VariantOut)),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),
 ):
-    variant = await get_variant(db, variant_id)
+    variant = await get_variant(db, variant_id, fields=fields)
     if not variant:
         raise HTTPException(status_code=404, detail="Varyant bulunamadı.")
+    if fields:
+        return object_response(VariantOut, variant, fields)
     return variant
 
 
@@ -92,7 +100,7 @@ async def delete_variant_endpoint(
 @router.get("/products/{product_id}/images", response_model=List[ImageOut])
 async def list_product_images(
     product_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),
 ):
     """Get all images for a product."""
@@ -102,7 +110,7 @@ async def list_product_images(
 @router.get("/variants/{variant_id}/images", response_model=List[ImageOut])
 async def list_variant_images(
     variant_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_db_session),
     current_user = Depends(get_current_active_user),
 ):
     """Get all images for a variant."""
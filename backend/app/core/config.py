@@ -42,9 +42,84 @@ class Settings(BaseSettings):
     NEXT_PUBLIC_API_URL: Optional[str] = None
     WARMUP_KEY: Optional[str] = None
 
+    # Keep-warm: startup'ta açılacak bağlantı sayısı ve ping aralığı (0 = kapalı)
+    DB_MIN_CONNECTIONS: int = 2
+    DB_KEEP_WARM_INTERVAL_SECONDS: float = 240.0
+
+    # Paylaşılan HTTP client
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 20.0
+
     # Database – Supabase bağlantısı
     DATABASE_URL: str
 
+    # Read replica'lar (virgülle ayrılmış, opsiyonel)
+    DATABASE_REPLICA_URLS: Optional[str] = None
+    DATABASE_REPLICA_URL_LIST: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 10.0
+
+    @model_validator(mode="after")
+    def build_replica_urls(self):
+        if self.DATABASE_REPLICA_URLS:
+            urls = [
+                item.strip()
+                for item in self.DATABASE_REPLICA_URLS.split(",")
+                if item.strip()
+            ]
+            object.__setattr__(self, "DATABASE_REPLICA_URL_LIST", urls)
+        return self
+
+    # SQL instrumentation (Server-Timing header + loglar)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    SQL_SLOW_REQUEST_MS: float = 200.0
+
+    # Event loop watchdog (opt-in; staging'de bloklayan kodu yakalamak için)
+    LOOP_WATCHDOG_ENABLED: bool = False
+    LOOP_WATCHDOG_THRESHOLD_MS: float = 100.0
+    LOOP_WATCHDOG_INTERVAL_MS: float = 50.0
+
+    # Ödenmemiş (pending) siparişlerin stok rezervasyonu (0 = süresiz, eski davranış)
+    STOCK_RESERVATION_TTL_MINUTES: float = 30.0
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = 60.0
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+
+    # Canlı sipariş akışı (SSE): Postgres'te LISTEN/NOTIFY, diğerlerinde yoklama aralığı (0 = kapalı)
+    ORDER_FEED_POLL_INTERVAL_SECONDS: float = 2.0
+    ORDER_FEED_MAX_QUEUE: int = 200
+    ORDER_FEED_REPLAY_LIMIT: int = 1000
+
+    # Stok uyarı akışı (SSE): aynı LISTEN/yoklama düzeni (0 = kapalı); uyarılar gün cinsinden saklanır (0 = süresiz)
+    STOCK_ALERT_POLL_INTERVAL_SECONDS: float = 2.0
+    STOCK_ALERT_MAX_QUEUE: int = 100
+    STOCK_ALERT_REPLAY_LIMIT: int = 1000
+    STOCK_ALERT_RETENTION_DAYS: float = 30.0
+
+    # Toplu ürün içe aktarımı (CSV / JSONL): yüklenen dosyalar ve chunk başına satır
+    PRODUCT_IMPORT_DIR: str = "imports"
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 1000
+    PRODUCT_IMPORT_POLL_INTERVAL_SECONDS: float = 60.0
+
+    # Idempotency-Key: saklı yanıtların ömrü, yarım kalan isteğin kilidi ve temizlik aralığı (0 = kapalı)
+    IDEMPOTENCY_TTL_HOURS: float = 24.0
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: float = 60.0
+    IDEMPOTENCY_SWEEP_INTERVAL_SECONDS: float = 3600.0
+
+    # Liste toplamları (X-Total-Count): bu sayıya kadar kesin count(*), üstünde planner tahmini
+    LIST_COUNT_EXACT_LIMIT: int = 10000
+    LIST_COUNT_CACHE_TTL_SECONDS: float = 30.0
+
+    # /batch: paralel modda aynı anda çalışan alt istek sayısı
+    BATCH_MAX_CONCURRENCY: int = 8
+
+    # Aylık partition'lar (Postgres): kaç ay ileriye açılır, bakım aralığı (0 = kapalı)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 86400.0
+
+    # Sipariş arşivi: kaç aydan eski kapanmış siparişler taşınır, batch başına sipariş
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 12
+    ORDER_ARCHIVE_BATCH_SIZE: int = 1000
+
     # Stripe Payment Integration
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
@@ -0,0 +1,79 @@
+"""Event loop watchdog: detects coroutines that block the loop and logs their stack."""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.core import metrics
+
+logger = logging.getLogger("app.loop_watchdog")
+
+
+class LoopWatchdog:
+    """
+    Loop üzerinde çalışan bir heartbeat görevi her interval'da zaman damgası yazar;
+    ayrı bir thread bu damgayı izler. Damga threshold'dan uzun süre güncellenmezse
+    loop thread'inin o anki stack'i yakalanıp loglanır (pbkdf2, senkron Stripe çağrıları,
+    senkron dosya yazma gibi bloklayan kodu bulmak için).
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.last_report: str | None = None
+
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._stalled_for = 0.0
+
+    async def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch,
+            name="loop-watchdog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            # Heartbeat zaten interval kadar uyuyor; aşan kısım bloklanma süresi.
+            blocked = time.monotonic() - self._last_beat - self.interval
+            if blocked > self.threshold:
+                if not self._stalled_for:
+                    self._report(blocked)
+                self._stalled_for = max(self._stalled_for, blocked)
+            elif self._stalled_for:
+                metrics.EVENT_LOOP_BLOCK_DURATION.observe(self._stalled_for)
+                self._stalled_for = 0.0
+
+    def _report(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+        self.last_report = stack
+        metrics.EVENT_LOOP_BLOCKED.inc()
+        logger.warning(
+            "Event loop blocked for more than %.0f ms; loop thread stack:\n%s",
+            blocked * 1000,
+            stack,
+        )
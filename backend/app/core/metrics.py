@@ -0,0 +1,130 @@
+"""Prometheus metrics: request latency, in-flight requests, DB pool, cache and event loop."""
+import asyncio
+import os
+
+from fastapi.routing import iter_route_contexts
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Birden fazla uvicorn worker'ı varsa PROMETHEUS_MULTIPROC_DIR ayarlanmalı;
+# her worker metriklerini bu dizine yazar, /metrics hepsini birleştirir.
+MULTIPROCESS_ENABLED = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured DB connection pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "DB connections currently checked out.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "DB connections opened beyond the pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache name and result (hit / miss).",
+    ["cache", "result"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wakeup and the actual wakeup.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Times the loop watchdog saw the event loop blocked past its threshold.",
+)
+EVENT_LOOP_BLOCK_DURATION = Histogram(
+    "event_loop_block_duration_seconds",
+    "Duration of event loop stalls detected by the loop watchdog.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+# id(route) -> prefix'li tam şablon; route'lar uygulama ömrü boyunca yaşar,
+# eşleme ilk bilinmeyen route'ta kurulur
+_route_paths: dict[int, str] = {}
+
+
+def route_template(scope: dict) -> str:
+    """
+    Label olarak gerçek path yerine route şablonu kullanılır
+    (/api/v1/orders/{order_id}); eşleşmeyen path'ler tek etikette toplanır.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # include_router ile eklenen route'larda scope["route"].path router'a
+    # göreli (/{order_id}); tam şablon uygulamanın route bağlamlarından okunur
+    if id(route) not in _route_paths and "app" in scope:
+        for context in iter_route_contexts(scope["app"].routes):
+            _route_paths.setdefault(id(context.original_route), context.path_format or context.path)
+    return _route_paths.get(id(route)) or getattr(route, "path", "unmatched")
+
+
+def observe_request(method: str, route: str, status: int, duration: float) -> None:
+    REQUEST_LATENCY.labels(method=method, route=route, status=str(status)).observe(duration)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def update_pool_metrics(name: str, engine) -> None:
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    DB_POOL_SIZE.labels(pool=name).set(pool.size())
+    DB_POOL_CHECKED_OUT.labels(pool=name).set(pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool=name).set(max(pool.overflow(), 0))
+
+
+async def sample_event_loop_lag(interval: float = 0.5) -> None:
+    """Arka plan görevi: her interval'da uyanma gecikmesini ölçer."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - expected, 0.0))
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROCESS_ENABLED:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    if MULTIPROCESS_ENABLED:
+        multiprocess.mark_process_dead(os.getpid())
+
@@ -0,0 +1,110 @@
+"""Büyük liste endpoint'leri için önceden derlenmiş Pydantic serileştirme."""
+from functools import lru_cache
+from typing import Iterable
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    # TypeAdapter kurulumu pahalı; model başına bir kez derlenir.
+    return TypeAdapter(list[model])
+
+
+def dump_list(model: type[BaseModel], rows: Iterable) -> bytes:
+    """
+    ORM satırlarını doğrudan pydantic-core ile doğrulayıp JSON'a yazar.
+    FastAPI'nin response_model yolundaki ikinci doğrulama ve
+    jsonable_encoder + json.dumps adımları atlanır; çıktı byte olarak aynıdır.
+    """
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(list(rows), from_attributes=True))
+
+
+def list_response(
+    model: type[BaseModel],
+    rows: Iterable,
+    status_code: int = 200,
+    fields: frozenset[str] | None = None,
+    total: tuple[int, bool] | None = None,
+) -> Response:
+    """total: (toplam, kesin mi) verilirse X-Total-Count / X-Total-Count-Exact header'ları eklenir."""
+    if fields is not None:
+        model = partial_model(model, fields)
+    response = Response(
+        content=dump_list(model, rows),
+        status_code=status_code,
+        media_type="application/json",
+    )
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total[0])
+        response.headers["X-Total-Count-Exact"] = "true" if total[1] else "false"
+    return response
+
+
+def object_response(
+    model: type[BaseModel],
+    obj,
+    fields: frozenset[str] | None = None,
+    status_code: int = 200,
+) -> Response:
+    if fields is not None:
+        model = partial_model(model, fields)
+    return Response(
+        content=model.model_validate(obj, from_attributes=True).model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+# ───────────────── Sparse fieldsets ─────────────────
+
+def parse_fields(model: type[BaseModel], fields: str | None) -> frozenset[str] | None:
+    """ "id,name,price" -> alan kümesi; boşsa None (tüm alanlar). id her zaman döner."""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise ValueError(f"Bilinmeyen alan(lar): {', '.join(sorted(unknown))}")
+    return frozenset(requested | {"id"})
+
+
+# Alan kümeleri modelin alanlarının alt kümeleriyle sınırlı; cache sınırsız büyümez
+@lru_cache(maxsize=None)
+def partial_model(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Modelin yalnızca fields içindeki alanlarını (aynı sıra ve tiplerle) içeren kopyası."""
+    definitions = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in fields
+    }
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+
+
+def fields_param(model: type[BaseModel]):
+    """?fields= query parametresi için dependency; bilinmeyen alan 400 döner."""
+
+    def dependency(
+        fields: str | None = Query(
+            None, description="Virgülle ayrılmış alanlar (örn. id,name,price); boşsa tümü"
+        ),
+    ) -> frozenset[str] | None:
+        try:
+            return parse_fields(model, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    return dependency
+
+
+def with_total_param(
+    with_total: bool = Query(False, description="X-Total-Count header'ı ekle (büyük kümelerde tahmini)"),
+) -> bool:
+    """?with_total= query parametresi; sayım app.db.counts.total_count ile yapılır."""
+    return with_total
@@ -0,0 +1,149 @@
+"""CRUD operations for Idempotency-Key records."""
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency import IdempotencyKey
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+def _pk(user_id: UUID, key: str, route: str):
+    return (
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        IdempotencyKey.route == route,
+    )
+
+
+def _reclaimable(record: IdempotencyKey, now: datetime, lock_timeout: timedelta) -> bool:
+    # Süresi dolmuş kayıt ya da worker'ı ölmüş (kilidi bayatlamış) yarım istek
+    if record.expires_at <= now:
+        return True
+    return record.status == IN_PROGRESS and record.created_at <= now - lock_timeout
+
+
+async def claim_idempotency_key(
+    db: AsyncSession,
+    user_id: UUID,
+    key: str,
+    route: str,
+    request_hash: str,
+    ttl: timedelta,
+    lock_timeout: timedelta,
+) -> IdempotencyKey | None:
+    """
+    Anahtarı bu istek adına kilitler ve None döner. Anahtar başka bir istekte
+    (işleniyor ya da tamamlanmış) kullanılıyorsa mevcut kaydı döner.
+    Kilit, primary key üzerindeki INSERT ile alınır; aynı anda gelen iki
+    istekten yalnızca biri kazanır.
+    """
+    while True:
+        now = datetime.utcnow()
+        db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                route=route,
+                request_hash=request_hash,
+                status=IN_PROGRESS,
+                created_at=now,
+                expires_at=now + ttl,
+            )
+        )
+        try:
+            await db.commit()
+            return None
+        except IntegrityError:
+            await db.rollback()
+
+        existing = await db.get(IdempotencyKey, (user_id, key, route), populate_existing=True)
+        if existing is None:
+            # Başarısız istek kaydı arada bıraktı
+            continue
+        if not _reclaimable(existing, now, lock_timeout):
+            return existing
+
+        # Koşullu UPDATE: bayat kaydı yalnızca bir istek devralır
+        result = await db.execute(
+            update(IdempotencyKey)
+            .where(*_pk(user_id, key, route), IdempotencyKey.created_at == existing.created_at)
+            .values(
+                request_hash=request_hash,
+                status=IN_PROGRESS,
+                response_status=None,
+                response_body=None,
+                response_headers=None,
+                created_at=now,
+                expires_at=now + ttl,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount == 1:
+            return None
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    user_id: UUID,
+    key: str,
+    route: str,
+    status_code: int,
+    body: bytes,
+    headers: list[list[str]],
+) -> None:
+    await db.execute(
+        update(IdempotencyKey)
+        .where(*_pk(user_id, key, route), IdempotencyKey.status == IN_PROGRESS)
+        .values(
+            status=COMPLETED,
+            response_status=status_code,
+            response_body=body,
+            response_headers=headers,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def release_idempotency_key(db: AsyncSession, user_id: UUID, key: str, route: str) -> None:
+    """Tamamlanamayan isteğin kilidini bırakır; aynı anahtarla tekrar denenebilir."""
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(*_pk(user_id, key, route), IdempotencyKey.status == IN_PROGRESS)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def delete_expired_idempotency_keys(
+    db: AsyncSession,
+    now: datetime | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """Süresi dolmuş kayıtlardan en fazla batch_size tanesini siler; silinen sayısını döner."""
+    now = now or datetime.utcnow()
+    result = await db.execute(
+        select(IdempotencyKey.user_id, IdempotencyKey.key, IdempotencyKey.route)
+        .where(IdempotencyKey.expires_at <= now)
+        .limit(batch_size)
+    )
+    keys = [tuple(row) for row in result]
+    if not keys:
+        return 0
+    await db.execute(
+        delete(IdempotencyKey)
+        .where(
+            tuple_(IdempotencyKey.user_id, IdempotencyKey.key, IdempotencyKey.route).in_(keys),
+            # Arada devralınan kayıt silinmesin
+            IdempotencyKey.expires_at <= now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return len(keys)
@@ -1,11 +1,15 @@
 """CRUD operations for Inventory and OrderEvent models."""
+from collections import Counter
+from datetime import datetime
 from uuid import UUID
-from typing import Sequence
+from typing import AsyncIterator, Collection, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, bindparam, case, delete, func, insert, null, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.inventory import InventoryMovement, OrderEvent
+from app.db.counts import total_count
+from app.models.inventory import InventoryMovement, OrderEvent, StockAlert, StockReservation, StockSnapshot
+from app.models.order import Order
 from app.models.product import Product
 from app.models.variant import ProductVariant
 from app.schemas.inventory import InventoryMovementCreate, OrderEventCreate
@@ -45,22 +49,43 @@ async def get_inventory_movements(
     return result.scalars().all()
 
 
+async def count_inventory_movements(
+    db: AsyncSession,
+    product_id: UUID | None = None,
+    variant_id: UUID | None = None,
+) -> tuple[int, bool]:
+    stmt = select(InventoryMovement.id)
+    if product_id:
+        stmt = stmt.where(InventoryMovement.product_id == product_id)
+    if variant_id:
+        stmt = stmt.where(InventoryMovement.variant_id == variant_id)
+    return await total_count(db, stmt)
+
+
 async def get_low_stock_products(
     db: AsyncSession,
-    threshold: int = 10,
+    threshold: int | None = None,
 ) -> Sequence[Product]:
-    """Get products with stock below threshold."""
-    stmt = select(Product).where(Product.stock <= threshold, Product.is_active == True)
+    """
+    Get products with stock below threshold.
+    threshold verilmezse ürünün kendi reorder_threshold'u kullanılır (partial index).
+    """
+    limit = Product.reorder_threshold if threshold is None else threshold
+    stmt = select(Product).where(Product.stock <= limit, Product.is_active == True)
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
 async def get_low_stock_variants(
     db: AsyncSession,
-    threshold: int = 10,
+    threshold: int | None = None,
 ) -> Sequence[ProductVariant]:
-    """Get variants with stock below threshold."""
-    stmt = select(ProductVariant).where(ProductVariant.stock <= threshold, ProductVariant.is_active == True)
+    """
+    Get variants with stock below threshold.
+    threshold verilmezse varyantın kendi reorder_threshold'u kullanılır (partial index).
+    """
+    limit = ProductVariant.reorder_threshold if threshold is None else threshold
+    stmt = select(ProductVariant).where(ProductVariant.stock <= limit, ProductVariant.is_active == True)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -118,6 +143,285 @@ async def adjust_variant_stock(
     return movement
 
 
+# ───────────────── Ledger export & point-in-time stock ─────────────────
+
+LEDGER_COLUMNS = (
+    InventoryMovement.id,
+    InventoryMovement.created_at,
+    InventoryMovement.product_id,
+    InventoryMovement.variant_id,
+    InventoryMovement.change,
+    InventoryMovement.reason,
+    InventoryMovement.ref_order_id,
+    InventoryMovement.notes,
+)
+
+
+async def stream_inventory_movements(
+    db: AsyncSession,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    product_id: UUID | None = None,
+    variant_id: UUID | None = None,
+    reason: str | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence]:
+    """Stream the ledger (oldest first) from a server-side cursor in column-tuple batches."""
+    stmt = (
+        select(*LEDGER_COLUMNS)
+        .order_by(InventoryMovement.created_at, InventoryMovement.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if start is not None:
+        stmt = stmt.where(InventoryMovement.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(InventoryMovement.created_at <= end)
+    if product_id is not None:
+        stmt = stmt.where(InventoryMovement.product_id == product_id)
+    if variant_id is not None:
+        stmt = stmt.where(InventoryMovement.variant_id == variant_id)
+    if reason is not None:
+        stmt = stmt.where(InventoryMovement.reason == reason)
+
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+
+async def create_stock_snapshots(
+    db: AsyncSession,
+    taken_at: datetime | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Checkpoint current stock of every product and variant.
+    Rows are read and inserted in batches so memory stays flat for large catalogs.
+    """
+    taken_at = taken_at or datetime.utcnow()
+    count = 0
+    sources = (
+        select(Product.id.label("product_id"), null().label("variant_id"), Product.stock),
+        select(ProductVariant.product_id, ProductVariant.id.label("variant_id"), ProductVariant.stock),
+    )
+    for stmt in sources:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            rows = [
+                {
+                    "product_id": row.product_id,
+                    "variant_id": row.variant_id,
+                    "stock": row.stock,
+                    "taken_at": taken_at,
+                }
+                for row in partition
+            ]
+            await db.execute(insert(StockSnapshot), rows)
+            count += len(rows)
+    await db.commit()
+    return count
+
+
+def latest_snapshot_query(at: datetime, product_id: UUID, variant_id: UUID | None = None) -> Select:
+    """
+    Latest snapshot at or before `at`. product_id is always filtered, also for
+    variants, so the (product_id, variant_id, taken_at) index can be used.
+    """
+    if variant_id is None:
+        variant_filter = StockSnapshot.variant_id.is_(None)
+    else:
+        variant_filter = StockSnapshot.variant_id == variant_id
+    return (
+        select(StockSnapshot.stock, StockSnapshot.taken_at)
+        .where(StockSnapshot.product_id == product_id, variant_filter, StockSnapshot.taken_at <= at)
+        .order_by(StockSnapshot.taken_at.desc())
+        .limit(1)
+    )
+
+
+async def get_stock_at(
+    db: AsyncSession,
+    at: datetime,
+    product_id: UUID | None = None,
+    variant_id: UUID | None = None,
+) -> dict:
+    """
+    Stock of a product (variant_id None) or variant at the given moment.
+
+    Starts from the latest snapshot taken at or before `at` and adds the movements
+    in (snapshot, at]. Without such a snapshot it walks back from current stock,
+    subtracting movements after `at`. Either way only an index range of the ledger
+    is summed, never the full history.
+    """
+    if variant_id is not None:
+        variant = await db.get(ProductVariant, variant_id)
+        if not variant:
+            raise ValueError(f"Variant not found: {variant_id}")
+        product_id = variant.product_id
+        current_stock = variant.stock
+        sku_filter = InventoryMovement.variant_id == variant_id
+    else:
+        product = await db.get(Product, product_id) if product_id else None
+        if not product:
+            raise ValueError(f"Product not found: {product_id}")
+        current_stock = product.stock
+        sku_filter = (InventoryMovement.product_id == product_id) & InventoryMovement.variant_id.is_(None)
+
+    snapshot = (await db.execute(latest_snapshot_query(at, product_id, variant_id))).first()
+
+    delta = func.coalesce(func.sum(InventoryMovement.change), 0)
+    if snapshot is not None:
+        moved = await db.scalar(
+            select(delta).where(
+                sku_filter,
+                InventoryMovement.created_at > snapshot.taken_at,
+                InventoryMovement.created_at <= at,
+            )
+        )
+        stock, source, checkpoint = snapshot.stock + moved, "snapshot", snapshot.taken_at
+    else:
+        moved = await db.scalar(select(delta).where(sku_filter, InventoryMovement.created_at > at))
+        stock, source, checkpoint = current_stock - moved, "current", None
+
+    return {
+        "product_id": product_id,
+        "variant_id": variant_id,
+        "at": at,
+        "stock": stock,
+        "source": source,
+        "checkpoint": checkpoint,
+    }
+
+
+# ───────────────── Stock reservations ─────────────────
+
+async def release_reservations(db: AsyncSession, order_ids: Collection[UUID], reason: str) -> int:
+    """
+    Siparişlerin rezerve ettiği stoğu geri verir: SKU başına tek executemany
+    UPDATE, tek çok satırlı hareket INSERT'i, sonra rezervasyonlar silinir.
+    Commit etmez; siparişlerin kilidi çağıranda olmalı. Serbest bırakılan
+    rezervasyon sayısını döner.
+    """
+    if not order_ids:
+        return 0
+    reservations = (
+        await db.execute(
+            select(
+                StockReservation.order_id,
+                StockReservation.product_id,
+                StockReservation.variant_id,
+                StockReservation.quantity,
+            ).where(StockReservation.order_id.in_(order_ids))
+        )
+    ).all()
+    if not reservations:
+        return 0
+
+    product_qty: Counter = Counter()
+    variant_qty: Counter = Counter()
+    for r in reservations:
+        if r.variant_id is not None:
+            variant_qty[r.variant_id] += r.quantity
+        else:
+            product_qty[r.product_id] += r.quantity
+
+    for model, quantities in ((Product, product_qty), (ProductVariant, variant_qty)):
+        if quantities:
+            table = model.__table__
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(stock=table.c.stock + bindparam("b_quantity")),
+                [{"b_id": sku, "b_quantity": qty} for sku, qty in quantities.items()],
+            )
+
+    await db.execute(
+        insert(InventoryMovement),
+        [
+            {
+                "product_id": r.product_id,
+                "variant_id": r.variant_id,
+                "change": r.quantity,
+                "reason": reason,
+                "ref_order_id": r.order_id,
+            }
+            for r in reservations
+        ],
+    )
+    await db.execute(delete(StockReservation).where(StockReservation.order_id.in_(order_ids)))
+    return len(reservations)
+
+
+async def release_expired_reservations(
+    db: AsyncSession,
+    now: datetime | None = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Release stock held by unpaid orders whose reservation expired and cancel them.
+
+    Picks the oldest expired reservations through the expires_at index, then handles
+    every reservation of those orders together so an order is never half-released.
+    Orders are locked with SKIP LOCKED: a webhook confirming payment at the same
+    moment wins, and concurrent sweepers never release the same order twice.
+    Returns the number of orders handled (released or cleaned up).
+    """
+    now = now or datetime.utcnow()
+    expired = await db.execute(
+        select(StockReservation.order_id)
+        .where(StockReservation.expires_at <= now)
+        .order_by(StockReservation.expires_at)
+        .limit(batch_size)
+    )
+    order_ids = set(expired.scalars())
+    if not order_ids:
+        return 0
+
+    pending_ids = set(
+        (
+            await db.execute(
+                select(Order.id)
+                .where(Order.id.in_(order_ids), Order.status == "pending")
+                .with_for_update(skip_locked=True)
+            )
+        ).scalars()
+    )
+    # Artık pending olmayan siparişlerin rezervasyonu sadece silinir (stok kalıcı düşmüş).
+    stale_ids = set(
+        (
+            await db.execute(
+                select(Order.id).where(
+                    Order.id.in_(order_ids - pending_ids), Order.status != "pending"
+                )
+            )
+        ).scalars()
+    ) if order_ids - pending_ids else set()
+
+    if pending_ids:
+        await release_reservations(db, pending_ids, reason="reservation_expired")
+        await db.execute(
+            update(Order)
+            .where(Order.id.in_(pending_ids))
+            .values(status="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        await db.execute(
+            insert(OrderEvent),
+            [
+                {
+                    "order_id": order_id,
+                    "type": "cancelled",
+                    "description": "Ödeme süresi doldu; rezerve stok serbest bırakıldı.",
+                }
+                for order_id in pending_ids
+            ],
+        )
+
+    if stale_ids:
+        await db.execute(delete(StockReservation).where(StockReservation.order_id.in_(stale_ids)))
+    await db.commit()
+    return len(pending_ids | stale_ids)
+
+
 # ───────────────── OrderEvent (Timeline) ─────────────────
 
 async def create_order_event(
@@ -152,3 +456,73 @@ async def get_order_events(
     )
     result = await db.execute(stmt)
     return result.scalars().all()
+
+
+FEED_COLUMNS = (
+    OrderEvent.id,
+    OrderEvent.order_id,
+    OrderEvent.type,
+    OrderEvent.description,
+    OrderEvent.created_at,
+    Order.user_id,
+    Order.status.label("order_status"),
+    Order.total_amount,
+)
+
+
+def _after_cursor(stmt: Select, model, after_created_at: datetime | None, after_id: UUID | None) -> Select:
+    """(created_at, id) sırasıyla cursor'dan sonrası; (created_at, id) index'i üzerinden okunur."""
+    stmt = stmt.order_by(model.created_at, model.id)
+    if after_created_at is None:
+        return stmt
+    after = model.created_at > after_created_at
+    if after_id is not None:
+        after = or_(after, and_(model.created_at == after_created_at, model.id > after_id))
+    return stmt.where(after)
+
+
+async def get_order_feed(
+    db: AsyncSession,
+    after_created_at: datetime | None = None,
+    after_id: UUID | None = None,
+    limit: int = 1000,
+) -> list[dict]:
+    """
+    (created_at, id) cursor'ından sonraki sipariş olayları, siparişin güncel
+    durumuyla birlikte; ix_order_events_created_at_id üzerinden okunur.
+    """
+    stmt = select(*FEED_COLUMNS).join(Order, Order.id == OrderEvent.order_id)
+    result = await db.execute(_after_cursor(stmt, OrderEvent, after_created_at, after_id).limit(limit))
+    return [dict(row._mapping) for row in result]
+
+
+STOCK_ALERT_COLUMNS = (
+    StockAlert.id,
+    StockAlert.type,
+    case((StockAlert.variant_id.is_(None), "product"), else_="variant").label("kind"),
+    StockAlert.product_id,
+    StockAlert.variant_id,
+    StockAlert.name,
+    StockAlert.sku,
+    StockAlert.stock,
+    StockAlert.reorder_threshold,
+    StockAlert.created_at,
+)
+
+
+async def get_stock_alert_feed(
+    db: AsyncSession,
+    after_created_at: datetime | None = None,
+    after_id: UUID | None = None,
+    limit: int = 1000,
+) -> list[dict]:
+    """(created_at, id) cursor'ından sonraki low_stock / restocked uyarıları."""
+    stmt = _after_cursor(select(*STOCK_ALERT_COLUMNS), StockAlert, after_created_at, after_id)
+    result = await db.execute(stmt.limit(limit))
+    return [dict(row._mapping) for row in result]
+
+
+async def delete_stock_alerts_before(db: AsyncSession, before: datetime) -> int:
+    result = await db.execute(delete(StockAlert).where(StockAlert.created_at < before))
+    await db.commit()
+    return result.rowcount
@@ -1,22 +1,109 @@
-﻿from datetime import datetime
+﻿from datetime import datetime, timedelta
 from decimal import Decimal
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Table, and_, bindparam, delete, false, insert, or_, select, true, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.models.archive import ORDER_CREATED_AT, order_events_archive, order_items_archive, orders_archive
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.models.variant import ProductVariant
-from app.models.inventory import InventoryMovement, OrderEvent
-from app.schemas.order import OrderCreate, OrderUpdateStatus
+from app.core.config import settings
+from app.db.counts import total_count
+from app.db.projection import column_options
+from app.crud.inventory import release_reservations
+from app.models.inventory import InventoryMovement, OrderEvent, StockReservation
+from app.models.user import User
+from app.schemas.order import OrderBulkStatusItem, OrderCreate, OrderSearch, OrderUpdateStatus
 
 
-async def get_orders(db: AsyncSession, skip: int = 0, limit: int = 50):
+def _order_options(fields: frozenset[str] | None = None) -> list:
+    """fields verilirse yalnızca o kolonlar okunur; items / events istenmediyse yüklenmez."""
+    if fields is None:
+        return [selectinload(Order.items), selectinload(Order.events)]
+    options = column_options(Order, fields)
+    if "items" in fields:
+        options.append(selectinload(Order.items))
+    if "events" in fields:
+        options.append(selectinload(Order.events))
+    return options
+
+
+def _like_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def order_search_conditions(
+    search: OrderSearch | None,
+    orders: Table = Order.__table__,
+    items: Table = OrderItem.__table__,
+) -> list:
+    """
+    Arama filtrelerini tek sorguya AND ile eklenecek WHERE koşullarına çevirir.
+    Müşteri / ürün filtreleri join yerine IN (alt sorgu) olur: sipariş satırları
+    çoğalmaz, sayfalama ve sayım aynı kalır. Kullanılan index'ler:
+    status + tarih -> ix_orders_status_created_at, tarih -> ix_orders_created_at,
+    kargo no -> ix_orders_tracking_number, müşteri -> users trigram (pg_trgm),
+    ürün / SKU -> ix_order_items_product_id / ix_order_items_variant_id + unique SKU.
+    orders / items arşiv tablolarıyla (aynı kolonlar) değiştirilebilir.
+    """
+    if search is None:
+        return []
+    conditions = []
+    if search.statuses:
+        conditions.append(orders.c.status.in_(search.statuses))
+    if search.start is not None:
+        conditions.append(orders.c.created_at >= search.start)
+    if search.end is not None:
+        conditions.append(orders.c.created_at <= search.end)
+    if search.min_total is not None:
+        conditions.append(orders.c.total_amount >= search.min_total)
+    if search.max_total is not None:
+        conditions.append(orders.c.total_amount <= search.max_total)
+    if search.tracking_number:
+        conditions.append(orders.c.tracking_number == search.tracking_number)
+    if search.customer:
+        pattern = _like_pattern(search.customer)
+        users = select(User.id).where(
+            or_(
+                User.email.ilike(pattern, escape="\\"),
+                User.full_name.ilike(pattern, escape="\\"),
+            )
+        )
+        conditions.append(orders.c.user_id.in_(users))
+
+    item_conditions = []
+    if search.product_id is not None:
+        item_conditions.append(items.c.product_id == search.product_id)
+    if search.sku:
+        item_conditions.append(
+            or_(
+                items.c.product_id.in_(select(Product.id).where(Product.sku == search.sku)),
+                items.c.variant_id.in_(
+                    select(ProductVariant.id).where(ProductVariant.sku == search.sku)
+                ),
+            )
+        )
+    if item_conditions:
+        conditions.append(orders.c.id.in_(select(items.c.order_id).where(*item_conditions)))
+    return conditions
+
+
+async def get_orders(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    fields: frozenset[str] | None = None,
+    search: OrderSearch | None = None,
+):
     stmt = (
         select(Order)
-        .options(selectinload(Order.items), selectinload(Order.events))
+        .where(*order_search_conditions(search))
+        .options(*_order_options(fields))
         .order_by(Order.created_at.desc())
         .offset(skip)
         .limit(limit)
@@ -25,30 +112,114 @@ async def get_orders(db: AsyncSession, skip: int = 0, limit: int = 50):
     return result.scalars().unique().all()
 
 
-async def get_orders_by_user(db: AsyncSession, user_id: UUID, skip: int = 0, limit: int = 50):
-    """Non-admin kullanıcı için sadece kendi siparişlerini getir."""
-    stmt = (
-        select(Order)
-        .where(Order.user_id == user_id)
-        .options(selectinload(Order.items), selectinload(Order.events))
-        .order_by(Order.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+def _user_order_keys(user_id: UUID, search: OrderSearch | None = None):
+    """
+    Kullanıcının sıcak ve arşivlenmiş siparişleri: (id, created_at, archived).
+    İkisi de (user_id, created_at) index'iyle okunur.
+    """
+    hot = select(Order.id, Order.created_at, false().label("archived")).where(
+        Order.user_id == user_id, *order_search_conditions(search)
     )
-    result = await db.execute(stmt)
-    return result.scalars().unique().all()
+    archived = select(orders_archive.c.id, orders_archive.c.created_at, true().label("archived")).where(
+        orders_archive.c.user_id == user_id,
+        *order_search_conditions(search, orders_archive, order_items_archive),
+    )
+    return union_all(hot, archived).subquery()
+
+
+async def get_orders_by_user(
+    db: AsyncSession,
+    user_id: UUID,
+    skip: int = 0,
+    limit: int = 50,
+    fields: frozenset[str] | None = None,
+    search: OrderSearch | None = None,
+):
+    """
+    Non-admin kullanıcı için sadece kendi siparişlerini getir. Arşivlenmiş
+    siparişler de (salt okunur) aynı created_at sırasıyla listede yer alır.
+    """
+    keys = _user_order_keys(user_id, search)
+    page = (
+        await db.execute(
+            select(keys).order_by(keys.c.created_at.desc(), keys.c.id).offset(skip).limit(limit)
+        )
+    ).all()
+    hot_ids = [row.id for row in page if not row.archived]
+    orders = {}
+    if hot_ids:
+        result = await db.execute(
+            select(Order).where(Order.id.in_(hot_ids)).options(*_order_options(fields))
+        )
+        orders = {order.id: order for order in result.scalars().unique()}
+    orders.update(
+        (order.id, order)
+        for order in await get_archived_orders(db, [row.id for row in page if row.archived])
+    )
+    # Sayfa okunduktan sonra arşive taşınan sipariş atlanır
+    return [orders[row.id] for row in page if row.id in orders]
+
 
+async def count_orders(
+    db: AsyncSession,
+    user_id: UUID | None = None,
+    search: OrderSearch | None = None,
+) -> tuple[int, bool]:
+    if user_id is not None:
+        keys = _user_order_keys(user_id, search)
+        return await total_count(db, select(keys.c.id))
+    return await total_count(db, select(Order.id).where(*order_search_conditions(search)))
 
-async def get_order(db: AsyncSession, order_id: UUID):
+
+async def get_order(db: AsyncSession, order_id: UUID, fields: frozenset[str] | None = None):
     stmt = (
         select(Order)
         .where(Order.id == order_id)
-        .options(selectinload(Order.items), selectinload(Order.events))
+        .options(*_order_options(fields))
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def get_archived_orders(db: AsyncSession, order_ids: Sequence[UUID]) -> list[Order]:
+    """
+    Arşiv tablolarındaki siparişleri kalem ve olaylarıyla okur. Dönen Order
+    nesneleri session'a eklenmez (transient): yalnızca yanıt içindir,
+    güncellenemez. Dosyaya arşivlenenler (--output-dir) burada yoktur.
+    """
+    if not order_ids:
+        return []
+    result = await db.execute(
+        select(orders_archive).where(orders_archive.c.id.in_(order_ids)).order_by(orders_archive.c.created_at)
+    )
+    orders = {row.id: Order(**row._mapping) for row in result}
+    if not orders:
+        return []
+    for order in orders.values():
+        order.items, order.events = [], []
+
+    # Alt tablolar siparişin ayıyla bölünmüş: created_at filtresi partition'ları daraltır
+    created_ats = {order.created_at for order in orders.values()}
+    for archive, model, relation in (
+        (order_items_archive, OrderItem, "items"),
+        (order_events_archive, OrderEvent, "events"),
+    ):
+        columns = [column for column in archive.c if column.name != ORDER_CREATED_AT]
+        result = await db.execute(
+            select(*columns)
+            .where(archive.c.order_id.in_(orders), archive.c[ORDER_CREATED_AT].in_(created_ats))
+            .order_by(archive.c.created_at)
+        )
+        for row in result:
+            getattr(orders[row.order_id], relation).append(model(**row._mapping))
+    return list(orders.values())
+
+
+async def get_archived_order(db: AsyncSession, order_id: UUID) -> Order | None:
+    orders = await get_archived_orders(db, [order_id])
+    return orders[0] if orders else None
+
+
 async def create_order(
     db: AsyncSession,
     data: OrderCreate,
@@ -144,6 +315,20 @@ async def create_order(
         mv.ref_order_id = order.id
         db.add(mv)
 
+    # Ödenmemiş sipariş stoğu süreli tutar; süre dolarsa sweeper geri verir.
+    if order.status == "pending" and settings.STOCK_RESERVATION_TTL_MINUTES > 0:
+        expires_at = datetime.utcnow() + timedelta(minutes=settings.STOCK_RESERVATION_TTL_MINUTES)
+        for oi in order_items:
+            db.add(
+                StockReservation(
+                    order_id=order.id,
+                    product_id=oi.product_id,
+                    variant_id=oi.variant_id,
+                    quantity=oi.quantity,
+                    expires_at=expires_at,
+                )
+            )
+
     db.add(
         OrderEvent(
             order_id=order.id,
@@ -181,6 +366,13 @@ async def update_order_status(
     if data.status == "delivered" and db_obj.delivered_at is None:
         db_obj.delivered_at = datetime.utcnow()
 
+    if previous_status == "pending" and data.status == "cancelled":
+        # Elle iptal: rezerve stok sweeper'daki gibi geri verilir
+        await release_reservations(db, [db_obj.id], reason=RESERVATION_RELEASED)
+    elif previous_status == "pending" and data.status != "pending":
+        # Elle ilerletilen sipariş: rezervasyon kalıcı düşüşe döner
+        await db.execute(delete(StockReservation).where(StockReservation.order_id == db_obj.id))
+
     if previous_status != data.status:
         db.add(
             OrderEvent(
@@ -198,3 +390,221 @@ async def update_order_status(
         .options(selectinload(Order.items), selectinload(Order.events))
     )
     return result.scalar_one()
+
+
+# İptal edilen pending siparişin geri verilen rezervasyonu (sweeper: "reservation_expired")
+RESERVATION_RELEASED = "reservation_released"
+
+# Toplu güncellemede izin verilen geçişler; aynı duruma "geçiş" sadece kargo bilgisini günceller.
+STATUS_TRANSITIONS = {
+    "pending": {"paid", "cancelled"},
+    "paid": {"shipped", "cancelled", "refunded"},
+    "shipped": {"delivered", "refunded"},
+    "delivered": {"refunded"},
+    "cancelled": set(),
+    "refunded": set(),
+}
+
+
+async def bulk_update_order_status(
+    db: AsyncSession,
+    items: Sequence[OrderBulkStatusItem],
+    actor_id: UUID | None = None,
+) -> dict:
+    """
+    Birçok siparişin durumunu sabit sayıda ifadeyle günceller: tek SELECT ... FOR UPDATE,
+    tek executemany UPDATE, rezervasyonlar için tek DELETE (iptallerde sweeper'ın
+    toplu stok iadesi) ve tek çok satırlı OrderEvent INSERT. Geçersiz satırlar
+    reddedilir, geçerliler uygulanır.
+    """
+    rejected: list[dict] = []
+    requested: dict[UUID, OrderBulkStatusItem] = {}
+    for item in items:
+        if item.status not in STATUS_TRANSITIONS:
+            rejected.append({"order_id": item.order_id, "detail": f"Geçersiz durum: {item.status}"})
+        elif item.order_id in requested:
+            rejected.append({"order_id": item.order_id, "detail": "Sipariş listede birden fazla kez var."})
+        else:
+            requested[item.order_id] = item
+
+    current = {}
+    if requested:
+        result = await db.execute(
+            select(
+                Order.id,
+                Order.status,
+                Order.tracking_number,
+                Order.carrier,
+                Order.shipped_at,
+                Order.delivered_at,
+            )
+            .where(Order.id.in_(requested))
+            .with_for_update()
+        )
+        current = {row.id: row for row in result}
+
+    now = datetime.utcnow()
+    updates: list[dict] = []
+    events: list[dict] = []
+    # pending'den çıkanlar: iptal edilenlerin stoğu geri verilir, ilerletilenlerinki kalıcı düşer
+    cancelled: list[UUID] = []
+    advanced: list[UUID] = []
+    for order_id, item in requested.items():
+        row = current.get(order_id)
+        if row is None:
+            rejected.append({"order_id": order_id, "detail": "Sipariş bulunamadı."})
+            continue
+        if item.status != row.status and item.status not in STATUS_TRANSITIONS[row.status]:
+            rejected.append(
+                {"order_id": order_id, "detail": f"Geçersiz geçiş: {row.status} -> {item.status}"}
+            )
+            continue
+
+        updates.append(
+            {
+                "b_id": order_id,
+                "b_status": item.status,
+                "b_tracking_number": item.tracking_number if item.tracking_number is not None else row.tracking_number,
+                "b_carrier": item.carrier if item.carrier is not None else row.carrier,
+                "b_shipped_at": row.shipped_at or (now if item.status == "shipped" else None),
+                "b_delivered_at": row.delivered_at or (now if item.status == "delivered" else None),
+            }
+        )
+        if item.status != row.status:
+            if row.status == "pending":
+                (cancelled if item.status == "cancelled" else advanced).append(order_id)
+            events.append(
+                {
+                    "order_id": order_id,
+                    "type": item.status,
+                    "description": f"Durum güncellendi: {row.status} -> {item.status}.",
+                    "actor_id": actor_id,
+                }
+            )
+
+    if updates:
+        table = Order.__table__
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                status=bindparam("b_status"),
+                tracking_number=bindparam("b_tracking_number"),
+                carrier=bindparam("b_carrier"),
+                shipped_at=bindparam("b_shipped_at"),
+                delivered_at=bindparam("b_delivered_at"),
+            ),
+            updates,
+        )
+    if cancelled:
+        await release_reservations(db, cancelled, reason=RESERVATION_RELEASED)
+    if advanced:
+        await db.execute(delete(StockReservation).where(StockReservation.order_id.in_(advanced)))
+    if events:
+        await db.execute(insert(OrderEvent), events)
+    await db.commit()
+
+    return {
+        "updated": len(events),
+        "unchanged": len(updates) - len(events),
+        "rejected": rejected,
+    }
+
+
+async def confirm_order_payment(db: AsyncSession, order_id: UUID) -> bool:
+    """
+    pending -> paid geçişini koşullu UPDATE ile yapar ve stok rezervasyonunu
+    kalıcı düşüşe çevirir (rezervasyon satırları silinir). Sipariş bu arada
+    sweeper tarafından iptal edildiyse False döner.
+    """
+    result = await db.execute(
+        update(Order)
+        .where(Order.id == order_id, Order.status == "pending")
+        .values(status="paid")
+        .execution_options(synchronize_session="fetch")
+    )
+    if result.rowcount != 1:
+        return False
+    await db.execute(delete(StockReservation).where(StockReservation.order_id == order_id))
+    await db.commit()
+    return True
+
+
+# ───────────────── Export ─────────────────
+
+def _export_select(
+    orders: Table,
+    items: Table,
+    start: datetime | None,
+    end: datetime | None,
+    statuses: Sequence[str] | None,
+    user_id: UUID | None,
+):
+    """Sipariş + kalem satırları; orders / items sıcak ya da arşiv tabloları."""
+    join = items.c.order_id == orders.c.id
+    if ORDER_CREATED_AT in items.c:
+        # Arşiv: kalemler siparişin ayıyla bölünmüş, partition'lar daralır
+        join = and_(join, items.c[ORDER_CREATED_AT] == orders.c.created_at)
+    stmt = (
+        select(
+            orders.c.id.label("order_id"),
+            orders.c.created_at,
+            orders.c.status,
+            orders.c.user_id,
+            User.email.label("user_email"),
+            orders.c.total_amount,
+            orders.c.tracking_number,
+            orders.c.carrier,
+            orders.c.shipped_at,
+            orders.c.delivered_at,
+            items.c.id.label("item_id"),
+            items.c.product_id,
+            items.c.variant_id,
+            items.c.quantity,
+            items.c.unit_price,
+            items.c.line_total,
+        )
+        .select_from(orders)
+        .outerjoin(items, join)
+        .outerjoin(User, User.id == orders.c.user_id)
+    )
+    if start is not None:
+        stmt = stmt.where(orders.c.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(orders.c.created_at <= end)
+    if statuses:
+        stmt = stmt.where(orders.c.status.in_(statuses))
+    if user_id is not None:
+        stmt = stmt.where(orders.c.user_id == user_id)
+    return stmt
+
+
+async def stream_order_export_rows(
+    db: AsyncSession,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    statuses: Sequence[str] | None = None,
+    user_id: UUID | None = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence]:
+    """
+    Sipariş + kalem satırlarını (kalem başına bir satır) server-side cursor ile
+    batch batch döner. ORM nesnesi değil kolon tuple'ı okunur; identity map büyümez,
+    bellek kullanımı sabit kalır. Satırlar (created_at, order_id) sırasındadır,
+    aynı siparişin kalemleri ardışık gelir. Arşivlenmiş siparişler de
+    (orders_archive, UNION ALL) dahildir.
+    """
+    filters = (start, end, statuses, user_id)
+    rows = union_all(
+        _export_select(Order.__table__, OrderItem.__table__, *filters),
+        _export_select(orders_archive, order_items_archive, *filters),
+    ).subquery("order_export")
+    stmt = (
+        select(rows)
+        .order_by(rows.c.created_at, rows.c.order_id, rows.c.item_id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
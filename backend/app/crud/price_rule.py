@@ -0,0 +1,127 @@
+"""Set-based bulk price / activation rules over products and variant overrides."""
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import Integer, Numeric, case, cast, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.price_rule import PriceRuleRun
+from app.models.product import Product
+from app.models.variant import ProductVariant
+from app.schemas.price_rule import PriceRule, PriceRuleFilter
+
+MONEY = Numeric(12, 4)
+
+
+def _floor(expr, dialect: str):
+    # Değer 0'ın altına inmediği için SQLite'ta tam sayıya kesmek floor ile aynı
+    if dialect == "postgresql":
+        return func.floor(expr)
+    return cast(expr, Integer)
+
+
+def price_expression(rule: PriceRule, price, dialect: str):
+    """Kuralı tek bir SQL ifadesine çevirir; UPDATE ve dry-run önizlemesi aynı ifadeyi kullanır."""
+    expr = price
+    if rule.percent is not None:
+        expr = expr * literal(1 + rule.percent / 100, MONEY)
+    if rule.amount is not None:
+        expr = expr + literal(rule.amount, MONEY)
+    expr = func.round(case((expr < 0, 0), else_=expr), 2)
+    if rule.ending is not None:
+        expr = _floor(expr, dialect) + literal(rule.ending, MONEY)
+    return expr
+
+
+def _product_filter(rule_filter: PriceRuleFilter) -> list:
+    conditions = []
+    if rule_filter.category_id is not None:
+        conditions.append(Product.category_id == rule_filter.category_id)
+    if rule_filter.product_ids is not None:
+        conditions.append(Product.id.in_(rule_filter.product_ids))
+    if rule_filter.is_active is not None:
+        conditions.append(Product.is_active.is_(rule_filter.is_active))
+    if rule_filter.min_price is not None:
+        conditions.append(Product.price >= rule_filter.min_price)
+    if rule_filter.max_price is not None:
+        conditions.append(Product.price <= rule_filter.max_price)
+    return conditions
+
+
+def _variant_filter(product_conditions: list) -> list:
+    # Sadece fiyatı override edilmiş varyantlar; diğerleri zaten ürün fiyatını kullanır
+    return [
+        ProductVariant.price_override.is_not(None),
+        ProductVariant.product_id.in_(select(Product.id).where(*product_conditions)),
+    ]
+
+
+async def preview_price_rule(db: AsyncSession, rule: PriceRule, sample_size: int = 20) -> dict:
+    """Hiçbir şey yazmadan etkilenecek satır sayılarını ve örnek fiyatları döner."""
+    conditions = _product_filter(rule.filter)
+    new_price = price_expression(rule, Product.price, db.bind.dialect.name) if rule.changes_price else Product.price
+
+    products_matched = await db.scalar(select(func.count()).select_from(Product).where(*conditions))
+    variants_matched = 0
+    if rule.changes_price and rule.apply_to_variants:
+        variants_matched = await db.scalar(
+            select(func.count()).select_from(ProductVariant).where(*_variant_filter(conditions))
+        )
+    result = await db.execute(
+        select(Product.id, Product.name, Product.price, new_price.label("new_price"))
+        .where(*conditions)
+        .order_by(Product.id)
+        .limit(sample_size)
+    )
+    return {
+        "dry_run": True,
+        "products_matched": products_matched,
+        "variants_matched": variants_matched,
+        "sample": [dict(row._mapping) for row in result],
+    }
+
+
+async def apply_price_rule(
+    db: AsyncSession,
+    rule: PriceRule,
+    actor_id: UUID | None = None,
+) -> PriceRuleRun:
+    """Kuralı ürünlere ve varyant override'larına birer UPDATE ile uygular, audit kaydı yazar."""
+    dialect = db.bind.dialect.name
+    conditions = _product_filter(rule.filter)
+
+    variants_updated = 0
+    # Önce varyantlar: min/max_price filtresi ürünlerin eski fiyatına göre değerlendirilsin
+    if rule.changes_price and rule.apply_to_variants:
+        result = await db.execute(
+            update(ProductVariant)
+            .where(*_variant_filter(conditions))
+            .values(price_override=price_expression(rule, ProductVariant.price_override, dialect))
+            .execution_options(synchronize_session=False)
+        )
+        variants_updated = result.rowcount
+
+    values = {}
+    if rule.changes_price:
+        values["price"] = price_expression(rule, Product.price, dialect)
+    if rule.is_active is not None:
+        values["is_active"] = rule.is_active
+    result = await db.execute(
+        update(Product).where(*conditions).values(**values).execution_options(synchronize_session=False)
+    )
+
+    run = PriceRuleRun(
+        rule=rule.model_dump(mode="json"),
+        products_updated=result.rowcount,
+        variants_updated=variants_updated,
+        actor_id=actor_id,
+    )
+    db.add(run)
+    await db.commit()
+    return run
+
+
+async def get_price_rule_runs(db: AsyncSession, skip: int = 0, limit: int = 50) -> Sequence[PriceRuleRun]:
+    stmt = select(PriceRuleRun).order_by(PriceRuleRun.created_at.desc()).offset(skip).limit(limit)
+    result = await db.execute(stmt)
+    return result.scalars().all()
@@ -4,20 +4,33 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.counts import total_count
+from app.db.projection import column_options
+from app.models.inventory import InventoryMovement
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
 
 
-async def get_product(db: AsyncSession, product_id: UUID) -> Product | None:
-    return await db.get(Product, product_id)
+async def get_product(
+    db: AsyncSession,
+    product_id: UUID,
+    fields: frozenset[str] | None = None,
+) -> Product | None:
+    if fields is None:
+        return await db.get(Product, product_id)
+    result = await db.execute(
+        select(Product).where(Product.id == product_id).options(*column_options(Product, fields))
+    )
+    return result.scalar_one_or_none()
 
 
 async def get_products(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
+    fields: frozenset[str] | None = None,
 ) -> Sequence[Product]:
-    stmt = select(Product).offset(skip).limit(limit)
+    stmt = select(Product).options(*column_options(Product, fields)).offset(skip).limit(limit)
     result = await db.execute(stmt)
     return result.scalars().all()
 
@@ -26,10 +39,12 @@ async def get_active_products(
     db: AsyncSession,
     skip: int = 0,
     limit: int = 50,
+    fields: frozenset[str] | None = None,
 ) -> Sequence[Product]:
     stmt = (
         select(Product)
         .where(Product.is_active.is_(True))
+        .options(*column_options(Product, fields))
         .offset(skip)
         .limit(limit)
     )
@@ -37,16 +52,29 @@ async def get_active_products(
     return result.scalars().all()
 
 
+async def count_products(db: AsyncSession, active_only: bool = False) -> tuple[int, bool]:
+    stmt = select(Product.id)
+    if active_only:
+        stmt = stmt.where(Product.is_active.is_(True))
+    return await total_count(db, stmt)
+
+
 async def create_product(db: AsyncSession, product_in: ProductCreate) -> Product:
     obj = Product(
         name=product_in.name,
+        sku=product_in.sku,
         description=product_in.description,
         price=product_in.price,
         stock=product_in.stock,
+        reorder_threshold=product_in.reorder_threshold,
         is_active=product_in.is_active,
         category_id=product_in.category_id,
     )
     db.add(obj)
+    if obj.stock:
+        # Açılış stoğu da defterde olsun; yoksa reconciliation sapma görür.
+        await db.flush()
+        db.add(InventoryMovement(product_id=obj.id, change=obj.stock, reason="initial"))
     await db.commit()
     await db.refresh(obj)
     return obj
@@ -58,10 +86,21 @@ async def update_product(
     product_in: ProductUpdate,
 ) -> Product:
     data = product_in.model_dump(exclude_unset=True)
+    previous_stock = db_obj.stock
 
     for field, value in data.items():
         setattr(db_obj, field, value)
 
+    if data.get("stock") is not None and data["stock"] != previous_stock:
+        db.add(
+            InventoryMovement(
+                product_id=db_obj.id,
+                change=data["stock"] - previous_stock,
+                reason="adjustment",
+                notes="Ürün güncellemesiyle stok değişti.",
+            )
+        )
+
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -0,0 +1,91 @@
+"""CRUD operations for bulk product import jobs."""
+from datetime import datetime, timedelta
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product_import import ProductImportError, ProductImportJob
+
+# Bu kadar süre heartbeat atmayan "running" iş yarıda kalmış sayılır
+STALE_AFTER = timedelta(minutes=5)
+
+
+async def create_import_job(
+    db: AsyncSession,
+    path: str,
+    format: str,
+    filename: str | None = None,
+    actor_id: UUID | None = None,
+) -> ProductImportJob:
+    obj = ProductImportJob(path=path, format=format, filename=filename, actor_id=actor_id)
+    db.add(obj)
+    await db.commit()
+    await db.refresh(obj)
+    return obj
+
+
+async def get_import_job(db: AsyncSession, job_id: UUID) -> ProductImportJob | None:
+    return await db.get(ProductImportJob, job_id)
+
+
+async def get_import_errors(
+    db: AsyncSession,
+    job_id: UUID,
+    skip: int = 0,
+    limit: int = 100,
+) -> Sequence[ProductImportError]:
+    stmt = (
+        select(ProductImportError)
+        .where(ProductImportError.job_id == job_id)
+        .order_by(ProductImportError.row_number)
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+def _claimable(now: datetime):
+    return or_(
+        ProductImportJob.status == "queued",
+        and_(ProductImportJob.status == "running", ProductImportJob.heartbeat_at < now - STALE_AFTER),
+    )
+
+
+async def get_resumable_import_job_ids(db: AsyncSession) -> list[UUID]:
+    """Bekleyen ve heartbeat'i bayatlamış (worker'ı ölmüş) işler, eskiden yeniye."""
+    result = await db.execute(
+        select(ProductImportJob.id)
+        .where(_claimable(datetime.utcnow()))
+        .order_by(ProductImportJob.created_at)
+    )
+    return list(result.scalars())
+
+
+async def claim_import_job(db: AsyncSession, job_id: UUID) -> bool:
+    """
+    Koşullu UPDATE ile işi bu worker'a alır; birden fazla worker aynı işi
+    aynı anda çalıştıramaz. İş zaten çalışıyor / bitmişse False döner.
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(ProductImportJob)
+        .where(ProductImportJob.id == job_id, _claimable(now))
+        .values(status="running", heartbeat_at=now, error=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def requeue_import_job(db: AsyncSession, job: ProductImportJob) -> ProductImportJob:
+    """Başarısız işi kaldığı checkpoint'ten devam etmek üzere tekrar kuyruğa alır."""
+    if job.status != "failed":
+        raise ValueError("Sadece başarısız içe aktarımlar devam ettirilebilir.")
+    job.status = "queued"
+    job.finished_at = None
+    await db.commit()
+    await db.refresh(job)
+    return job
@@ -1,10 +1,13 @@
 ﻿# app/crud/stats.py
-from sqlalchemy import func, select
+from decimal import Decimal
+
+from sqlalchemy import Subquery, and_, func, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.archive import ArchivedOrderStat, order_items_archive, orders_archive
 from app.models.user import User
 from app.models.product import Product
-from app.models.order import Order
+from app.models.order import Order, OrderItem
 
 
 ORDER_STATUSES = ["pending", "paid", "cancelled", "shipped", "delivered"]
@@ -24,26 +27,29 @@ async def get_overview_stats(db: AsyncSession) -> dict:
     )
     active_products = products_q.scalar_one() or 0
 
-    # Toplam sipariş sayısı
-    orders_q = await db.execute(select(func.count()).select_from(Order))
-    total_orders = orders_q.scalar_one() or 0
-
-    # Sipariş durumlarına göre adetler
+    # Durum başına adet ve tutar: sıcak tablo + arşivlenmiş siparişlerin aylık toplamları.
+    # Toplam sipariş ve ciro (sadece paid/shipped/delivered) aynı satırlardan çıkar.
     status_counts = {status: 0 for status in ORDER_STATUSES}
-    status_q = await db.execute(
-        select(Order.status, func.count(Order.id)).group_by(Order.status)
-    )
-    for status, count in status_q.all():
-        if status in status_counts:
-            status_counts[status] = count
-
-    # Ciro: sadece paid/shipped/delivered
-    revenue_q = await db.execute(
-        select(func.coalesce(func.sum(Order.total_amount), 0))
-        .select_from(Order)
-        .where(Order.status.in_(REVENUE_STATUSES))
-    )
-    total_revenue = float(revenue_q.scalar_one() or 0)
+    total_orders = 0
+    total_revenue = Decimal("0")
+    hot_q = select(
+        Order.status,
+        func.count(Order.id),
+        func.coalesce(func.sum(Order.total_amount), 0),
+    ).group_by(Order.status)
+    archived_q = select(
+        ArchivedOrderStat.status,
+        func.sum(ArchivedOrderStat.order_count),
+        func.coalesce(func.sum(ArchivedOrderStat.revenue), 0),
+    ).group_by(ArchivedOrderStat.status)
+    for stmt in (hot_q, archived_q):
+        for status, count, amount in (await db.execute(stmt)).all():
+            total_orders += count
+            if status in status_counts:
+                status_counts[status] += count
+            if status in REVENUE_STATUSES:
+                total_revenue += Decimal(amount)
+    total_revenue = float(total_revenue)
 
     return {
         "total_revenue": total_revenue,
@@ -52,3 +58,45 @@ async def get_overview_stats(db: AsyncSession) -> dict:
         "active_products": active_products,
         "orders_by_status": status_counts,
     }
+
+
+def order_history() -> Subquery:
+    """
+    Sıcak siparişler + arşiv (UNION ALL). Tarih filtreleri iki tarafa da iner:
+    Postgres arşivde yalnızca aralıktaki ay partition'larını okur.
+    """
+    return union_all(
+        select(Order.id, Order.created_at, Order.status, Order.total_amount),
+        select(
+            orders_archive.c.id,
+            orders_archive.c.created_at,
+            orders_archive.c.status,
+            orders_archive.c.total_amount,
+        ),
+    ).subquery("order_history")
+
+
+def order_item_history() -> Subquery:
+    """Kalemler siparişin tarihi ve durumuyla; sıcak + arşiv (UNION ALL)."""
+    return union_all(
+        select(
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.line_total,
+            Order.created_at,
+            Order.status,
+        ).join(Order, OrderItem.order_id == Order.id),
+        select(
+            order_items_archive.c.product_id,
+            order_items_archive.c.quantity,
+            order_items_archive.c.line_total,
+            orders_archive.c.created_at,
+            orders_archive.c.status,
+        ).join(
+            orders_archive,
+            and_(
+                order_items_archive.c.order_id == orders_archive.c.id,
+                order_items_archive.c.order_created_at == orders_archive.c.created_at,
+            ),
+        ),
+    ).subquery("order_item_history")
@@ -5,6 +5,8 @@ from typing import Sequence
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.projection import column_options
+from app.models.inventory import InventoryMovement
 from app.models.variant import ProductVariant, ProductImage
 from app.schemas.variant import VariantCreate, VariantUpdate, ImageCreate
 
@@ -14,24 +16,47 @@ from app.schemas.variant import VariantCreate, VariantUpdate, ImageCreate
 async def get_variants_by_product(
     db: AsyncSession,
     product_id: UUID,
+    fields: frozenset[str] | None = None,
 ) -> Sequence[ProductVariant]:
     """Get all variants for a product."""
     stmt = (
         select(ProductVariant)
         .where(ProductVariant.product_id == product_id)
+        .options(*column_options(ProductVariant, fields))
         .order_by(ProductVariant.created_at)
     )
     result = await db.execute(stmt)
     return result.scalars().all()
 
 
-async def get_variant(db: AsyncSession, variant_id: UUID) -> ProductVariant | None:
-    return await db.get(ProductVariant, variant_id)
+async def get_variant(
+    db: AsyncSession,
+    variant_id: UUID,
+    fields: frozenset[str] | None = None,
+) -> ProductVariant | None:
+    if fields is None:
+        return await db.get(ProductVariant, variant_id)
+    result = await db.execute(
+        select(ProductVariant)
+        .where(ProductVariant.id == variant_id)
+        .options(*column_options(ProductVariant, fields))
+    )
+    return result.scalar_one_or_none()
 
 
 async def create_variant(db: AsyncSession, data: VariantCreate) -> ProductVariant:
     obj = ProductVariant(**data.model_dump())
     db.add(obj)
+    if obj.stock:
+        await db.flush()
+        db.add(
+            InventoryMovement(
+                product_id=obj.product_id,
+                variant_id=obj.id,
+                change=obj.stock,
+                reason="initial",
+            )
+        )
     await db.commit()
     await db.refresh(obj)
     return obj
@@ -43,8 +68,19 @@ async def update_variant(
     data: VariantUpdate,
 ) -> ProductVariant:
     update_data = data.model_dump(exclude_unset=True)
+    previous_stock = db_obj.stock or 0
     for field, value in update_data.items():
         setattr(db_obj, field, value)
+    if update_data.get("stock") is not None and update_data["stock"] != previous_stock:
+        db.add(
+            InventoryMovement(
+                product_id=db_obj.product_id,
+                variant_id=db_obj.id,
+                change=update_data["stock"] - previous_stock,
+                reason="adjustment",
+                notes="Varyant güncellemesiyle stok değişti.",
+            )
+        )
     await db.commit()
     await db.refresh(db_obj)
     return db_obj
@@ -1,5 +1,5 @@
 # app/db/__init__.py
 from app.db.base import Base
-from app.db.session import engine, async_session_maker, get_db
+from app.db.session import engine, async_session_maker, get_db, get_read_db
 
-__all__ = ["Base", "engine", "async_session_maker", "get_db"]
\ No newline at end of file
+__all__ = ["Base", "engine", "async_session_maker", "get_db", "get_read_db"]
\ No newline at end of file
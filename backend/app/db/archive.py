@@ -0,0 +1,42 @@
+"""
+Kapanmış eski siparişleri arşive taşır (cron ile çalıştırılır).
+
+    python -m app.db.archive                          # ORDER_ARCHIVE_AFTER_MONTHS aydan eskiler -> *_archive
+    python -m app.db.archive --months 24 --output /backups/orders   # -> orders-YYYYMM.ndjson.gz
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.session import async_session_maker, engine
+from app.services.order_archive import archive_orders
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Sipariş arşivleme")
+    parser.add_argument("--months", type=int, default=settings.ORDER_ARCHIVE_AFTER_MONTHS)
+    parser.add_argument("--batch-size", type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--output", type=Path, default=None, help="Tablolar yerine .ndjson.gz dizini")
+    args = parser.parse_args()
+    if args.months < 1:
+        parser.error("--months en az 1 olmalı")
+
+    async with async_session_maker() as db:
+        report = await archive_orders(
+            db,
+            months=args.months,
+            batch_size=args.batch_size,
+            output_dir=args.output,
+        )
+    await engine.dispose()
+
+    print(f"{report.cutoff.date().isoformat()} öncesi {report.orders} sipariş arşivlendi.")
+    for table, count in report.rows.items():
+        print(f"  {table}: {count} satır")
+    for path in report.files:
+        print(f"  -> {path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
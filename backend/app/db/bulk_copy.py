@@ -0,0 +1,15 @@
+"""asyncpg COPY (copy_records_to_table) için satır hazırlığı."""
+import json
+
+
+def copy_value(value):
+    # asyncpg json kolonları için string bekler; dict/list codec'te TypeError verir
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def copy_records(rows: list[dict]) -> tuple[list[str], list[tuple]]:
+    """Aynı anahtarlara sahip dict satırları -> (kolonlar, COPY kayıtları)."""
+    columns = list(rows[0])
+    return columns, [tuple(copy_value(row[name]) for name in columns) for row in rows]
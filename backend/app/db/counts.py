@@ -0,0 +1,98 @@
+"""
+Liste toplamları (X-Total-Count).
+
+Önce LIST_COUNT_EXACT_LIMIT + 1 ile sınırlı bir count(*) çalışır: küçük
+kümelerde sonuç kesindir ve maliyeti limitle sınırlıdır. Küme daha büyükse
+Postgres'te planner tahmini (EXPLAIN) döner; tam tabloyu taramak yerine.
+Sonuçlar filtre imzasına (derlenmiş SQL + parametreler) göre worker başına
+LIST_COUNT_CACHE_TTL_SECONDS boyunca cache'lenir; sayfa değiştirmek tekrar
+saymaz.
+"""
+import json
+import time
+from collections import OrderedDict
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+
+MAX_CACHE_ENTRIES = 1024
+
+
+class CountCache:
+    """Süre sınırlı, boyutu sınırlı (en eski düşer) süreç içi cache."""
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, int, bool]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[int, bool] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total, exact = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return total, exact
+
+    def set(self, key: str, total: int, exact: bool, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, total, exact)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+def _signature(stmt: Select, dialect) -> str:
+    compiled = stmt.compile(dialect=dialect)
+    return compiled.string + "|" + repr(sorted(compiled.params.items()))
+
+
+async def planner_estimate(db: AsyncSession, stmt: Select) -> int:
+    """Postgres planner'ının stmt için tahmini satır sayısı (sorgu çalıştırılmaz)."""
+    connection = await db.connection()
+    compiled = stmt.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    if compiled.positiontup:
+        parameters = tuple(params[name] for name in compiled.positiontup)
+    else:
+        parameters = params
+    result = await connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, parameters)
+    raw = result.scalar_one()
+    document = raw if isinstance(raw, list) else json.loads(raw)
+    return int(document[0]["Plan"]["Plan Rows"])
+
+
+async def total_count(db: AsyncSession, stmt: Select) -> tuple[int, bool]:
+    """
+    stmt: listenin filtreli SELECT'i (sıralama / sayfalama yok sayılır).
+    (toplam, kesin mi) döner.
+    """
+    stmt = stmt.order_by(None).limit(None).offset(None)
+    dialect = db.bind.dialect
+    key = _signature(stmt, dialect)
+    cached = count_cache.get(key)
+    metrics.record_cache("list_count", cached is not None)
+    if cached is not None:
+        return cached
+
+    limit = settings.LIST_COUNT_EXACT_LIMIT
+    total = await db.scalar(select(func.count()).select_from(stmt.limit(limit + 1).subquery()))
+    exact = True
+    if total > limit:
+        if dialect.name == "postgresql":
+            # Planner eksik tahmin etse de en az sayılan kadar satır var
+            total, exact = max(await planner_estimate(db, stmt), total), False
+        else:
+            total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+
+    count_cache.set(key, total, exact, settings.LIST_COUNT_CACHE_TTL_SECONDS)
+    return total, exact
@@ -0,0 +1,90 @@
+"""EXPLAIN helpers for guarding hot query plans against sequential scans."""
+import json
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class QueryPlan:
+    statement: str
+    plan: str
+    seq_scans: list[str]
+
+
+def _sqlite_seq_scans(rows) -> list[str]:
+    # "SCAN orders" = full table scan; "SCAN orders USING INDEX ..." / "SEARCH ..." değil.
+    tables = []
+    for row in rows:
+        detail = row[-1]
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and "USING" not in words:
+            if words[1] not in ("CONSTANT", "SUBQUERY"):
+                tables.append(words[1])
+    return tables
+
+
+def _postgres_seq_scans(node: dict) -> list[str]:
+    tables = []
+    if node.get("Node Type") == "Seq Scan":
+        tables.append(node["Relation Name"])
+    for child in node.get("Plans", []):
+        tables.extend(_postgres_seq_scans(child))
+    return tables
+
+
+async def explain(db: AsyncSession, stmt) -> list[QueryPlan]:
+    """
+    stmt'i bir kez çalıştırır, çalışan her SQL ifadesini (selectinload sorguları dahil)
+    yakalar ve her biri için dialect'e uygun EXPLAIN çıktısını döner.
+    """
+    connection = await db.connection()
+    sync_connection = connection.sync_connection
+    captured: list[tuple[str, object]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(sync_connection, "before_cursor_execute", capture)
+    try:
+        result = await db.execute(stmt)
+        result.all()
+    finally:
+        event.remove(sync_connection, "before_cursor_execute", capture)
+
+    dialect = connection.dialect.name
+    plans = []
+    for statement, parameters in captured:
+        if dialect == "postgresql":
+            result = await connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            )
+            raw = result.scalar_one()
+            document = raw if isinstance(raw, list) else json.loads(raw)
+            plan = document[0]["Plan"]
+            plans.append(QueryPlan(statement, json.dumps(plan, indent=2), _postgres_seq_scans(plan)))
+        else:
+            result = await connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+            rows = result.all()
+            plans.append(
+                QueryPlan(
+                    statement,
+                    "\n".join(str(row[-1]) for row in rows),
+                    _sqlite_seq_scans(rows),
+                )
+            )
+    return plans
+
+
+async def assert_no_seq_scan(db: AsyncSession, stmt, *tables: str) -> None:
+    """Hot sorgu planı verilen tablolardan birinde sequential scan'e düşerse AssertionError."""
+    for query_plan in await explain(db, stmt):
+        regressed = [t for t in query_plan.seq_scans if not tables or t in tables]
+        if regressed:
+            raise AssertionError(
+                f"Sequential scan on {', '.join(regressed)}:\n"
+                f"{query_plan.statement}\n--- plan ---\n{query_plan.plan}"
+            )
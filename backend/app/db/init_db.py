@@ -3,7 +3,9 @@ import asyncio
 
 from sqlalchemy import select
 
+from app.core.config import settings
 from app.db.base import Base
+from app.db.partitions import maintain_partitions
 from app.db.session import engine, async_session_maker
 from app.models.user import User
 from app.models.product import Product
@@ -16,6 +18,8 @@ async def init_db():
     # 1) Tabloları oluştur (tüm modeller Base'e bağlı olmalı)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Postgres: partition'lı tablo, partition'ı açılmadan satır kabul etmez
+    await maintain_partitions(engine, settings.PARTITION_MONTHS_AHEAD)
 
     # 2) İlk admin kullanıcısını ekle (yoksa)
     async with async_session_maker() as session:
@@ -0,0 +1,110 @@
+"""Per-request SQL instrumentation: query count, DB time and N+1 detection."""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class QueryStats:
+    """Bir istek (veya test bloğu) boyunca çalışan SQL ifadelerinin özeti."""
+
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_time * 1000
+
+    @property
+    def slowest_ms(self) -> float:
+        return self.slowest_time * 1000
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """Aynı ifade threshold kez veya daha fazla çalıştıysa muhtemel N+1."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+# İç içe toplayıcılar desteklenir: middleware + assert_max_queries aynı anda sayabilir.
+_collectors: ContextVar[tuple[QueryStats, ...]] = ContextVar("sql_query_collectors", default=())
+
+
+@contextmanager
+def collect_queries():
+    """Blok içinde çalışan SQL ifadelerini yeni bir QueryStats'a toplar."""
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Test yardımcısı: blok limit'ten fazla sorgu çalıştırırsa AssertionError.
+
+        with assert_max_queries(5):
+            await client.get("/api/v1/orders/")
+    """
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        details = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.statements.most_common()
+        )
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {stats.count}:\n{details}"
+        )
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    if not collectors:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    for stats in collectors:
+        stats.record(statement, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is None or not _collectors.get():
+        return
+    start_times = conn.info.get("query_start_time")
+    if start_times:
+        start_times.pop()
@@ -0,0 +1,44 @@
+"""Keeps the DB connection pool (and Neon compute) warm between real requests."""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger("app.keep_warm")
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def prewarm_pool(engine: AsyncEngine, min_connections: int) -> None:
+    """
+    Startup'ta min_connections kadar bağlantıyı aynı anda açar;
+    bağlantılar pool'a geri döner ve ilk gerçek istek handshake maliyeti ödemez.
+    """
+    if min_connections <= 0:
+        return
+    results = await asyncio.gather(
+        *(_ping(engine) for _ in range(min_connections)),
+        return_exceptions=True,
+    )
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(
+            "DB prewarm: %d/%d connections failed: %s",
+            len(failures),
+            min_connections,
+            failures[0],
+        )
+
+
+async def keep_warm(engine: AsyncEngine, interval: float) -> None:
+    """Arka plan görevi: her interval saniyede bir SELECT 1 ile DB'yi uyanık tutar."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await _ping(engine)
+        except Exception as exc:
+            logger.warning("DB keep-warm ping failed: %s", exc)
@@ -0,0 +1,134 @@
+"""
+Aylık RANGE partition bakımı (yalnızca Postgres; diğer veritabanlarında no-op).
+
+    python -m app.db.partitions                  # önümüzdeki PARTITION_MONTHS_AHEAD ay
+    python -m app.db.partitions --months-ahead 6
+
+Sürekli yazılan inventory_movements için aylar önceden açılır; açılmamış bir
+aya düşen satırlar DEFAULT partition'a gider. DEFAULT'ta satırı olan ay için
+partition sonradan açılamaz, bu yüzden bakım ileriye doğru çalışır (uygulama
+içinde partition_maintainer, ya da cron ile bu komut). Sipariş arşivleri
+(app.models.archive) DEFAULT'suzdur; arşivleme taşıyacağı ayları kendisi açar.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.partitions")
+
+# Sürekli yazılan partition'lı tablolar
+HOT_PARTITIONED_TABLES = ("inventory_movements",)
+
+
+def month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    # timestamptz kolonda UTC ay başı; timestamp kolonda offset yok sayılır
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def _partitions(connection: AsyncConnection, table: str) -> set[str]:
+    result = await connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return set(result.scalars())
+
+
+async def ensure_month_partitions(
+    connection: AsyncConnection,
+    table: str,
+    months: Iterable[date],
+    with_default: bool = False,
+) -> list[str]:
+    """Eksik aylık partition'ları açar; açılanların adlarını döner."""
+    if connection.dialect.name != "postgresql":
+        return []
+    existing = await _partitions(connection, table)
+    created = []
+    if with_default and f"{table}_default" not in existing:
+        await connection.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+        created.append(f"{table}_default")
+    for month in sorted({month_start(m) for m in months}):
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        await connection.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def maintain_partitions(engine: AsyncEngine, months_ahead: int, today: date | None = None) -> list[str]:
+    """Sıcak tablolarda bu ay + months_ahead ay için partition'ları açar."""
+    first = month_start(today or datetime.utcnow())
+    months = [add_months(first, i) for i in range(months_ahead + 1)]
+    created = []
+    for table in HOT_PARTITIONED_TABLES:
+        # Tablo başına ayrı transaction: biri başarısız olursa diğerleri yine açılır
+        try:
+            async with engine.begin() as connection:
+                created += await ensure_month_partitions(connection, table, months, with_default=True)
+        except DBAPIError as exc:
+            # Çoğunlukla: DEFAULT partition'da o aya ait satır var
+            logger.warning("Partition maintenance failed for %s: %s", table, exc)
+    return created
+
+
+async def partition_maintainer(engine: AsyncEngine, months_ahead: int, interval: float) -> None:
+    """Arka plan görevi: startup'ta ve her interval saniyede bir ileri ayları açar."""
+    while True:
+        try:
+            created = await maintain_partitions(engine, months_ahead)
+        except Exception as exc:
+            logger.warning("Partition maintenance failed: %s", exc)
+        else:
+            if created:
+                logger.info("Created partitions: %s", ", ".join(created))
+        await asyncio.sleep(interval)
+
+
+async def main() -> None:
+    from app.db.session import engine
+
+    parser = argparse.ArgumentParser(description="Aylık partition bakımı")
+    parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    args = parser.parse_args()
+
+    created = await maintain_partitions(engine, args.months_ahead)
+    await engine.dispose()
+    print(f"{len(created)} partition açıldı." + (f" ({', '.join(created)})" if created else ""))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
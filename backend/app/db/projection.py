@@ -0,0 +1,20 @@
+"""Sparse fieldset'ler için kolon projeksiyonu."""
+from typing import Collection
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def column_options(entity, fields: Collection[str] | None) -> list:
+    """
+    fields None ise boş liste (tüm kolonlar yüklenir). Aksi halde yalnızca
+    fields içindeki kolon attribute'ları SELECT'e girer; primary key her zaman
+    yüklenir. İlişkiler burada ele alınmaz, çağıran ayrıca yükler.
+    """
+    if fields is None:
+        return []
+    mapper = inspect(entity)
+    columns = [getattr(entity, name) for name in sorted(fields) if name in mapper.column_attrs]
+    if not columns:
+        columns = [getattr(entity, column.key) for column in mapper.primary_key]
+    return [load_only(*columns)]
@@ -0,0 +1,46 @@
+"""
+Stok sayaçlarını InventoryMovement defteriyle karşılaştırır (cron ile çalıştırılır).
+
+    python -m app.db.reconcile                   # sadece rapor, fark varsa çıkış kodu 1
+    python -m app.db.reconcile --repair ledger   # sayaçları deftere eşitle
+    python -m app.db.reconcile --repair counter  # farkı düzeltme hareketiyle deftere yaz
+"""
+import argparse
+import asyncio
+import sys
+
+from app.db.session import async_session_maker, engine
+from app.services.stock_reconciliation import reconcile_stock
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Stok reconciliation")
+    parser.add_argument("--repair", choices=["ledger", "counter"], default=None)
+    parser.add_argument("--lag-seconds", type=float, default=60)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    async with async_session_maker() as db:
+        report = await reconcile_stock(
+            db,
+            mode=args.repair or "report",
+            lag_seconds=args.lag_seconds,
+            batch_size=args.batch_size,
+            sample_size=args.samples,
+        )
+    await engine.dispose()
+
+    kind = "artımlı" if report.incremental else "tam"
+    print(
+        f"[{kind}] {report.checked} SKU kontrol edildi, {report.mismatches} fark, "
+        f"{report.repaired} onarıldı (defter watermark: {report.through.isoformat()})"
+    )
+    for m in report.samples:
+        sku = f"variant {m.variant_id}" if m.variant_id else f"product {m.product_id}"
+        print(f"  {sku}: sayaç {m.actual}, defter {m.expected} (fark {m.diff:+d})")
+    return 1 if report.mismatches and report.mode == "report" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,555 @@
+# app/db/seed.py
+"""
+Performans testleri için deterministik, gerçekçi sentetik veri üretici.
+
+    python -m app.db.seed --users 100000 --products 20000 --orders 2000000 --seed 42
+
+- Ürün popülerliği Zipf dağılımı (az sayıda ürün satışların çoğunu alır)
+- Sipariş tarihleri mevsimsel (Kasım/Aralık zirvesi, hafta sonu etkisi)
+- Sipariş durumları yaşa göre gerçekçi karışım (eski siparişler çoğunlukla delivered)
+- Postgres'te COPY, diğer veritabanlarında batch'li executemany
+- Aynı --seed her zaman aynı veriyi üretir
+"""
+import argparse
+import asyncio
+import bisect
+import hashlib
+import random
+import uuid
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.bulk_copy import copy_records
+from app.db.partitions import add_months, ensure_month_partitions, month_start
+from app.models.category import Category
+from app.models.inventory import InventoryMovement, OrderEvent
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment
+from app.models.product import Product
+from app.models.user import User
+from app.models.variant import ProductVariant
+
+CENT = Decimal("0.01")
+# Tüm seed kullanıcılarının şifresi; user0@example.com admin'dir.
+SEED_PASSWORD = "password123"
+
+# Ay bazında sipariş yoğunluğu (Ocak..Aralık)
+MONTH_WEIGHTS = [0.8, 0.7, 0.85, 0.9, 1.0, 0.95, 0.9, 0.95, 1.0, 1.1, 1.6, 1.8]
+# Pazartesi..Pazar
+WEEKDAY_WEIGHTS = [0.9, 0.95, 0.95, 1.0, 1.1, 1.25, 1.15]
+
+# 14 günden eski siparişler çoğunlukla kapanmış olur
+OLD_STATUS_MIX = {
+    "delivered": 78,
+    "cancelled": 8,
+    "refunded": 4,
+    "shipped": 5,
+    "paid": 3,
+    "pending": 2,
+}
+RECENT_STATUS_MIX = {
+    "pending": 15,
+    "paid": 35,
+    "shipped": 35,
+    "delivered": 10,
+    "cancelled": 5,
+}
+STATUS_TIMELINE = {
+    "pending": [],
+    "paid": ["paid"],
+    "shipped": ["paid", "shipped"],
+    "delivered": ["paid", "shipped", "delivered"],
+    "cancelled": ["cancelled"],
+    "refunded": ["paid", "shipped", "delivered", "refunded"],
+}
+PAID_STATUSES = {"paid", "shipped", "delivered", "refunded"}
+CARRIERS = ["Yurtiçi Kargo", "Aras Kargo", "MNG Kargo", "PTT Kargo", "UPS"]
+
+# Yazılan tablolar, FK bağımlılık sırasıyla
+SEED_TABLES = (
+    User.__table__,
+    Category.__table__,
+    Product.__table__,
+    ProductVariant.__table__,
+    Order.__table__,
+    OrderItem.__table__,
+    OrderEvent.__table__,
+    Payment.__table__,
+    InventoryMovement.__table__,
+)
+
+
+@dataclass
+class SeedConfig:
+    users: int = 1000
+    products: int = 500
+    orders: int = 10000
+    categories: int = 20
+    max_variants_per_product: int = 4
+    variant_product_ratio: float = 0.4
+    max_items_per_order: int = 5
+    product_zipf_s: float = 1.1
+    customer_zipf_s: float = 0.6
+    start: date = date(2024, 1, 1)
+    end: date = date(2026, 1, 1)
+    batch_size: int = 5000
+    seed: int = 42
+
+
+@dataclass
+class Catalog:
+    """Sipariş üretimi için ürün başına yalnızca fiyat/stok; id'ler entity_id ile türetilir."""
+
+    prices: list[Decimal] = field(default_factory=list)
+    stocks: array = field(default_factory=lambda: array("l"))
+    # Yalnızca varyantlı ürünler: ürün indeksi -> [(birim fiyat, stok), ...]
+    variants: dict[int, list[tuple[Decimal, int]]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class ZipfSampler:
+    """0..n-1 arası indeks; k. sıradakinin ağırlığı 1 / (k+1)^s."""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.rng = rng
+        self.cumulative = []
+        total = 0.0
+        for k in range(n):
+            total += 1.0 / (k + 1) ** s
+            self.cumulative.append(total)
+        self.total = total
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.total)
+
+
+class BulkWriter:
+    """Satırları tablo bazında biriktirir; Postgres'te COPY, diğerlerinde executemany."""
+
+    def __init__(self, connection: AsyncConnection):
+        self.connection = connection
+        self.is_postgres = connection.dialect.name == "postgresql"
+        self.buffers: dict = {}
+        self.counts: dict[str, int] = {}
+        self.pending = 0
+
+    def add(self, table, row: dict) -> None:
+        self.buffers.setdefault(table, []).append(row)
+        self.pending += 1
+
+    async def flush_if_full(self, batch_size: int) -> None:
+        if self.pending >= batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        # FK sırası: buffers dict'e eklenme sırası = parent'tan child'a
+        for table, rows in self.buffers.items():
+            if not rows:
+                continue
+            if self.is_postgres:
+                columns, records = copy_records(rows)
+                raw = await self.connection.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    table.name,
+                    records=records,
+                    columns=columns,
+                )
+            else:
+                await self.connection.execute(table.insert(), rows)
+            self.counts[table.name] = self.counts.get(table.name, 0) + len(rows)
+            rows.clear()
+        self.pending = 0
+        await self.connection.commit()
+
+
+class DatasetGenerator:
+    def __init__(self, config: SeedConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        # Satılan adetler; initial stok hareketleri ledger ile tutarlı olsun diye
+        self.sold_products: dict[int, int] = {}
+        self.sold_variants: dict[tuple[int, int], int] = {}
+
+    # ───────────────── helpers ─────────────────
+
+    def entity_id(self, kind: str, index: int) -> uuid.UUID:
+        """Kullanıcı/ürün/varyant id'leri seed + indeksten türetilir; bellekte tutulmaz."""
+        digest = hashlib.md5(f"{self.config.seed}:{kind}:{index}".encode()).digest()
+        return uuid.UUID(bytes=digest, version=4)
+
+    def random_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def money(self, value: float) -> Decimal:
+        return Decimal(value).quantize(CENT)
+
+    def seasonal_datetime(self) -> datetime:
+        start = datetime.combine(self.config.start, time.min, tzinfo=timezone.utc)
+        span = (self.config.end - self.config.start).total_seconds()
+        max_weight = max(MONTH_WEIGHTS) * max(WEEKDAY_WEIGHTS)
+        while True:
+            moment = start + timedelta(seconds=self.rng.random() * span)
+            weight = MONTH_WEIGHTS[moment.month - 1] * WEEKDAY_WEIGHTS[moment.weekday()]
+            if self.rng.random() * max_weight <= weight:
+                return moment
+
+    def pick_status(self, created_at: datetime) -> str:
+        end = datetime.combine(self.config.end, time.min, tzinfo=timezone.utc)
+        mix = RECENT_STATUS_MIX if end - created_at < timedelta(days=14) else OLD_STATUS_MIX
+        return self.rng.choices(list(mix), weights=list(mix.values()))[0]
+
+    # ───────────────── catalog ─────────────────
+
+    async def generate_catalog(self, writer: BulkWriter) -> Catalog:
+        """Kullanıcı/kategori/ürün/varyant satırları batch_size'da bir yazılır; bellekte Catalog kalır."""
+        cfg = self.config
+        created = datetime.combine(cfg.start, time.min, tzinfo=timezone.utc)
+        # Hash bir kez hesaplanır; pbkdf2 her satır için çok pahalı olurdu.
+        hashed_password = get_password_hash(SEED_PASSWORD)
+
+        for i in range(cfg.users):
+            writer.add(
+                User.__table__,
+                {
+                    "id": self.entity_id("user", i),
+                    "email": f"user{i}@example.com",
+                    "full_name": f"Test Kullanıcı {i}",
+                    "hashed_password": hashed_password,
+                    "is_active": i == 0 or self.rng.random() > 0.03,
+                    "is_superuser": i == 0,
+                    "created_at": created,
+                    "updated_at": created,
+                },
+            )
+            await writer.flush_if_full(cfg.batch_size)
+
+        for i in range(cfg.categories):
+            writer.add(
+                Category.__table__,
+                {
+                    "id": self.entity_id("category", i),
+                    "name": f"Kategori {i}",
+                    "description": None,
+                    "created_at": created,
+                    "updated_at": created,
+                },
+            )
+            await writer.flush_if_full(cfg.batch_size)
+
+        catalog = Catalog()
+        for p in range(cfg.products):
+            price = self.money(min(self.rng.lognormvariate(4.0, 0.9), 99999))
+            variant_count = 0
+            if self.rng.random() < cfg.variant_product_ratio:
+                variant_count = self.rng.randint(2, max(cfg.max_variants_per_product, 2))
+            stock = self.rng.randint(0, 500)
+            writer.add(
+                Product.__table__,
+                {
+                    "id": self.entity_id("product", p),
+                    "name": f"Ürün {p}",
+                    "description": None,
+                    "price": price,
+                    "stock": 0 if variant_count else stock,
+                    "is_active": self.rng.random() > 0.05,
+                    "category_id": self.entity_id("category", self.rng.randrange(cfg.categories))
+                    if cfg.categories
+                    else None,
+                    "created_at": created,
+                    "updated_at": created,
+                },
+            )
+            variants = []
+            for v in range(variant_count):
+                override = (
+                    self.money(float(price) * self.rng.uniform(0.9, 1.3))
+                    if self.rng.random() < 0.3
+                    else None
+                )
+                variant_stock = self.rng.randint(0, 200)
+                writer.add(
+                    ProductVariant.__table__,
+                    {
+                        "id": self.entity_id("variant", p * 1000 + v),
+                        "product_id": self.entity_id("product", p),
+                        "sku": f"SKU-{p:07d}-{v:02d}",
+                        "name": f"Varyant {v}",
+                        "attributes": {"size": ["S", "M", "L", "XL"][v % 4]},
+                        "price_override": override,
+                        "stock": variant_stock,
+                        "is_active": True,
+                        "created_at": created.replace(tzinfo=None),
+                        "updated_at": created.replace(tzinfo=None),
+                    },
+                )
+                variants.append((override or price, variant_stock))
+            catalog.prices.append(price)
+            catalog.stocks.append(stock)
+            if variants:
+                catalog.variants[p] = variants
+            await writer.flush_if_full(cfg.batch_size)
+        return catalog
+
+    # ───────────────── orders ─────────────────
+
+    def generate_order(self, writer: BulkWriter, catalog: Catalog, products, customers) -> None:
+        cfg = self.config
+        order_id = self.random_id()
+        created_at = self.seasonal_datetime()
+        status = self.pick_status(created_at)
+
+        total = Decimal("0")
+        items = []
+        for _ in range(self.rng.randint(1, cfg.max_items_per_order)):
+            p = products.sample()
+            variants = catalog.variants.get(p)
+            quantity = 1 if self.rng.random() < 0.8 else self.rng.randint(2, 4)
+            variant_id = None
+            unit_price = catalog.prices[p]
+            if variants:
+                v = self.rng.randrange(len(variants))
+                variant_id = self.entity_id("variant", p * 1000 + v)
+                unit_price = variants[v][0]
+                self.sold_variants[(p, v)] = self.sold_variants.get((p, v), 0) + quantity
+            else:
+                self.sold_products[p] = self.sold_products.get(p, 0) + quantity
+            line_total = unit_price * quantity
+            total += line_total
+            items.append((p, variant_id, quantity, unit_price, line_total))
+
+        timeline = STATUS_TIMELINE[status]
+        shipped_at = delivered_at = None
+        event_times = []
+        moment = created_at
+        for event_type in timeline:
+            moment = moment + timedelta(hours=self.rng.uniform(1, 72))
+            event_times.append((event_type, moment))
+            if event_type == "shipped":
+                shipped_at = moment
+            elif event_type == "delivered":
+                delivered_at = moment
+
+        writer.add(
+            Order.__table__,
+            {
+                "id": order_id,
+                "user_id": self.entity_id("user", customers.sample()),
+                "status": status,
+                "total_amount": total,
+                "shipping_address_id": None,
+                "tracking_number": f"TRK{order_id.hex[:12].upper()}" if shipped_at else None,
+                "carrier": self.rng.choice(CARRIERS) if shipped_at else None,
+                "shipped_at": shipped_at,
+                "delivered_at": delivered_at,
+                "created_at": created_at,
+                "updated_at": moment,
+            },
+        )
+
+        naive_created = created_at.replace(tzinfo=None)
+        for p, variant_id, quantity, unit_price, line_total in items:
+            writer.add(
+                OrderItem.__table__,
+                {
+                    "id": self.random_id(),
+                    "order_id": order_id,
+                    "product_id": self.entity_id("product", p),
+                    "variant_id": variant_id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "line_total": line_total,
+                    "created_at": created_at,
+                },
+            )
+            writer.add(
+                InventoryMovement.__table__,
+                {
+                    "id": self.random_id(),
+                    "product_id": self.entity_id("product", p),
+                    "variant_id": variant_id,
+                    "change": -quantity,
+                    "reason": "order",
+                    "ref_order_id": order_id,
+                    "notes": None,
+                    "created_at": naive_created,
+                },
+            )
+
+        writer.add(
+            OrderEvent.__table__,
+            {
+                "id": self.random_id(),
+                "order_id": order_id,
+                "type": "created",
+                "description": "Sipariş oluşturuldu.",
+                "actor_id": None,
+                "created_at": naive_created,
+            },
+        )
+        for event_type, event_time in event_times:
+            writer.add(
+                OrderEvent.__table__,
+                {
+                    "id": self.random_id(),
+                    "order_id": order_id,
+                    "type": event_type,
+                    "description": None,
+                    "actor_id": None,
+                    "created_at": event_time.replace(tzinfo=None),
+                },
+            )
+
+        if status in PAID_STATUSES:
+            paid_at = event_times[0][1].replace(tzinfo=None)
+            writer.add(
+                Payment.__table__,
+                {
+                    "id": self.random_id(),
+                    "order_id": order_id,
+                    "provider": "stripe",
+                    "intent_id": f"pi_seed_{order_id.hex}",
+                    "status": "succeeded",
+                    "amount": total,
+                    "currency": "TRY",
+                    "created_at": paid_at,
+                    "updated_at": paid_at,
+                },
+            )
+
+    async def generate_initial_movements(self, writer: BulkWriter, catalog: Catalog) -> None:
+        """Başlangıç stoğu = güncel stok + satılan; ledger toplamı sayaçlarla eşleşir."""
+        at = datetime.combine(self.config.start, time.min) - timedelta(days=1)
+        for p in range(len(catalog)):
+            variants = catalog.variants.get(p)
+            if variants:
+                for v, (_, stock) in enumerate(variants):
+                    writer.add(
+                        InventoryMovement.__table__,
+                        {
+                            "id": self.random_id(),
+                            "product_id": self.entity_id("product", p),
+                            "variant_id": self.entity_id("variant", p * 1000 + v),
+                            "change": stock + self.sold_variants.get((p, v), 0),
+                            "reason": "initial",
+                            "ref_order_id": None,
+                            "notes": None,
+                            "created_at": at,
+                        },
+                    )
+            else:
+                writer.add(
+                    InventoryMovement.__table__,
+                    {
+                        "id": self.random_id(),
+                        "product_id": self.entity_id("product", p),
+                        "variant_id": None,
+                        "change": catalog.stocks[p] + self.sold_products.get(p, 0),
+                        "reason": "initial",
+                        "ref_order_id": None,
+                        "notes": None,
+                        "created_at": at,
+                    },
+                )
+            await writer.flush_if_full(self.config.batch_size)
+
+
+def seed_months(config: SeedConfig) -> list[date]:
+    """Üretilen stok hareketlerinin ayları: başlangıç hareketleri (start'tan bir gün önce) .. end."""
+    month = month_start(config.start - timedelta(days=1))
+    last = month_start(config.end)
+    months = []
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+async def seed(engine: AsyncEngine, config: SeedConfig, reset: bool = False) -> dict[str, int]:
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        # Postgres: partition'lı tablo, partition'ı açılmadan COPY satırlarını kabul etmez
+        await ensure_month_partitions(
+            conn, InventoryMovement.__tablename__, seed_months(config), with_default=True
+        )
+
+    generator = DatasetGenerator(config)
+    async with engine.connect() as connection:
+        writer = BulkWriter(connection)
+        for table in SEED_TABLES:
+            writer.buffers[table] = []
+
+        catalog = await generator.generate_catalog(writer)
+        await writer.flush()
+
+        products = ZipfSampler(config.products, config.product_zipf_s, generator.rng)
+        customers = ZipfSampler(config.users, config.customer_zipf_s, generator.rng)
+        for i in range(config.orders):
+            generator.generate_order(writer, catalog, products, customers)
+            if (i + 1) % config.batch_size == 0:
+                await writer.flush()
+                print(f"orders: {i + 1}/{config.orders}")
+
+        await generator.generate_initial_movements(writer, catalog)
+        await writer.flush()
+
+    return writer.counts
+
+
+def parse_args() -> tuple[SeedConfig, str | None, bool]:
+    parser = argparse.ArgumentParser(description="Sentetik performans veri seti üret.")
+    parser.add_argument("--users", type=int, default=SeedConfig.users)
+    parser.add_argument("--products", type=int, default=SeedConfig.products)
+    parser.add_argument("--orders", type=int, default=SeedConfig.orders)
+    parser.add_argument("--categories", type=int, default=SeedConfig.categories)
+    parser.add_argument("--max-variants", type=int, default=SeedConfig.max_variants_per_product)
+    parser.add_argument("--max-items", type=int, default=SeedConfig.max_items_per_order)
+    parser.add_argument("--start", type=date.fromisoformat, default=SeedConfig.start)
+    parser.add_argument("--end", type=date.fromisoformat, default=SeedConfig.end)
+    parser.add_argument("--batch-size", type=int, default=SeedConfig.batch_size)
+    parser.add_argument("--seed", type=int, default=SeedConfig.seed)
+    parser.add_argument("--database-url", default=None, help="Varsayılan: DATABASE_URL")
+    parser.add_argument("--reset", action="store_true", help="Tabloları silip yeniden oluştur")
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        users=args.users,
+        products=args.products,
+        orders=args.orders,
+        categories=args.categories,
+        max_variants_per_product=args.max_variants,
+        max_items_per_order=args.max_items,
+        start=args.start,
+        end=args.end,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    return config, args.database_url, args.reset
+
+
+async def main() -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.core.config import settings
+
+    config, database_url, reset = parse_args()
+    engine = create_async_engine(database_url or settings.DATABASE_URL)
+    try:
+        counts = await seed(engine, config, reset=reset)
+    finally:
+        await engine.dispose()
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,8 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import itertools
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -17,7 +21,90 @@ async_session_maker = sessionmaker(
 )
 
 
+# ───────────────── Read replicas ─────────────────
+
+# Replika gerideyse "son X saniye" kadar eski veri kabul edilir.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReadReplica:
+    """Bir replika engine'i ve son gecikme ölçümünü tutar."""
+
+    def __init__(self, replica_engine: AsyncEngine):
+        self.engine = replica_engine
+        self.session_maker = sessionmaker(
+            bind=replica_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        self.healthy = True
+        self.checked_at = 0.0
+
+    async def measure_lag(self) -> float:
+        if self.engine.dialect.name != "postgresql":
+            return 0.0
+        async with self.engine.connect() as connection:
+            result = await connection.execute(REPLICA_LAG_QUERY)
+            return float(result.scalar_one() or 0)
+
+    async def is_fresh(self) -> bool:
+        """Gecikme kontrolü REPLICA_LAG_CHECK_INTERVAL_SECONDS boyunca cache'lenir."""
+        now = time.monotonic()
+        if now - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS:
+            return self.healthy
+
+        self.checked_at = now
+        try:
+            lag = await self.measure_lag()
+        except Exception:
+            self.healthy = False
+        else:
+            self.healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+        return self.healthy
+
+
+read_replicas: list[ReadReplica] = [
+    ReadReplica(
+        create_async_engine(url, echo=False, pool_pre_ping=True)
+    )
+    for url in settings.DATABASE_REPLICA_URL_LIST
+]
+_replica_cycle = itertools.count()
+
+
+async def pick_read_session_maker(
+    replicas: list[ReadReplica] | None = None,
+) -> sessionmaker:
+    """
+    Round-robin ile güncel bir replika seçer.
+    Replika yoksa ya da hepsi fazla gerideyse primary'ye düşer.
+    """
+    if replicas is None:
+        replicas = read_replicas
+    if not replicas:
+        return async_session_maker
+
+    start = next(_replica_cycle)
+    for offset in range(len(replicas)):
+        replica = replicas[(start + offset) % len(replicas)]
+        if await replica.is_fresh():
+            return replica.session_maker
+    return async_session_maker
+
+
 # FastAPI dependency
 async def get_db() -> AsyncSession:
     async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+# FastAPI dependency – sadece okuma yapan endpoint'ler için
+async def get_read_db() -> AsyncSession:
+    maker = await pick_read_session_maker()
+    async with maker() as session:
+        yield session
@@ -0,0 +1,20 @@
+"""
+Stok snapshot checkpoint'i (cron ile periyodik çalıştırılır).
+
+    python -m app.db.snapshots
+"""
+import asyncio
+
+from app.crud.inventory import create_stock_snapshots
+from app.db.session import async_session_maker, engine
+
+
+async def main() -> None:
+    async with async_session_maker() as db:
+        count = await create_stock_snapshots(db)
+    print(f"{count} stok snapshot'ı alındı.")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
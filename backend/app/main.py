@@ -1,18 +1,201 @@
 import asyncio
+import logging
 import os
+import time
+from contextlib import asynccontextmanager
 
 import httpx
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.loop_watchdog import LoopWatchdog
 from app.api.v1 import api_router
-from app.db.session import engine
+from app.db.instrumentation import collect_queries
+from app.db.keep_warm import keep_warm, prewarm_pool
+from app.db.partitions import partition_maintainer
+from app.db.session import async_session_maker, engine, read_replicas
+from app.services.idempotency import handle_idempotent_request, idempotency_sweeper
+from app.services.order_feed import OrderFeed
+from app.services.stock_alerts import StockAlertFeed, stock_alert_sweeper
+from app.services.product_import import product_import_worker
+from app.services.reservation_sweeper import reservation_sweeper
+
+logger = logging.getLogger("app.sql")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uygulama ömrü boyunca tek, pool'lu bir HTTP client
+    app.state.http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.HTTP_CLIENT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+    background_tasks = [asyncio.create_task(metrics.sample_event_loop_lag())]
+
+    # Neon cold start'ı ilk gerçek isteğe bırakmamak için pool'u önceden ısıt
+    await prewarm_pool(engine, settings.DB_MIN_CONNECTIONS)
+    if settings.DB_KEEP_WARM_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(keep_warm(engine, settings.DB_KEEP_WARM_INTERVAL_SECONDS))
+        )
+
+    if settings.STOCK_RESERVATION_TTL_MINUTES > 0 and settings.RESERVATION_SWEEP_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                reservation_sweeper(
+                    async_session_maker,
+                    settings.RESERVATION_SWEEP_INTERVAL_SECONDS,
+                    settings.RESERVATION_SWEEP_BATCH_SIZE,
+                )
+            )
+        )
+
+    if settings.ORDER_FEED_POLL_INTERVAL_SECONDS > 0:
+        # Worker başına tek dinleyici; SSE istemcileri süreç içi broker'dan beslenir
+        background_tasks.append(
+            asyncio.create_task(
+                OrderFeed(async_session_maker).run(engine, settings.ORDER_FEED_POLL_INTERVAL_SECONDS)
+            )
+        )
+
+    if settings.STOCK_ALERT_POLL_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                StockAlertFeed(async_session_maker).run(engine, settings.STOCK_ALERT_POLL_INTERVAL_SECONDS)
+            )
+        )
+    if settings.STOCK_ALERT_RETENTION_DAYS > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                stock_alert_sweeper(async_session_maker, settings.STOCK_ALERT_RETENTION_DAYS, 3600)
+            )
+        )
+
+    if settings.PRODUCT_IMPORT_POLL_INTERVAL_SECONDS > 0:
+        # Yarıda kalan (worker'ı ölmüş) içe aktarımlar checkpoint'ten devam eder
+        background_tasks.append(
+            asyncio.create_task(
+                product_import_worker(async_session_maker, settings.PRODUCT_IMPORT_POLL_INTERVAL_SECONDS)
+            )
+        )
+
+    if settings.IDEMPOTENCY_SWEEP_INTERVAL_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                idempotency_sweeper(async_session_maker, settings.IDEMPOTENCY_SWEEP_INTERVAL_SECONDS)
+            )
+        )
+
+    if settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS > 0 and engine.dialect.name == "postgresql":
+        background_tasks.append(
+            asyncio.create_task(
+                partition_maintainer(
+                    engine,
+                    settings.PARTITION_MONTHS_AHEAD,
+                    settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+                )
+            )
+        )
+
+    watchdog = None
+    if settings.LOOP_WATCHDOG_ENABLED:
+        watchdog = LoopWatchdog(
+            threshold=settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+            interval=settings.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+        )
+        await watchdog.start()
+    try:
+        yield
+    finally:
+        if watchdog is not None:
+            await watchdog.stop()
+        for task in background_tasks:
+            task.cancel()
+        # Görevler iptali işleyip bağlantılarını bırakmadan engine kapatılmaz
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await app.state.http_client.aclose()
+        await engine.dispose()
+        for replica in read_replicas:
+            await replica.engine.dispose()
+        metrics.mark_worker_dead()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+# Middleware dependency override'larının dışında çalışır; testler bunu değiştirir
+app.state.idempotency_session_maker = async_session_maker
+
+
+# 🔹 Idempotency-Key: tekrar denenen sipariş / ödeme POST'ları saklı yanıtı alır
+@app.middleware("http")
+async def idempotency(request: Request, call_next):
+    return await handle_idempotent_request(
+        request, call_next, request.app.state.idempotency_session_maker
+    )
+
+
+# 🔹 Request başına SQL sayacı: Server-Timing header + yavaş / N+1 logları
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        return await call_next(request)
+
+    with collect_queries() as stats:
+        response = await call_next(request)
+
+    response.headers.append("Server-Timing", stats.server_timing())
+
+    route = f"{request.method} {request.url.path}"
+    logger.debug(
+        "%s -> %d queries, %.1f ms db (slowest %.1f ms: %s)",
+        route,
+        stats.count,
+        stats.total_ms,
+        stats.slowest_ms,
+        stats.slowest_statement,
+    )
+    if stats.total_ms > settings.SQL_SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow DB request %s: %d queries, %.1f ms db, slowest %.1f ms: %s",
+            route,
+            stats.count,
+            stats.total_ms,
+            stats.slowest_ms,
+            stats.slowest_statement,
+        )
+    for statement, count in stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        logger.warning("Possible N+1 in %s: %dx %s", route, count, statement)
+
+    return response
+
+
+# 🔹 Prometheus: route şablonu + status bazında latency, in-flight istekler
+@app.middleware("http")
+async def prometheus_metrics(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        metrics.observe_request(
+            request.method,
+            metrics.route_template(request.scope),
+            status_code,
+            time.perf_counter() - start,
+        )
 
-app = FastAPI(title=settings.PROJECT_NAME)
 
 # 🔹 CORS middleware
 app.add_middleware(
@@ -21,6 +204,8 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Sayfalama için liste toplamı tarayıcıdan okunabilsin
+    expose_headers=["X-Total-Count", "X-Total-Count-Exact"],
 )
 
 # 🔹 Static files for uploads
@@ -33,6 +218,14 @@ app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics_endpoint():
+    metrics.update_pool_metrics("primary", engine)
+    for index, replica in enumerate(read_replicas):
+        metrics.update_pool_metrics(f"replica{index}", replica.engine)
+    body, content_type = metrics.render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/warmup")
 async def warmup(x_warmup_key: str | None = Header(default=None, alias="x-warmup-key")):
     if settings.WARMUP_KEY and x_warmup_key != settings.WARMUP_KEY:
@@ -46,7 +239,7 @@ async def warmup(x_warmup_key: str | None = Header(default=None, alias="x-warmup
 
 
 @app.post("/api/warmup")
-async def warmup_proxy():
+async def warmup_proxy(request: Request):
     base = settings.INTERNAL_API_URL or settings.NEXT_PUBLIC_API_URL
     if not base:
         return JSONResponse(
@@ -66,9 +259,11 @@ async def warmup_proxy():
 
     for attempt in range(max_attempts):
         try:
-            timeout = httpx.Timeout(attempt_timeout_ms / 1000)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(url, headers=headers)
+            response = await request.app.state.http_client.get(
+                url,
+                headers=headers,
+                timeout=attempt_timeout_ms / 1000,
+            )
 
             body = response.text
             if response.status_code < 500:
@@ -6,7 +6,19 @@ from app.models.order import Order, OrderItem
 from app.models.address import Address
 from app.models.payment import Payment, Refund
 from app.models.variant import ProductVariant, ProductImage
-from app.models.inventory import InventoryMovement, OrderEvent
+from app.models.product_import import ProductImportJob, ProductImportError
+from app.models.price_rule import PriceRuleRun
+from app.models.idempotency import IdempotencyKey
+from app.models.archive import ArchivedOrderStat
+from app.models.inventory import (
+    InventoryMovement,
+    StockSnapshot,
+    StockReservation,
+    ReconciliationRun,
+    LedgerBalance,
+    OrderEvent,
+    StockAlert,
+)
 
 __all__ = [
     "User",
@@ -20,5 +32,15 @@ __all__ = [
     "ProductVariant",
     "ProductImage",
     "InventoryMovement",
+    "StockSnapshot",
+    "StockReservation",
+    "ReconciliationRun",
+    "LedgerBalance",
     "OrderEvent",
+    "StockAlert",
+    "ProductImportJob",
+    "ProductImportError",
+    "PriceRuleRun",
+    "IdempotencyKey",
+    "ArchivedOrderStat",
 ]
@@ -0,0 +1,66 @@
+"""Cold storage for closed orders moved out of the hot tables, and its stats rollup."""
+from sqlalchemy import Column, Date, Index, Integer, Numeric, String, Table
+
+from app.db.base import Base
+from app.models.inventory import OrderEvent
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment, Refund
+
+# Alt tablolarda siparişin created_at'i; arşivler Postgres'te bu ay anahtarıyla bölünür
+ORDER_CREATED_AT = "order_created_at"
+
+
+def _archive_table(source: Table, name: str, key: str) -> Table:
+    """
+    Sıcak tablonun FK'sız, default'suz kopyası. Satırlar INSERT ... SELECT ile
+    taşındığı için kolonlar elle yazılmaz, kaynaktan üretilir. Postgres'te
+    `key` üzerinde aylık RANGE partition'lıdır; PK partition anahtarını içermek
+    zorunda olduğundan (id, key) olur.
+    """
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key or c.name == key, nullable=c.nullable)
+        for c in source.columns
+    ]
+    indexes = []
+    if key not in source.columns:
+        columns.append(Column(key, Order.__table__.c.created_at.type, primary_key=True))
+    if "order_id" in source.columns:
+        indexes.append(Index(f"ix_{name}_order_id", "order_id"))
+    return Table(
+        name,
+        Base.metadata,
+        *columns,
+        *indexes,
+        postgresql_partition_by=f"RANGE ({key})",
+    )
+
+
+orders_archive = _archive_table(Order.__table__, "orders_archive", "created_at")
+# Arşivdeki sipariş geçmişi müşteri bazında okunur
+Index("ix_orders_archive_user_id_created_at", orders_archive.c.user_id, orders_archive.c.created_at)
+order_items_archive = _archive_table(OrderItem.__table__, "order_items_archive", ORDER_CREATED_AT)
+order_events_archive = _archive_table(OrderEvent.__table__, "order_events_archive", ORDER_CREATED_AT)
+payments_archive = _archive_table(Payment.__table__, "payments_archive", ORDER_CREATED_AT)
+refunds_archive = _archive_table(Refund.__table__, "refunds_archive", ORDER_CREATED_AT)
+
+# (sıcak model, arşiv tablosu); refunds payments'a, hepsi orders'a bağlı: silme sırası tersidir
+ARCHIVE_TABLES = (
+    (Order, orders_archive),
+    (OrderItem, order_items_archive),
+    (OrderEvent, order_events_archive),
+    (Payment, payments_archive),
+    (Refund, refunds_archive),
+)
+
+
+class ArchivedOrderStat(Base):
+    """
+    Monthly per-status totals of archived orders. Overview stats add these to
+    the hot table so totals stay complete without reading the archive.
+    """
+    __tablename__ = "order_archive_stats"
+
+    month = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
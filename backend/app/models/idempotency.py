@@ -0,0 +1,30 @@
+"""Stored responses for Idempotency-Key retries."""
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    One (user, key, route) request: locked while in progress, then holding the
+    compressed response that retries with the same key receive.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key = Column(String(255), primary_key=True)
+    route = Column(String(100), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(20), nullable=False, default="in_progress")  # in_progress, completed
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)  # zlib
+    response_headers = Column(JSON, nullable=True)  # [[name, value], ...] raw order, repeats kept
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,8 +1,8 @@
-"""InventoryMovement and OrderEvent models."""
+"""InventoryMovement, stock checkpoint/reconciliation, OrderEvent and StockAlert models."""
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, ForeignKey, DateTime, Integer, Text
+from sqlalchemy import DDL, Column, String, ForeignKey, DateTime, Integer, Text, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -33,19 +33,129 @@ class InventoryMovement(Base):
     )
     change = Column(Integer, nullable=False)  # Positive for additions, negative for removals
     reason = Column(String(100), nullable=False)  # "order", "return", "adjustment", "initial"
-    ref_order_id = Column(
-        UUID(as_uuid=True),
-        ForeignKey("orders.id", ondelete="SET NULL"),
-        nullable=True,
-    )
+    # FK yok: sipariş arşive taşındığında defterdeki referans korunur (SET NULL olmaz)
+    ref_order_id = Column(UUID(as_uuid=True), nullable=True)
     notes = Column(Text, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Postgres'te aylık RANGE partition anahtarı; partition'lı tablonun PK'sı onu içermeli
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
 
     # Relationships
     product = relationship("Product", back_populates="inventory_movements")
     variant = relationship("ProductVariant", back_populates="inventory_movements")
-    order = relationship("Order", back_populates="inventory_movements")
+    order = relationship(
+        "Order",
+        primaryjoin="foreign(InventoryMovement.ref_order_id) == Order.id",
+        back_populates="inventory_movements",
+    )
+
+    __table_args__ = (
+        # Point-in-time stok: bir SKU'nun iki tarih arasındaki hareketleri
+        Index("ix_inventory_movements_product_id_created_at", "product_id", "created_at"),
+        Index("ix_inventory_movements_variant_id_created_at", "variant_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class StockSnapshot(Base):
+    """
+    Periodic stock checkpoint for a product (variant_id NULL) or a variant.
+    Point-in-time stock = latest snapshot before the date + movements since then.
+    """
+    __tablename__ = "stock_snapshots"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    product_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    variant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("product_variants.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    stock = Column(Integer, nullable=False)
+    taken_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_stock_snapshots_product_variant_taken_at", "product_id", "variant_id", "taken_at"),
+    )
+
+
+class StockReservation(Base):
+    """
+    Stock held for an unpaid order line. Stock is decremented when the order is
+    created; the sweeper gives it back after expires_at unless payment converts
+    (deletes) the reservation first.
+    """
+    __tablename__ = "stock_reservations"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    order_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("orders.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    product_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    variant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("product_variants.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ReconciliationRun(Base):
+    """One stock reconciliation pass; `through` is the ledger watermark it summed up to."""
+    __tablename__ = "reconciliation_runs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True, index=True)
+    through = Column(DateTime, nullable=False)
+    mode = Column(String(20), nullable=False)  # "report", "ledger", "counter"
+    checked = Column(Integer, nullable=False, default=0)
+    mismatches = Column(Integer, nullable=False, default=0)
+    repaired = Column(Integer, nullable=False, default=0)
+
+
+class LedgerBalance(Base):
+    """
+    Ledger sum per SKU up to a run's watermark. sku_id is the variant id for variants
+    and the product id for product-level stock, so one key covers both.
+    The next run only adds movements after the watermark on top of these.
+    """
+    __tablename__ = "ledger_balances"
+
+    run_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("reconciliation_runs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    sku_id = Column(UUID(as_uuid=True), primary_key=True)
+    product_id = Column(UUID(as_uuid=True), nullable=False)
+    variant_id = Column(UUID(as_uuid=True), nullable=True)
+    balance = Column(Integer, nullable=False)
 
 
 class OrderEvent(Base):
@@ -77,3 +187,162 @@ class OrderEvent(Base):
     # Relationships
     order = relationship("Order", back_populates="events")
     actor = relationship("User")
+
+    __table_args__ = (
+        # Canlı sipariş akışı ve resume cursor'ı (created_at, id) sırasıyla okur
+        Index("ix_order_events_created_at_id", "created_at", "id"),
+    )
+
+
+# Statement başına tek NOTIFY: yük taşımaz, sipariş akışını (OrderFeed) uyandırır;
+# commit'te teslim edilir, rollback olan olay hiç duyurulmaz
+ORDER_EVENT_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_order_events() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('order_events', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ORDER_EVENT_NOTIFY_TRIGGER = (
+    "CREATE TRIGGER order_events_notify AFTER INSERT ON order_events "
+    "FOR EACH STATEMENT EXECUTE FUNCTION notify_order_events()"
+)
+
+# create_all (init_db, testler) trigger'ı da kurar; Alembic'te migration kurar
+for _statement in (ORDER_EVENT_NOTIFY_FUNCTION, ORDER_EVENT_NOTIFY_TRIGGER):
+    event.listen(OrderEvent.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
+class StockAlert(Base):
+    """
+    A product or variant entering (low_stock) or leaving (restocked) the low-stock
+    list: active and stock <= reorder_threshold. Rows are written by database
+    triggers on products / product_variants, so every writer (ORM, bulk Core
+    updates, imports, other workers) is covered in the same transaction.
+    """
+    __tablename__ = "stock_alerts"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    type = Column(String(20), nullable=False)  # low_stock, restocked
+    product_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    variant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("product_variants.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    name = Column(String(255), nullable=True)
+    sku = Column(String(100), nullable=True)
+    stock = Column(Integer, nullable=False)
+    reorder_threshold = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Uyarı akışı ve resume cursor'ı (created_at, id) sırasıyla okur
+        Index("ix_stock_alerts_created_at_id", "created_at", "id"),
+    )
+
+
+# Eşik geçişi trigger'ları. Yalnızca stock / reorder_threshold / is_active
+# yazıldığında çalışır; satır başına birkaç karşılaştırma, uyarı yalnızca geçişte.
+STOCK_ALERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION record_stock_alert() RETURNS trigger AS $$
+DECLARE
+    is_low boolean := COALESCE(NEW.is_active, true) AND COALESCE(NEW.stock, 0) <= NEW.reorder_threshold;
+    was_low boolean := false;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        was_low := COALESCE(OLD.is_active, true) AND COALESCE(OLD.stock, 0) <= OLD.reorder_threshold;
+    END IF;
+    IF is_low = was_low THEN
+        RETURN NULL;
+    END IF;
+    IF TG_TABLE_NAME = 'product_variants' THEN
+        INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at)
+        VALUES (gen_random_uuid(), CASE WHEN is_low THEN 'low_stock' ELSE 'restocked' END,
+                NEW.product_id, NEW.id, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold,
+                timezone('utc', clock_timestamp()));
+    ELSE
+        INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at)
+        VALUES (gen_random_uuid(), CASE WHEN is_low THEN 'low_stock' ELSE 'restocked' END,
+                NEW.id, NULL, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold,
+                timezone('utc', clock_timestamp()));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Statement başına tek NOTIFY: yük taşımaz, dinleyiciyi uyandırır; commit'te teslim edilir
+STOCK_ALERT_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_stock_alerts() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('stock_alerts', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _postgres_stock_alert_ddl() -> list[str]:
+    statements = [STOCK_ALERT_FUNCTION, STOCK_ALERT_NOTIFY_FUNCTION]
+    for table in ("products", "product_variants"):
+        statements.append(
+            f"CREATE TRIGGER {table}_stock_alert "
+            f"AFTER INSERT OR UPDATE OF stock, reorder_threshold, is_active ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION record_stock_alert()"
+        )
+    statements.append(
+        "CREATE TRIGGER stock_alerts_notify AFTER INSERT ON stock_alerts "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_stock_alerts()"
+    )
+    return statements
+
+
+def _sqlite_stock_alert_ddl() -> list[str]:
+    # SQLite'ta fonksiyon yok: tablo ve işlem başına bir trigger, koşul WHEN'de
+    is_low = "(COALESCE({row}.is_active, 1) AND COALESCE({row}.stock, 0) <= {row}.reorder_threshold)"
+    new_low, old_low = is_low.format(row="NEW"), is_low.format(row="OLD")
+    statements = []
+    for table, product_id, variant_id in (
+        ("products", "NEW.id", "NULL"),
+        ("product_variants", "NEW.product_id", "NEW.id"),
+    ):
+        insert = (
+            "INSERT INTO stock_alerts (id, type, product_id, variant_id, name, sku, stock, reorder_threshold, created_at) "
+            f"VALUES (lower(hex(randomblob(16))), CASE WHEN {new_low} THEN 'low_stock' ELSE 'restocked' END, "
+            f"{product_id}, {variant_id}, NEW.name, NEW.sku, COALESCE(NEW.stock, 0), NEW.reorder_threshold, "
+            "strftime('%Y-%m-%d %H:%M:%f', 'now'))"
+        )
+        statements.append(
+            f"CREATE TRIGGER {table}_stock_alert_insert AFTER INSERT ON {table} "
+            f"WHEN {new_low} BEGIN {insert}; END"
+        )
+        statements.append(
+            f"CREATE TRIGGER {table}_stock_alert_update "
+            f"AFTER UPDATE OF stock, reorder_threshold, is_active ON {table} "
+            f"WHEN {new_low} IS NOT {old_low} BEGIN {insert}; END"
+        )
+    return statements
+
+
+# create_all (init_db, testler) trigger'ları da kurar; Alembic'te migration kurar
+for _statement in _postgres_stock_alert_ddl():
+    event.listen(
+        StockAlert.__table__, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect="postgresql")
+    )
+for _statement in _sqlite_stock_alert_ddl():
+    event.listen(
+        StockAlert.__table__, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect="sqlite")
+    )
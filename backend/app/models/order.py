@@ -7,7 +7,9 @@ from sqlalchemy import (
     Boolean,
     Integer,
     ForeignKey,
+    Index,
     Numeric,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
@@ -18,6 +20,29 @@ from app.db.base import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # get_orders_by_user: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        # get_orders: ORDER BY created_at DESC; stats tarih filtreleri
+        Index("ix_orders_created_at", "created_at"),
+        # overview: GROUP BY status / status IN (...)
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        # /stats/sales: iptal/iade dışı siparişler, tarih aralığı
+        Index(
+            "ix_orders_created_at_sales",
+            "created_at",
+            postgresql_include=["total_amount"],
+            postgresql_where=text("status NOT IN ('cancelled', 'refunded')"),
+            sqlite_where=text("status NOT IN ('cancelled', 'refunded')"),
+        ),
+        # Sipariş araması: tracking_number = ? (kargoya verilmemişler index dışı)
+        Index(
+            "ix_orders_tracking_number",
+            "tracking_number",
+            postgresql_where=text("tracking_number IS NOT NULL"),
+            sqlite_where=text("tracking_number IS NOT NULL"),
+        ),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -79,7 +104,11 @@ class Order(Base):
     events = relationship("OrderEvent", back_populates="order", cascade="all, delete-orphan")
     payments = relationship("Payment", back_populates="order", cascade="all, delete-orphan")
     refunds = relationship("Refund", back_populates="order", cascade="all, delete-orphan")
-    inventory_movements = relationship("InventoryMovement", back_populates="order")
+    inventory_movements = relationship(
+        "InventoryMovement",
+        primaryjoin="Order.id == foreign(InventoryMovement.ref_order_id)",
+        back_populates="order",
+    )
 
 
 class OrderItem(Base):
@@ -96,18 +125,21 @@ class OrderItem(Base):
         UUID(as_uuid=True),
         ForeignKey("orders.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     product_id = Column(
         UUID(as_uuid=True),
         ForeignKey("products.id", ondelete="RESTRICT"),
         nullable=False,
+        index=True,
     )
 
     variant_id = Column(
         UUID(as_uuid=True),
         ForeignKey("product_variants.id", ondelete="SET NULL"),
         nullable=True,
+        index=True,
     )
 
     quantity = Column(Integer, nullable=False, default=1)
@@ -0,0 +1,28 @@
+"""Audit trail for bulk price / activation rules."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class PriceRuleRun(Base):
+    """One applied price rule: the rule as submitted and how many rows it changed."""
+    __tablename__ = "price_rule_runs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    rule = Column(JSON, nullable=False)
+    products_updated = Column(Integer, nullable=False, default=0)
+    variants_updated = Column(Integer, nullable=False, default=0)
+    actor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
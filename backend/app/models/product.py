@@ -2,6 +2,8 @@ import uuid
 
 from sqlalchemy import (
     Column,
+    Index,
+    text,
     String,
     DateTime,
     Boolean,
@@ -27,6 +29,8 @@ class Product(Base):
     )
 
     name = Column(String(255), nullable=False, index=True)
+    # Tedarikçi / katalog kodu; toplu içe aktarımda upsert anahtarı
+    sku = Column(String(100), nullable=True, unique=True)
     description = Column(String(1000), nullable=True)
 
     # Fiyatı para tipi gibi tutmak için Numeric kullanıyoruz
@@ -35,6 +39,9 @@ class Product(Base):
     # Stok adedi
     stock = Column(Integer, nullable=False, default=0)
 
+    # Stok bu seviyeye (dahil) inince low-stock uyarısı verilir
+    reorder_threshold = Column(Integer, nullable=False, default=10, server_default="10")
+
     # Ürün satışta mı?
     is_active = Column(Boolean, nullable=False, default=True)
 
@@ -63,3 +70,13 @@ class Product(Base):
     variants = relationship("ProductVariant", back_populates="product", cascade="all, delete-orphan")
     images = relationship("ProductImage", back_populates="product", cascade="all, delete-orphan")
     inventory_movements = relationship("InventoryMovement", back_populates="product")
+
+    __table_args__ = (
+        # Sadece şu an eşiğin altındaki ürünler: low-stock listesi katalog değil bu index'i okur
+        Index(
+            "ix_products_below_reorder_threshold",
+            "id",
+            postgresql_where=text("stock <= reorder_threshold AND is_active"),
+            sqlite_where=text("stock <= reorder_threshold AND is_active"),
+        ),
+    )
@@ -0,0 +1,72 @@
+"""Bulk product import jobs and their row-level errors."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class ProductImportJob(Base):
+    """
+    One uploaded CSV / JSONL catalog. rows_processed is the checkpoint: every
+    chunk is upserted and the counter advanced in the same transaction, so an
+    interrupted job resumes after the last committed chunk.
+    """
+    __tablename__ = "product_import_jobs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed
+    format = Column(String(10), nullable=False)  # csv, jsonl
+    filename = Column(String(255), nullable=True)
+    path = Column(String(500), nullable=False)
+    actor_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    total_rows = Column(Integer, nullable=True)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    products_created = Column(Integer, nullable=False, default=0)
+    products_updated = Column(Integer, nullable=False, default=0)
+    variants_created = Column(Integer, nullable=False, default=0)
+    variants_updated = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    errors = relationship("ProductImportError", back_populates="job", cascade="all, delete-orphan")
+
+
+class ProductImportError(Base):
+    __tablename__ = "product_import_errors"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("product_import_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    row_number = Column(Integer, nullable=False)
+    message = Column(Text, nullable=False)
+
+    job = relationship("ProductImportJob", back_populates="errors")
+
+    __table_args__ = (
+        Index("ix_product_import_errors_job_id_row_number", "job_id", "row_number"),
+    )
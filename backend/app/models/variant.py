@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Integer, Boolean, Text, JSON
+from sqlalchemy import Column, String, ForeignKey, DateTime, Numeric, Integer, Boolean, Text, JSON, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -30,6 +30,7 @@ class ProductVariant(Base):
     attributes = Column(JSON, default=dict)  # {"color": "Red", "size": "Large"}
     price_override = Column(Numeric(12, 2), nullable=True)  # Override product price
     stock = Column(Integer, default=0)
+    reorder_threshold = Column(Integer, nullable=False, default=10, server_default="10")
     is_active = Column(Boolean, default=True)
 
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -40,6 +41,16 @@ class ProductVariant(Base):
     images = relationship("ProductImage", back_populates="variant", cascade="all, delete-orphan")
     inventory_movements = relationship("InventoryMovement", back_populates="variant")
 
+    __table_args__ = (
+        # Sadece şu an eşiğin altındaki varyantlar: low-stock listesi katalog değil bu index'i okur
+        Index(
+            "ix_product_variants_below_reorder_threshold",
+            "id",
+            postgresql_where=text("stock <= reorder_threshold AND is_active"),
+            sqlite_where=text("stock <= reorder_threshold AND is_active"),
+        ),
+    )
+
 
 class ProductImage(Base):
     __tablename__ = "product_images"
@@ -0,0 +1,39 @@
+"""Schemas for the batch endpoint."""
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+MAX_BATCH_REQUESTS = 50
+
+
+class BatchSubRequest(BaseModel):
+    id: str | None = Field(None, max_length=100)
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    # API prefix'i olmadan, query string dahil: "/products/?limit=20"
+    path: str = Field(..., min_length=1, max_length=2000)
+    body: Any = None
+    headers: dict[str, str] = Field(default_factory=dict)
+
+    @field_validator("path")
+    @classmethod
+    def relative_path(cls, value: str) -> str:
+        if not value.startswith("/") or value.startswith("//"):
+            raise ValueError("path '/' ile başlamalı ve API prefix'i içermemeli.")
+        return value
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchSubRequest] = Field(..., min_length=1, max_length=MAX_BATCH_REQUESTS)
+    # True: alt istekler eşzamanlı ve ayrı session'larla çalışır, sıra garantisi yok
+    parallel: bool = False
+
+
+class BatchSubResponse(BaseModel):
+    id: str | None
+    status: int
+    headers: dict[str, str]
+    body: Any
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchSubResponse]
@@ -30,6 +30,20 @@ class InventoryMovementOut(InventoryMovementBase):
         from_attributes = True
 
 
+class StockAtOut(BaseModel):
+    product_id: UUID
+    variant_id: UUID | None
+    at: datetime
+    stock: int
+    source: str  # "snapshot" | "current"
+    checkpoint: datetime | None
+
+
+class StockSnapshotResult(BaseModel):
+    taken_at: datetime
+    count: int
+
+
 # ───────────────── OrderEvent (Timeline) ─────────────────
 
 class OrderEventBase(BaseModel):
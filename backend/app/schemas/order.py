@@ -2,7 +2,7 @@
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.inventory import OrderEventOut
 
@@ -63,6 +63,39 @@ class OrderUpdateStatus(BaseModel):
     carrier: str | None = None
 
 
+class OrderBulkStatusItem(OrderUpdateStatus):
+    order_id: UUID
+
+
+class OrderBulkStatusUpdate(BaseModel):
+    items: list[OrderBulkStatusItem] = Field(..., min_length=1, max_length=5000)
+
+
+class OrderBulkStatusRejected(BaseModel):
+    order_id: UUID
+    detail: str
+
+
+class OrderBulkStatusResult(BaseModel):
+    updated: int
+    unchanged: int
+    rejected: list[OrderBulkStatusRejected]
+
+
+class OrderSearch(BaseModel):
+    """Order list filters; every field is optional and set fields are ANDed."""
+
+    statuses: list[str] | None = None
+    start: datetime | None = None  # dahil
+    end: datetime | None = None  # dahil
+    customer: str | None = Field(None, min_length=3, max_length=255)  # e-posta / ad parçası
+    product_id: UUID | None = None
+    sku: str | None = Field(None, max_length=100)  # ürün ya da varyant SKU'su
+    tracking_number: str | None = Field(None, max_length=100)
+    min_total: Decimal | None = Field(None, ge=0)
+    max_total: Decimal | None = Field(None, ge=0)
+
+
 class OrderUpdateShipping(BaseModel):
     tracking_number: str | None = None
     carrier: str | None = None
@@ -0,0 +1,74 @@
+"""Schemas for bulk price / activation rules."""
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class PriceRuleFilter(BaseModel):
+    all_products: bool = False
+    category_id: UUID | None = None
+    product_ids: list[UUID] | None = Field(None, max_length=10000)
+    is_active: bool | None = None
+    min_price: Decimal | None = Field(None, ge=0)
+    max_price: Decimal | None = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        criteria = (self.category_id, self.product_ids, self.is_active, self.min_price, self.max_price)
+        if not self.all_products and all(value is None for value in criteria):
+            raise ValueError("En az bir filtre gerekli (tüm ürünler için all_products=true).")
+        return self
+
+
+class PriceRule(BaseModel):
+    """
+    Sırasıyla uygulanır: percent (örn. -15 = %15 indirim), amount (sabit tutar
+    ekle / çıkar), 0'ın altına düşmez, 2 haneye yuvarlanır, ending verilirse
+    kuruş kısmı ending yapılır (örn. 0.99 -> 84.15 = 84.99). is_active verilirse
+    eşleşen ürünler aktif / pasif yapılır.
+    """
+    filter: PriceRuleFilter
+    percent: Decimal | None = Field(None, ge=-100, le=1000)
+    amount: Decimal | None = None
+    ending: Decimal | None = Field(None, ge=0, lt=1, decimal_places=2)
+    is_active: bool | None = None
+    apply_to_variants: bool = True
+
+    @model_validator(mode="after")
+    def require_change(self):
+        if self.percent is None and self.amount is None and self.ending is None and self.is_active is None:
+            raise ValueError("percent, amount, ending veya is_active'ten en az biri gerekli.")
+        return self
+
+    @property
+    def changes_price(self) -> bool:
+        return self.percent is not None or self.amount is not None or self.ending is not None
+
+
+class PriceRulePreviewRow(BaseModel):
+    id: UUID
+    name: str
+    price: Decimal
+    new_price: Decimal
+
+
+class PriceRuleResult(BaseModel):
+    dry_run: bool
+    products_matched: int
+    variants_matched: int
+    sample: list[PriceRulePreviewRow] = []
+    run_id: UUID | None = None
+
+
+class PriceRuleRunOut(BaseModel):
+    id: UUID
+    rule: dict
+    products_updated: int
+    variants_updated: int
+    actor_id: UUID | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
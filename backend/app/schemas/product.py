@@ -2,14 +2,16 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProductBase(BaseModel):
     name: str
+    sku: str | None = Field(None, max_length=100)
     description: str | None = None
     price: Decimal
     stock: int
+    reorder_threshold: int = Field(10, ge=0)
     is_active: bool = True
     category_id: UUID | None = None
 
@@ -20,9 +22,11 @@ class ProductCreate(ProductBase):
 
 class ProductUpdate(BaseModel):
     name: str | None = None
+    sku: str | None = Field(None, max_length=100)
     description: str | None = None
     price: Decimal | None = None
     stock: int | None = None
+    reorder_threshold: int | None = Field(None, ge=0)
     is_active: bool | None = None
     category_id: UUID | None = None
 
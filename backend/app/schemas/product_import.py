@@ -0,0 +1,74 @@
+"""Schemas for bulk product import."""
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+class ProductImportRow(BaseModel):
+    """
+    Dosyadaki tek satır: bir ürün, opsiyonel olarak bir varyantıyla. Çok varyantlı
+    ürünlerde ürün kolonları her varyant satırında tekrarlanır.
+    """
+    sku: str = Field(..., min_length=1, max_length=100)
+    name: str = Field(..., min_length=1, max_length=255)
+    description: str | None = Field(None, max_length=1000)
+    price: Decimal = Field(..., ge=0, max_digits=10, decimal_places=2)
+    stock: int = Field(0, ge=0)
+    reorder_threshold: int = Field(10, ge=0)
+    is_active: bool = True
+    category: str | None = Field(None, max_length=255)
+
+    variant_sku: str | None = Field(None, min_length=1, max_length=100)
+    variant_name: str | None = Field(None, max_length=200)
+    variant_price: Decimal | None = Field(None, ge=0, max_digits=12, decimal_places=2)
+    variant_stock: int = Field(0, ge=0)
+    variant_attributes: dict[str, Any] | None = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def drop_empty_cells(cls, data: Any) -> Any:
+        # CSV'de boş hücre "" gelir; varsayılan değer uygulansın
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if value != "" and value is not None}
+        return data
+
+    @field_validator("variant_attributes", mode="before")
+    @classmethod
+    def parse_attributes(cls, value: Any) -> Any:
+        # CSV'de JSON string olarak gelir: {"color": "Red"}
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+
+class ProductImportJobOut(BaseModel):
+    id: UUID
+    status: str
+    format: str
+    filename: str | None
+    total_rows: int | None
+    rows_processed: int
+    products_created: int
+    products_updated: int
+    variants_created: int
+    variants_updated: int
+    error_count: int
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductImportErrorOut(BaseModel):
+    row_number: int
+    message: str
+
+    class Config:
+        from_attributes = True
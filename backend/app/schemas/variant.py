@@ -4,7 +4,7 @@ from decimal import Decimal
 from uuid import UUID
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # ───────────────── ProductVariant ─────────────────
@@ -15,6 +15,7 @@ class VariantBase(BaseModel):
     attributes: dict[str, Any] = {}
     price_override: Decimal | None = None
     stock: int = 0
+    reorder_threshold: int = Field(10, ge=0)
     is_active: bool = True
 
 
@@ -28,6 +29,7 @@ class VariantUpdate(BaseModel):
     attributes: dict[str, Any] | None = None
     price_override: Decimal | None = None
     stock: int | None = None
+    reorder_threshold: int | None = Field(None, ge=0)
     is_active: bool | None = None
 
 
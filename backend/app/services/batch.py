@@ -0,0 +1,160 @@
+"""
+/batch: bir HTTP çağrısında birden fazla API isteğini süreç içinde çalıştırır.
+
+Alt istekler ağdan geçmeden aynı ASGI uygulamasına (middleware'ler ve
+exception handler'lar dahil) gönderilir. Kimlik batch isteğinde bir kez
+doğrulanır; alt isteklerde get_current_user token çözmez, kullanıcıyı tekrar
+sorgulamaz. Sıralı modda alt istekler batch'in DB session'larını da paylaşır:
+yazmalar primary session'ından, okuma endpoint'leri (get_read_db_session)
+replika session'ından geçer. Paralel modda her biri kendi session'ını açar
+(AsyncSession eşzamanlı kullanılamaz).
+"""
+import asyncio
+import json
+import logging
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchSubRequest
+
+logger = logging.getLogger("app.batch")
+
+# Alt istekte istemcinin ezemeyeceği header'lar
+RESERVED_HEADERS = frozenset({"authorization", "content-length", "content-type", "host"})
+
+
+def _scope(request: Request, item: BatchSubRequest, body: bytes, state: dict) -> dict:
+    path, _, query = item.path.partition("?")
+    path = settings.API_V1_PREFIX + path
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        # oauth2_scheme token'ı header'dan bekler; kullanıcı yine de state'ten gelir
+        headers.append((b"authorization", authorization.encode()))
+    headers.extend(
+        (name.lower().encode(), value.encode())
+        for name, value in item.headers.items()
+        if name.lower() not in RESERVED_HEADERS
+    )
+    return {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": item.method,
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": state,
+    }
+
+
+async def _dispatch(request: Request, scope: dict, body: bytes) -> tuple[int, list, bytes]:
+    # finished: son body parçası gönderildi, uygulama bitti ya da yanıt bir akış
+    finished = asyncio.Event()
+    request_sent = False
+    streaming = False
+    status, headers, chunks = 500, [], []
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Yanıt bitene kadar "bağlantı koptu" denmemeli
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        nonlocal status, headers, streaming
+        if message["type"] == "http.response.start":
+            status, headers = message["status"], message.get("headers", [])
+            content_type = dict(headers).get(b"content-type", b"")
+            if content_type.startswith(b"text/event-stream"):
+                streaming = True
+                finished.set()
+        elif message["type"] == "http.response.body" and not streaming:
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                finished.set()
+
+    task = asyncio.ensure_future(request.app(scope, receive, send))
+    task.add_done_callback(lambda _: finished.set())
+    await finished.wait()
+    if streaming:
+        # SSE hiç bitmez; alt istek iptal edilir
+        task.cancel()
+    try:
+        # Yanıttan sonra çalışan BackgroundTasks için uygulamanın bitmesi beklenir
+        await task
+    except asyncio.CancelledError:
+        if not streaming:
+            raise
+    except Exception:
+        # ServerErrorMiddleware 500 yanıtını zaten gönderdi
+        logger.exception("Batch sub-request %s %s failed", scope["method"], scope["path"])
+
+    if streaming:
+        detail = json.dumps({"detail": "Akış (SSE) endpoint'leri batch içinde çağrılamaz."})
+        return 400, [(b"content-type", b"application/json")], detail.encode()
+    return status, headers, b"".join(chunks)
+
+
+def _decode(headers: dict[str, str], body: bytes):
+    if not body:
+        return None
+    if headers.get("content-type", "").startswith("application/json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def run_sub_request(request: Request, item: BatchSubRequest, state: dict) -> dict:
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    scope = _scope(request, item, body, state)
+    status, raw_headers, content = await _dispatch(request, scope, body)
+    headers = {
+        name.decode("latin-1"): value.decode("latin-1")
+        for name, value in raw_headers
+        if name.lower() != b"content-length"
+    }
+    return {"id": item.id, "status": status, "headers": headers, "body": _decode(headers, content)}
+
+
+async def run_batch(
+    request: Request, batch: BatchRequest, user: User, db: AsyncSession, read_db: AsyncSession
+) -> list[dict]:
+    """Alt istekleri çalıştırır; yanıtlar istek sırasıyla döner."""
+    if not batch.parallel:
+        # Rollback session'daki nesneleri expire eder; kullanıcı yüklü haliyle ayrılır
+        db.expunge(user)
+        state = {"batch_user": user, "batch_db": db, "batch_read_db": read_db}
+        results = []
+        for item in batch.requests:
+            result = await run_sub_request(request, item, state)
+            if result["status"] >= 400:
+                # Başarısız alt isteğin yarım değişiklikleri sonrakine taşınmasın
+                await db.rollback()
+            if read_db is not db:
+                # Okuma transaction'ı alt istekler arasında açık kalmasın; sonraki
+                # alt istek önceki yazmaları (replika yetiştikçe) görür
+                await read_db.rollback()
+            results.append(result)
+        return results
+
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def limited(item: BatchSubRequest) -> dict:
+        async with semaphore:
+            return await run_sub_request(request, item, {"batch_user": user})
+
+    return list(await asyncio.gather(*(limited(item) for item in batch.requests)))
@@ -0,0 +1,83 @@
+"""
+Süreç içi yayın/abone: commit edilen değişiklikleri SSE akışlarına dağıtır.
+
+Her abonenin sınırlı bir kuyruğu vardır; yavaş tüketici kuyruğu doldurursa
+abonelik "overflow" ile kapanır (üretici hiçbir zaman beklemez, bellek sınırsız
+büyümez). İstemci yeniden bağlanıp güncel durumu çeker.
+"""
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable
+
+logger = logging.getLogger("app.events")
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    topic: str
+    type: str
+    data: dict = field(default_factory=dict)
+
+
+class SubscriptionOverflow(Exception):
+    """Abone kuyruğu doldu; olay kaçırıldı."""
+
+
+class Subscription:
+    def __init__(self, broker: "EventBroker", topics: frozenset[str], max_queue: int):
+        self.broker = broker
+        self.topics = topics
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+    def offer(self, event: Event) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            logger.warning("Event subscriber overflowed on %s; closing", ",".join(self.topics))
+
+    async def get(self) -> Event:
+        if self.overflowed and self.queue.empty():
+            raise SubscriptionOverflow()
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.broker._subscriptions.discard(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class EventBroker:
+    def __init__(self) -> None:
+        self._subscriptions: set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topics: Iterable[str], max_queue: int = 100) -> Subscription:
+        subscription = Subscription(self, frozenset(topics), max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def publish(self, topic: str, type: str, data: dict) -> Event:
+        """Senkron ve bloklamaz; event loop thread'inden çağrılmalı."""
+        event = Event(id=next(self._ids), topic=topic, type=type, data=data)
+        for subscription in list(self._subscriptions):
+            if topic in subscription.topics:
+                subscription.offer(event)
+        return event
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+
+broker = EventBroker()
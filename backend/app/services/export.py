@@ -0,0 +1,170 @@
+"""Streaming export yardımcıları: NDJSON / CSV satırları ve anlık gzip."""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+ORDER_FIELDS = (
+    "order_id",
+    "created_at",
+    "status",
+    "user_id",
+    "user_email",
+    "total_amount",
+    "tracking_number",
+    "carrier",
+    "shipped_at",
+    "delivered_at",
+)
+ITEM_FIELDS = (
+    "item_id",
+    "product_id",
+    "variant_id",
+    "quantity",
+    "unit_price",
+    "line_total",
+)
+
+
+def export_value(value):
+    # API yanıtlarıyla aynı biçim: Decimal ve UUID string, tarih ISO 8601
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _dump_line(document: dict) -> bytes:
+    return (json.dumps(document, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+
+
+async def order_ndjson(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """
+    Sipariş başına bir JSON satırı, kalemler "items" altında.
+    Satırlar sipariş sırasıyla geldiği için bellekte yalnızca açık sipariş tutulur.
+    """
+    current: dict | None = None
+    async for batch in batches:
+        lines = []
+        for row in batch:
+            mapping = row._mapping
+            if current is None or current["order_id"] != str(mapping["order_id"]):
+                if current is not None:
+                    lines.append(_dump_line(current))
+                current = {field: export_value(mapping[field]) for field in ORDER_FIELDS}
+                current["items"] = []
+            if mapping["item_id"] is not None:
+                current["items"].append(
+                    {field: export_value(mapping[field]) for field in ITEM_FIELDS}
+                )
+        if lines:
+            yield b"".join(lines)
+    if current is not None:
+        yield _dump_line(current)
+
+
+LEDGER_FIELDS = (
+    "id",
+    "created_at",
+    "product_id",
+    "variant_id",
+    "change",
+    "reason",
+    "ref_order_id",
+    "notes",
+)
+
+
+async def rows_ndjson(batches: AsyncIterator[Sequence], fields: Sequence[str]) -> AsyncIterator[bytes]:
+    """Düz satırlar için NDJSON: satır başına bir obje."""
+    async for batch in batches:
+        yield b"".join(
+            _dump_line({field: export_value(row._mapping[field]) for field in fields})
+            for row in batch
+        )
+
+
+async def rows_csv(batches: AsyncIterator[Sequence], fields: Sequence[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for batch in batches:
+        for row in batch:
+            mapping = row._mapping
+            writer.writerow(["" if mapping[f] is None else export_value(mapping[f]) for f in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def order_csv(batches: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """Kalem başına bir CSV satırı; sipariş kolonları her satırda tekrarlanır."""
+    return rows_csv(batches, ORDER_FIELDS + ITEM_FIELDS)
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Chunk'ları tek bir gzip üyesi olarak anlık sıkıştırır (wbits=16+: gzip header)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Accept-Encoding gzip'e q > 0 veriyor mu? Açıkça listelenmemişse * geçerli;
+    "gzip;q=0" reddettiği anlamına gelir.
+    """
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+def export_response(
+    request: Request,
+    body: AsyncIterator[bytes],
+    format: str,
+    filename: str,
+) -> StreamingResponse:
+    """İstemci gzip kabul ediyorsa gövde anlık sıkıştırılır."""
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
@@ -0,0 +1,182 @@
+"""
+Tablo tabanlı canlı akışlar (sipariş olayları, stok uyarıları).
+
+Olaylar satır olarak commit edilir; worker başına tek bir EventFeed yeni
+satırları okuyup süreç içi broker'a yayınlar. Postgres'te tek bir LISTEN
+bağlantısı tablonun NOTIFY trigger'ı ile uyanır ve yeni satırları tek sorguyla
+okur; diğer veritabanlarında aynı sorgu aralıklı yoklanır. Kaç istemci bağlı
+olursa olsun veritabanı yükü worker başına sabittir. Satır kimliği
+(created_at, id) cursor'ıdır: kopan / kuyruğu taşan istemci Last-Event-ID ile
+kaldığı yerden devam eder (follow_feed).
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import UUID
+
+from fastapi.sse import ServerSentEvent
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.services.events import EventBroker, SubscriptionOverflow, broker as default_broker
+from app.services.export import export_value
+
+logger = logging.getLogger("app.feed")
+
+# Commit'i geciken (created_at'i daha eski) olayları kaçırmamak için yeniden okunan pencere
+OVERLAP = timedelta(seconds=5)
+# NOTIFY kaçırılsa bile (ör. bağlantı sessizce koptu) bu aralıkla bir kez okunur
+LISTEN_SAFETY_INTERVAL = 30.0
+PAGE_SIZE = 500
+
+# (db, after_created_at=, after_id=, limit=) -> (created_at, id) sırasıyla satırlar
+FeedFetcher = Callable[..., Awaitable[list[dict]]]
+
+
+def make_cursor(created_at: datetime, event_id: UUID) -> str:
+    return f"{created_at.isoformat()}_{event_id}"
+
+
+def parse_cursor(cursor: str) -> tuple[datetime, UUID]:
+    created_at, _, event_id = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(created_at), UUID(event_id)
+    except ValueError as exc:
+        raise ValueError("Geçersiz cursor.") from exc
+
+
+def feed_payload(row: dict) -> dict:
+    payload = {key: export_value(value) for key, value in row.items()}
+    payload["cursor"] = make_cursor(row["created_at"], row["id"])
+    return payload
+
+
+def feed_event(payload: dict) -> ServerSentEvent:
+    return ServerSentEvent(data=payload, event=payload["type"], id=payload["cursor"])
+
+
+class EventFeed:
+    """Alt sınıf topic, channel (NOTIFY kanalı) ve fetch'i belirler."""
+
+    topic: str
+    channel: str
+    fetch: FeedFetcher
+
+    def __init__(self, session_maker: sessionmaker, broker: EventBroker = default_broker):
+        self.session_maker = session_maker
+        self.broker = broker
+        self.watermark = datetime.utcnow()
+        # Örtüşme penceresindeki yayınlanmış olaylar: tekrar yayınlanmasın
+        self._recent: dict[UUID, datetime] = {}
+
+    async def prime(self) -> None:
+        """Başlangıçtan önceki olaylar yayınlanmadan "görüldü" sayılır."""
+        async with self.session_maker() as db:
+            rows = await self.fetch(db, after_created_at=self.watermark - OVERLAP, limit=PAGE_SIZE)
+        for row in rows:
+            self._recent[row["id"]] = row["created_at"]
+            self.watermark = max(self.watermark, row["created_at"])
+
+    async def catch_up(self) -> int:
+        """Watermark'tan (eksi örtüşme) sonraki yeni olayları yayınlar; yayınlanan sayısını döner."""
+        published = 0
+        after_created_at, after_id = self.watermark - OVERLAP, None
+        async with self.session_maker() as db:
+            while True:
+                rows = await self.fetch(
+                    db, after_created_at=after_created_at, after_id=after_id, limit=PAGE_SIZE
+                )
+                for row in rows:
+                    if row["id"] in self._recent:
+                        continue
+                    self._recent[row["id"]] = row["created_at"]
+                    self.watermark = max(self.watermark, row["created_at"])
+                    self.broker.publish(self.topic, row["type"], feed_payload(row))
+                    published += 1
+                if len(rows) < PAGE_SIZE:
+                    break
+                after_created_at, after_id = rows[-1]["created_at"], rows[-1]["id"]
+
+        horizon = self.watermark - OVERLAP
+        self._recent = {key: at for key, at in self._recent.items() if at >= horizon}
+        return published
+
+    async def _listen(self, engine: AsyncEngine) -> None:
+        wake = asyncio.Event()
+        async with engine.connect() as connection:
+            raw = (await connection.get_raw_connection()).driver_connection
+            await raw.add_listener(self.channel, lambda *_: wake.set())
+            # Bağlantı yokken commit edilenler
+            await self.catch_up()
+            while not raw.is_closed():
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=LISTEN_SAFETY_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                # Art arda gelen NOTIFY'lar tek sorguda birleşir
+                wake.clear()
+                await self.catch_up()
+
+    async def _poll(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.catch_up()
+
+    async def run(self, engine: AsyncEngine, poll_interval: float) -> None:
+        """Arka plan görevi: Postgres'te LISTEN, diğerlerinde poll_interval ile yoklama."""
+        primed = False
+        while True:
+            try:
+                if not primed:
+                    await self.prime()
+                    primed = True
+                if engine.dialect.name == "postgresql":
+                    await self._listen(engine)
+                else:
+                    await self._poll(poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("%s feed failed, reconnecting: %s", self.topic, exc)
+            await asyncio.sleep(poll_interval)
+
+
+async def follow_feed(
+    db: AsyncSession,
+    fetch: FeedFetcher,
+    topic: str,
+    after: tuple[datetime, UUID] | None,
+    max_queue: int,
+    replay_limit: int,
+    broker: EventBroker = default_broker,
+) -> AsyncIterator[ServerSentEvent]:
+    """
+    SSE gövdesi: cursor verilmişse sonrasını yeniden oynatır, sonra canlı olayları
+    iter. Kuyruk dolarsa "overflow", kaçırılan olay replay_limit'i aşarsa "reset"
+    gönderilip akış kapanır.
+    """
+    with broker.subscribe([topic], max_queue=max_queue) as subscription:
+        # Önce abone olunur, sonra geçmiş okunur: aradaki olay kaçmaz, tekrarı atlanır
+        replayed: set[str] = set()
+        if after is not None:
+            rows = await fetch(db, after_created_at=after[0], after_id=after[1], limit=replay_limit + 1)
+            if len(rows) > replay_limit:
+                yield ServerSentEvent(data={}, event="reset")
+                return
+            for row in rows:
+                payload = feed_payload(row)
+                replayed.add(payload["id"])
+                yield feed_event(payload)
+        # Canlı akış boyunca pool bağlantısı tutulmasın
+        await db.close()
+
+        while True:
+            try:
+                event = await subscription.get()
+            except SubscriptionOverflow:
+                yield ServerSentEvent(data={}, event="overflow")
+                return
+            if event.data["id"] in replayed:
+                continue
+            yield feed_event(event.data)
@@ -0,0 +1,159 @@
+"""
+Idempotency-Key: ağ kopması / timeout sonrası tekrar denenen POST'lar ikinci
+bir sipariş, PaymentIntent ya da iade oluşturmaz.
+
+Anahtar (kullanıcı, anahtar, route) üçlüsüdür. İlk istek anahtarı kilitler;
+yanıtı sıkıştırılıp TTL boyunca saklanır. Aynı anahtarla gelen tekrar,
+endpoint'e (kullanıcı sorgusu dahil) hiç girmeden tek bir SELECT ile saklanan
+yanıtı alır. İlk istek hâlâ işleniyorsa 409, anahtar farklı bir gövdeyle
+kullanılmışsa 422 döner. 5xx ya da exception ile biten isteğin kilidi
+bırakılır; istemci aynı anahtarla tekrar deneyebilir.
+"""
+import asyncio
+import hashlib
+import logging
+import zlib
+from datetime import timedelta
+from uuid import UUID
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.crud.idempotency import (
+    IN_PROGRESS,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    delete_expired_idempotency_keys,
+    release_idempotency_key,
+)
+
+logger = logging.getLogger("app.idempotency")
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# API prefix'i olmadan; yalnızca bu POST'lar anahtarı dikkate alır
+ROUTES = frozenset({"/orders/", "/payments/create-intent", "/payments/refund"})
+
+
+def request_user_id(request: Request) -> UUID | None:
+    """Bearer token'daki kullanıcı; token geçersizse None (endpoint 401 döner)."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return UUID(decode_access_token(token).get("sub") or "")
+    except ValueError:
+        return None
+
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def dump_headers(raw_headers: list[tuple[bytes, bytes]]) -> list[list[str]]:
+    # Set-Cookie gibi tekrarlanan başlıklar sırasıyla korunur
+    return [[name.decode("latin-1"), value.decode("latin-1")] for name, value in raw_headers]
+
+
+def build_response(status_code: int, body: bytes, raw_headers: list[tuple[bytes, bytes]]) -> Response:
+    response = Response(content=body, status_code=status_code)
+    response.raw_headers = raw_headers
+    return response
+
+
+def stored_response(record) -> Response:
+    raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record.response_headers]
+    raw_headers.append((REPLAYED_HEADER.lower().encode("latin-1"), b"true"))
+    return build_response(record.response_status, zlib.decompress(record.response_body), raw_headers)
+
+
+async def handle_idempotent_request(request: Request, call_next, session_maker: sessionmaker) -> Response:
+    route = request.url.path.removeprefix(settings.API_V1_PREFIX)
+    key = request.headers.get(HEADER)
+    if key is None or request.method != "POST" or route not in ROUTES:
+        return await call_next(request)
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return JSONResponse(
+            {"detail": f"{HEADER} 1-{MAX_KEY_LENGTH} karakter olmalı."},
+            status_code=400,
+        )
+    user_id = request_user_id(request)
+    if user_id is None:
+        return await call_next(request)
+
+    fingerprint = request_hash(await request.body())
+    async with session_maker() as db:
+        existing = await claim_idempotency_key(
+            db,
+            user_id,
+            key,
+            route,
+            fingerprint,
+            ttl=timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS),
+            lock_timeout=timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS),
+        )
+    if existing is not None:
+        if existing.request_hash != fingerprint:
+            return JSONResponse(
+                {"detail": f"{HEADER} farklı bir istek gövdesiyle kullanılmış."},
+                status_code=422,
+            )
+        if existing.status == IN_PROGRESS:
+            return JSONResponse(
+                {"detail": "Aynı Idempotency-Key ile gönderilen istek hâlâ işleniyor."},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+        return stored_response(existing)
+
+    # İptal (client koptu) durumunda kilit bırakılamaz; lock timeout sonrası devralınır
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    except Exception:
+        async with session_maker() as db:
+            await release_idempotency_key(db, user_id, key, route)
+        raise
+
+    async with session_maker() as db:
+        if response.status_code >= 500:
+            await release_idempotency_key(db, user_id, key, route)
+        else:
+            await complete_idempotency_key(
+                db,
+                user_id,
+                key,
+                route,
+                response.status_code,
+                zlib.compress(body),
+                dump_headers(response.raw_headers),
+            )
+    return build_response(response.status_code, body, response.raw_headers)
+
+
+async def sweep_expired_idempotency_keys(session_maker: sessionmaker, batch_size: int = 1000) -> int:
+    total = 0
+    while True:
+        async with session_maker() as db:
+            deleted = await delete_expired_idempotency_keys(db, batch_size=batch_size)
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def idempotency_sweeper(session_maker: sessionmaker, interval: float) -> None:
+    """Arka plan görevi: TTL'i dolan saklı yanıtları siler."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            deleted = await sweep_expired_idempotency_keys(session_maker)
+        except Exception as exc:
+            logger.warning("Idempotency key sweep failed: %s", exc)
+        else:
+            if deleted:
+                logger.info("Deleted %d expired idempotency keys", deleted)
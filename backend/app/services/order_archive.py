@@ -0,0 +1,184 @@
+"""
+Soğuk sipariş arşivi.
+
+Kapanmış (delivered / cancelled / refunded) ve N aydan eski siparişler
+kalemleri, olayları, ödemeleri ve iadeleriyle birlikte sıcak tablolardan
+çıkarılır; sıcak sorgular (liste, overview, tarih filtreli raporlar) yalnızca
+son ayların verisini okur. Tablo arşivi sipariş detayında, müşterinin kendi
+listesinde ve sipariş export'unda salt okunur olarak okunur
+(app.crud.order.get_archived_orders, stream_order_export_rows). İki hedef:
+
+- table: aynı transaction'da *_archive tablolarına kopyalanır (Postgres'te
+  siparişin ayına göre aylık partition; eksik aylar o an açılır),
+- file: ay başına orders-YYYYMM.ndjson.gz dosyasına yeni bir gzip member
+  olarak eklenir, sonra silinir. Commit başarısız olursa sonraki çalıştırma
+  aynı siparişleri tekrar yazar; okuyucu sipariş id'siyle tekilleştirmeli.
+
+İki modda da ay/durum toplamları order_archive_stats'a eklenir. Stok
+hareketleri (defter) taşınmaz; ref_order_id arşivdeki siparişi gösterir.
+"""
+import asyncio
+import gzip
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.partitions import add_months, ensure_month_partitions, month_start
+from app.models.archive import ARCHIVE_TABLES, ORDER_CREATED_AT, ArchivedOrderStat
+from app.models.inventory import StockReservation
+from app.models.order import Order
+from app.services.export import export_value
+
+CLOSED_STATUSES = ("delivered", "cancelled", "refunded")
+
+
+@dataclass
+class ArchiveReport:
+    cutoff: datetime
+    orders: int = 0
+    rows: dict[str, int] = field(default_factory=dict)  # sıcak tablo -> taşınan satır
+    files: list[str] = field(default_factory=list)
+
+
+def archive_cutoff(months: int, now: datetime | None = None) -> datetime:
+    """months ay önceki ayın başı (UTC): bir ay ya tamamen taşınır ya hiç."""
+    month = add_months(month_start(now or datetime.now(timezone.utc)), -months)
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+async def _claim_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> Sequence:
+    # SKIP LOCKED: o an güncellenen siparişi beklemez, sonraki çalıştırmaya bırakır
+    result = await db.execute(
+        select(Order.id, Order.created_at, Order.status, Order.total_amount)
+        .where(Order.status.in_(CLOSED_STATUSES), Order.created_at < cutoff)
+        .order_by(Order.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    return result.all()
+
+
+async def _copy_to_tables(db: AsyncSession, ids: list, months: set[date], report: ArchiveReport) -> None:
+    connection = await db.connection()
+    orders = Order.__table__
+    for model, archive in ARCHIVE_TABLES:
+        await ensure_month_partitions(connection, archive.name, months)
+        source = model.__table__
+        if model is Order:
+            rows = select(*source.c).where(source.c.id.in_(ids))
+        else:
+            rows = (
+                select(*source.c, orders.c.created_at.label(ORDER_CREATED_AT))
+                .join(orders, orders.c.id == source.c.order_id)
+                .where(orders.c.id.in_(ids))
+            )
+        result = await db.execute(
+            insert(archive).from_select([c.name for c in rows.selected_columns], rows)
+        )
+        report.rows[source.name] = report.rows.get(source.name, 0) + result.rowcount
+
+
+def _append_gzip(path: Path, lines: list[bytes]) -> None:
+    # Her çağrı ayrı bir gzip member; gzip okuyucuları ardışık member'ları tek akış okur
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+            compressed.writelines(lines)
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+async def _write_files(db: AsyncSession, ids: list, output_dir: Path, report: ArchiveReport) -> None:
+    """Sipariş başına bir NDJSON satırı; alt kayıtlar tablo adıyla iç içe."""
+    orders = (await db.execute(select(Order.__table__).where(Order.id.in_(ids)))).mappings().all()
+    documents = {row["id"]: {name: export_value(value) for name, value in row.items()} for row in orders}
+    report.rows["orders"] = report.rows.get("orders", 0) + len(orders)
+    for model, _ in ARCHIVE_TABLES[1:]:
+        table = model.__table__
+        for document in documents.values():
+            document[table.name] = []
+        rows = (await db.execute(select(table).where(table.c.order_id.in_(ids)))).mappings().all()
+        for row in rows:
+            documents[row["order_id"]][table.name].append(
+                {name: export_value(value) for name, value in row.items()}
+            )
+        report.rows[table.name] = report.rows.get(table.name, 0) + len(rows)
+
+    by_month: dict[date, list[bytes]] = defaultdict(list)
+    for row in orders:
+        line = json.dumps(documents[row["id"]], ensure_ascii=False, separators=(",", ":")) + "\n"
+        by_month[month_start(row["created_at"])].append(line.encode())
+    for month, lines in sorted(by_month.items()):
+        path = output_dir / f"orders-{month:%Y%m}.ndjson.gz"
+        await asyncio.to_thread(_append_gzip, path, lines)
+        if str(path) not in report.files:
+            report.files.append(str(path))
+
+
+async def _add_to_rollup(db: AsyncSession, batch: Sequence) -> None:
+    totals: dict[tuple[date, str], list] = defaultdict(lambda: [0, Decimal("0")])
+    for row in batch:
+        entry = totals[(month_start(row.created_at), row.status)]
+        entry[0] += 1
+        entry[1] += row.total_amount or 0
+    rows = [
+        {"month": month, "status": status, "order_count": count, "revenue": revenue}
+        for (month, status), (count, revenue) in totals.items()
+    ]
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(ArchivedOrderStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["month", "status"],
+        set_={
+            "order_count": ArchivedOrderStat.order_count + stmt.excluded.order_count,
+            "revenue": ArchivedOrderStat.revenue + stmt.excluded.revenue,
+        },
+    )
+    await db.execute(stmt, rows)
+
+
+async def archive_orders(
+    db: AsyncSession,
+    months: int,
+    batch_size: int = 1000,
+    output_dir: Path | None = None,
+    now: datetime | None = None,
+) -> ArchiveReport:
+    """
+    Kapanmış, `months` aydan eski siparişleri batch'ler halinde taşır; her batch
+    ayrı commit. output_dir verilirse arşiv tabloları yerine .ndjson.gz dosyaları.
+    """
+    report = ArchiveReport(cutoff=archive_cutoff(months, now))
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    while True:
+        batch = await _claim_batch(db, report.cutoff, batch_size)
+        if not batch:
+            # Yazılan bir şey yok; rollback çağıranın nesnelerini expire ederdi
+            await db.commit()
+            return report
+        ids = [row.id for row in batch]
+        if output_dir is None:
+            await _copy_to_tables(db, ids, {month_start(row.created_at) for row in batch}, report)
+        else:
+            await _write_files(db, ids, output_dir, report)
+        await _add_to_rollup(db, batch)
+
+        # Alt tablolar önce (SQLite'ta FK cascade'e güvenilmez); stok hareketlerine dokunulmaz
+        await db.execute(delete(StockReservation.__table__).where(StockReservation.order_id.in_(ids)))
+        for model, _ in reversed(ARCHIVE_TABLES):
+            table = model.__table__
+            column = table.c.id if model is Order else table.c.order_id
+            await db.execute(delete(table).where(column.in_(ids)))
+        await db.commit()
+        report.orders += len(batch)
+        if len(batch) < batch_size:
+            return report
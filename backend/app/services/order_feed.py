@@ -0,0 +1,16 @@
+"""
+Canlı sipariş akışı: commit edilen OrderEvent satırlarını (created, durum
+değişiklikleri, ödeme olayları) "orders" konusuna yayınlar. Dinleme, yoklama ve
+cursor ile devam app.services.feed'de; NOTIFY order_events trigger'ından gelir.
+"""
+from app.crud.inventory import get_order_feed
+from app.services.feed import EventFeed
+
+TOPIC = "orders"
+CHANNEL = "order_events"
+
+
+class OrderFeed(EventFeed):
+    topic = TOPIC
+    channel = CHANNEL
+    fetch = staticmethod(get_order_feed)
@@ -0,0 +1,360 @@
+"""
+Toplu ürün içe aktarımı (CSV / JSONL).
+
+Dosya satır satır okunur ve chunk'lar halinde işlenir: her chunk Pydantic ile
+doğrulanır, kategoriler isimle çözülür, ürünler ve varyantlar SKU üzerinden tek
+transaction'da upsert edilir (Postgres'te COPY ile geçici staging tablosuna,
+diğerlerinde executemany). İşin checkpoint'i (rows_processed) aynı transaction'da
+ilerler; yarıda kalan iş son commit edilen chunk'tan devam eder.
+"""
+import asyncio
+import csv
+import json
+import logging
+import os
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Iterator
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import Table, column, func, insert, select, table, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud.product_import import claim_import_job, get_import_job, get_resumable_import_job_ids
+from app.db.bulk_copy import copy_records
+from app.models.category import Category
+from app.models.inventory import InventoryMovement
+from app.models.product import Product
+from app.models.product_import import ProductImportError, ProductImportJob
+from app.models.variant import ProductVariant
+from app.schemas.product_import import ProductImportRow
+
+logger = logging.getLogger("app.product_import")
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+PRODUCT_UPDATE_COLUMNS = (
+    "name", "description", "price", "stock", "reorder_threshold", "is_active", "category_id",
+)
+VARIANT_UPDATE_COLUMNS = ("name", "attributes", "price_override", "stock", "updated_at")
+
+
+def import_dir() -> str:
+    path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), settings.PRODUCT_IMPORT_DIR
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ───────────────── Dosya okuma ─────────────────
+
+def iter_records(path: str, format: str) -> Iterator[tuple[int, dict | None]]:
+    """(kayıt numarası, ham satır) üretir; numara başlık ve boş satırlar hariç 1'den başlar."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if format == "csv":
+            for number, row in enumerate(csv.DictReader(f), start=1):
+                yield number, {key: value for key, value in row.items() if key is not None}
+            return
+
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, None
+
+
+def count_records(path: str, format: str) -> int:
+    return sum(1 for _ in iter_records(path, format))
+
+
+def _take(records: Iterator, size: int) -> list:
+    return list(islice(records, size))
+
+
+def _skip(records: Iterator, size: int) -> None:
+    deque(islice(records, size), maxlen=0)
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def validate_records(
+    records: list[tuple[int, dict | None]],
+) -> tuple[list[tuple[int, ProductImportRow]], list[tuple[int, str]]]:
+    valid, errors = [], []
+    for number, record in records:
+        if record is None:
+            errors.append((number, "Geçersiz JSON."))
+            continue
+        try:
+            valid.append((number, ProductImportRow.model_validate(record)))
+        except ValidationError as exc:
+            errors.append((number, _describe(exc)))
+    return valid, errors
+
+
+# ───────────────── Upsert ─────────────────
+
+async def _copy_to_stage(db: AsyncSession, target: Table, rows: list[dict]):
+    """Satırları COPY ile transaction sonunda silinen geçici bir tabloya yazar."""
+    columns, records = copy_records(rows)
+    stage = f"{target.name}_import_stage"
+    connection = await db.connection()
+    await connection.execute(
+        text(f"CREATE TEMP TABLE {stage} (LIKE {target.name} INCLUDING DEFAULTS) ON COMMIT DROP")
+    )
+    raw = (await connection.get_raw_connection()).driver_connection
+    await raw.copy_records_to_table(
+        stage,
+        columns=columns,
+        records=records,
+    )
+    return table(stage, *(column(name) for name in columns))
+
+
+async def _upsert(
+    db: AsyncSession,
+    target: Table,
+    key: str,
+    rows: list[dict],
+    update_columns: tuple[str, ...] = (),
+    extra_set: dict | None = None,
+) -> None:
+    """key üzerinde upsert; update_columns boşsa mevcut satırlara dokunulmaz."""
+    if not rows:
+        return
+    if db.bind.dialect.name == "postgresql":
+        stage = await _copy_to_stage(db, target, rows)
+        stmt = postgresql.insert(target).from_select(list(rows[0]), select(*stage.c))
+        params = None
+    else:
+        stmt = sqlite.insert(target)
+        params = rows
+
+    if update_columns:
+        set_ = {name: stmt.excluded[name] for name in update_columns}
+        stmt = stmt.on_conflict_do_update(index_elements=[key], set_={**set_, **(extra_set or {})})
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[key])
+    await db.execute(stmt, params)
+
+
+# ───────────────── Chunk ─────────────────
+
+@dataclass
+class ChunkResult:
+    products_created: int = 0
+    products_updated: int = 0
+    variants_created: int = 0
+    variants_updated: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+async def _resolve_categories(
+    db: AsyncSession, rows: list[tuple[int, ProductImportRow]], categories: dict[str, UUID]
+) -> None:
+    names = {row.category for _, row in rows if row.category and row.category not in categories}
+    if not names:
+        return
+    await _upsert(db, Category.__table__, "name", [{"id": uuid.uuid4(), "name": name} for name in names])
+    result = await db.execute(select(Category.name, Category.id).where(Category.name.in_(list(names))))
+    categories.update({name: category_id for name, category_id in result})
+
+
+async def import_chunk(
+    db: AsyncSession,
+    records: list[tuple[int, dict | None]],
+    categories: dict[str, UUID],
+) -> ChunkResult:
+    """
+    Bir chunk'ı doğrular ve upsert eder; commit etmez. Aynı SKU chunk içinde
+    tekrar ederse son satır geçerlidir. Stok farkları deftere yazılır.
+    """
+    valid, errors = validate_records(records)
+    result = ChunkResult(errors=errors)
+    await _resolve_categories(db, valid, categories)
+
+    products = {row.sku: row for _, row in valid}
+    existing = {
+        row.sku: row
+        for row in await db.execute(
+            select(Product.id, Product.sku, Product.stock)
+            .where(Product.sku.in_(list(products)))
+            .with_for_update()
+        )
+    }
+    product_ids: dict[str, UUID] = {}
+    product_rows: list[dict] = []
+    movements: list[dict] = []
+    for sku, row in products.items():
+        current = existing.get(sku)
+        product_id = current.id if current else uuid.uuid4()
+        product_ids[sku] = product_id
+        product_rows.append(
+            {
+                "id": product_id,
+                "sku": sku,
+                "name": row.name,
+                "description": row.description,
+                "price": row.price,
+                "stock": row.stock,
+                "reorder_threshold": row.reorder_threshold,
+                "is_active": row.is_active,
+                "category_id": categories.get(row.category) if row.category else None,
+            }
+        )
+        movements.extend(_movement(product_id, None, current, row.stock))
+    result.products_created = len(products) - len(existing)
+    result.products_updated = len(existing)
+    await _upsert(
+        db, Product.__table__, "sku", product_rows, PRODUCT_UPDATE_COLUMNS, {"updated_at": func.now()}
+    )
+
+    variants = {row.variant_sku: (number, row) for number, row in valid if row.variant_sku}
+    existing = {
+        row.sku: row
+        for row in await db.execute(
+            select(ProductVariant.id, ProductVariant.sku, ProductVariant.product_id, ProductVariant.stock)
+            .where(ProductVariant.sku.in_(list(variants)))
+            .with_for_update()
+        )
+    }
+    now = datetime.utcnow()
+    variant_rows: list[dict] = []
+    for sku, (number, row) in variants.items():
+        current = existing.get(sku)
+        product_id = product_ids[row.sku]
+        if current is not None and current.product_id != product_id:
+            result.errors.append((number, f"Varyant SKU'su başka bir ürüne ait: {sku}"))
+            continue
+        variant_id = current.id if current else uuid.uuid4()
+        variant_rows.append(
+            {
+                "id": variant_id,
+                "product_id": product_id,
+                "sku": sku,
+                "name": row.variant_name or sku,
+                "attributes": row.variant_attributes or {},
+                "price_override": row.variant_price,
+                "stock": row.variant_stock,
+                "is_active": True,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        movements.extend(_movement(product_id, variant_id, current, row.variant_stock))
+        if current is None:
+            result.variants_created += 1
+        else:
+            result.variants_updated += 1
+    await _upsert(db, ProductVariant.__table__, "sku", variant_rows, VARIANT_UPDATE_COLUMNS)
+
+    if movements:
+        await db.execute(insert(InventoryMovement), movements)
+    return result
+
+
+def _movement(product_id: UUID, variant_id: UUID | None, current, stock: int) -> list[dict]:
+    # Reconciliation defterle sayacı karşılaştırır: açılış / değişen stok deftere girmeli
+    change = stock - ((current.stock or 0) if current is not None else 0)
+    if not change:
+        return []
+    if current is None:
+        return [{"product_id": product_id, "variant_id": variant_id, "change": change, "reason": "initial"}]
+    return [
+        {
+            "product_id": product_id,
+            "variant_id": variant_id,
+            "change": change,
+            "reason": "adjustment",
+            "notes": "Toplu içe aktarımla stok değişti.",
+        }
+    ]
+
+
+# ───────────────── İş ─────────────────
+
+async def _process(db: AsyncSession, job: ProductImportJob, chunk_size: int) -> None:
+    if job.started_at is None:
+        job.started_at = datetime.utcnow()
+    if job.total_rows is None:
+        job.total_rows = await asyncio.to_thread(count_records, job.path, job.format)
+    await db.commit()
+
+    records = iter_records(job.path, job.format)
+    try:
+        # Checkpoint'e kadar olan satırlar zaten commit edildi
+        await asyncio.to_thread(_skip, records, job.rows_processed)
+        categories: dict[str, UUID] = {}
+        while chunk := await asyncio.to_thread(_take, records, chunk_size):
+            result = await import_chunk(db, chunk, categories)
+            if result.errors:
+                await db.execute(
+                    insert(ProductImportError),
+                    [{"job_id": job.id, "row_number": number, "message": message} for number, message in result.errors],
+                )
+            job.rows_processed += len(chunk)
+            job.products_created += result.products_created
+            job.products_updated += result.products_updated
+            job.variants_created += result.variants_created
+            job.variants_updated += result.variants_updated
+            job.error_count += len(result.errors)
+            job.heartbeat_at = datetime.utcnow()
+            await db.commit()
+    finally:
+        records.close()
+
+    job.status = "completed"
+    job.finished_at = datetime.utcnow()
+    await db.commit()
+    try:
+        os.remove(job.path)
+    except FileNotFoundError:
+        pass
+
+
+async def run_import_job(session_maker: sessionmaker, job_id: UUID, chunk_size: int | None = None) -> None:
+    """İşi claim edip sonuna kadar işler; başka bir worker çalıştırıyorsa hiçbir şey yapmaz."""
+    async with session_maker() as db:
+        if not await claim_import_job(db, job_id):
+            return
+        job = await get_import_job(db, job_id)
+        try:
+            await _process(db, job, chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE)
+        except Exception as exc:
+            await db.rollback()
+            await db.refresh(job)
+            logger.exception("Product import %s failed after row %d", job_id, job.rows_processed)
+            job.status = "failed"
+            job.error = str(exc)[:1000]
+            job.finished_at = datetime.utcnow()
+            await db.commit()
+
+
+async def product_import_worker(session_maker: sessionmaker, interval: float) -> None:
+    """Arka plan görevi: bekleyen ve worker'ı ölmüş işleri sırayla devralır."""
+    while True:
+        try:
+            async with session_maker() as db:
+                job_ids = await get_resumable_import_job_ids(db)
+            for job_id in job_ids:
+                await run_import_job(session_maker, job_id)
+        except Exception as exc:
+            logger.warning("Product import worker failed: %s", exc)
+        await asyncio.sleep(interval)
@@ -0,0 +1,34 @@
+"""Süresi dolan stok rezervasyonlarını periyodik olarak serbest bırakır."""
+import asyncio
+import logging
+
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.inventory import release_expired_reservations
+
+logger = logging.getLogger("app.reservations")
+
+
+async def sweep_expired_reservations(session_maker: sessionmaker, batch_size: int) -> int:
+    """Birikmiş süresi dolmuş rezervasyonları batch batch boşaltır; işlenen sipariş sayısını döner."""
+    total = 0
+    while True:
+        async with session_maker() as db:
+            handled = await release_expired_reservations(db, batch_size=batch_size)
+        total += handled
+        # Kilitli (webhook'un işlediği) siparişler bir sonraki tura kalır
+        if handled == 0:
+            return total
+
+
+async def reservation_sweeper(session_maker: sessionmaker, interval: float, batch_size: int) -> None:
+    """Arka plan görevi: her interval saniyede bir süresi dolan rezervasyonları bırakır."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            released = await sweep_expired_reservations(session_maker, batch_size)
+        except Exception as exc:
+            logger.warning("Reservation sweep failed: %s", exc)
+        else:
+            if released:
+                logger.info("Released %d expired stock reservations", released)
@@ -0,0 +1,42 @@
+"""
+Low-stock uyarıları: products / product_variants üzerindeki trigger'lar eşik
+geçişlerini (low_stock / restocked) stock_alerts tablosuna yazar; ORM, toplu
+Core güncellemeleri (sipariş durumları, fiyat kuralları, içe aktarım) ve diğer
+worker'lar aynı yoldan geçer. Worker başına bir StockAlertFeed yeni satırları
+"inventory" konusuna yayınlar (app.services.feed: LISTEN/NOTIFY, cursor ile devam).
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.inventory import delete_stock_alerts_before, get_stock_alert_feed
+from app.services.feed import EventFeed
+
+logger = logging.getLogger("app.stock_alerts")
+
+TOPIC = "inventory"
+CHANNEL = "stock_alerts"
+
+
+class StockAlertFeed(EventFeed):
+    topic = TOPIC
+    channel = CHANNEL
+    fetch = staticmethod(get_stock_alert_feed)
+
+
+async def stock_alert_sweeper(session_maker: sessionmaker, retention_days: float, interval: float) -> None:
+    """Arka plan görevi: saklama süresi dolan uyarıları siler."""
+    while True:
+        try:
+            async with session_maker() as db:
+                deleted = await delete_stock_alerts_before(
+                    db, datetime.utcnow() - timedelta(days=retention_days)
+                )
+        except Exception as exc:
+            logger.warning("Stock alert sweep failed: %s", exc)
+        else:
+            if deleted:
+                logger.info("Deleted %d old stock alerts", deleted)
+        await asyncio.sleep(interval)
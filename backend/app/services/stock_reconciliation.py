@@ -0,0 +1,248 @@
+"""
+Stock reconciliation: InventoryMovement defter toplamlarını Product.stock /
+ProductVariant.stock sayaçlarıyla karşılaştırır, farkları raporlar veya onarır.
+
+Her koşu SKU başına defter bakiyesini bir watermark'a (through) kadar
+LedgerBalance'a yazar; sonraki koşu yalnızca o watermark'tan sonraki hareketleri
+toplar. Böylece ilk koşu dışında defterin tamamı hiç taranmaz.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, bindparam, delete, func, insert, literal, null, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.inventory import InventoryMovement, LedgerBalance, ReconciliationRun
+from app.models.product import Product
+from app.models.variant import ProductVariant
+
+MODES = ("report", "ledger", "counter")
+
+
+@dataclass
+class Mismatch:
+    sku_id: UUID
+    product_id: UUID
+    variant_id: UUID | None
+    actual: int
+    expected: int
+
+    @property
+    def diff(self) -> int:
+        return self.actual - self.expected
+
+
+@dataclass
+class ReconciliationReport:
+    run_id: UUID
+    mode: str
+    through: datetime
+    incremental: bool
+    checked: int = 0
+    mismatches: int = 0
+    repaired: int = 0
+    samples: list[Mismatch] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _Target:
+    """Sayaç tablosu ve defterde ona karşılık gelen hareketler."""
+    model: type
+    product_id: object
+    variant_id: object
+    movement_key: object
+    movement_filter: object
+
+
+def _targets() -> tuple[_Target, ...]:
+    return (
+        _Target(
+            model=Product,
+            product_id=Product.id,
+            variant_id=null(),
+            movement_key=InventoryMovement.product_id,
+            movement_filter=InventoryMovement.variant_id.is_(None),
+        ),
+        _Target(
+            model=ProductVariant,
+            product_id=ProductVariant.product_id,
+            variant_id=ProductVariant.id,
+            movement_key=InventoryMovement.variant_id,
+            movement_filter=InventoryMovement.variant_id.is_not(None),
+        ),
+    )
+
+
+def _ledger_delta(target: _Target, after: datetime | None, upto: datetime | None):
+    """(after, upto] aralığındaki hareketlerin SKU başına toplamı; created_at index'i ile."""
+    stmt = select(
+        target.movement_key.label("sku_id"),
+        func.sum(InventoryMovement.change).label("change"),
+    ).where(target.movement_filter)
+    if after is not None:
+        stmt = stmt.where(InventoryMovement.created_at > after)
+    if upto is not None:
+        stmt = stmt.where(InventoryMovement.created_at <= upto)
+    return stmt.group_by(target.movement_key).subquery()
+
+
+async def _write_checkpoint(
+    db: AsyncSession,
+    target: _Target,
+    run: ReconciliationRun,
+    previous: ReconciliationRun | None,
+) -> None:
+    # Tek INSERT ... SELECT: önceki bakiye + watermark'lar arası hareketler
+    model = target.model
+    delta = _ledger_delta(target, previous.through if previous else None, run.through)
+    balance = func.coalesce(delta.c.change, 0)
+    stmt = select(
+        literal(run.id, LedgerBalance.run_id.type),
+        model.id,
+        target.product_id,
+        target.variant_id,
+    ).outerjoin(delta, delta.c.sku_id == model.id)
+
+    if previous is not None:
+        previous_balance = aliased(LedgerBalance)
+        stmt = stmt.outerjoin(
+            previous_balance,
+            and_(previous_balance.run_id == previous.id, previous_balance.sku_id == model.id),
+        )
+        balance = func.coalesce(previous_balance.balance, 0) + balance
+
+    await db.execute(
+        insert(LedgerBalance).from_select(
+            ["run_id", "sku_id", "product_id", "variant_id", "balance"],
+            stmt.add_columns(balance),
+        )
+    )
+
+
+async def _mismatch_page(
+    db: AsyncSession,
+    target: _Target,
+    run: ReconciliationRun,
+    after_sku: UUID | None,
+    batch_size: int,
+) -> list[Mismatch]:
+    # Watermark sonrası hareketler de eklenir: beklenen = şu anki defter toplamı
+    model = target.model
+    tail = _ledger_delta(target, run.through, None)
+    expected = LedgerBalance.balance + func.coalesce(tail.c.change, 0)
+    actual = func.coalesce(model.stock, 0)
+    stmt = (
+        select(
+            model.id.label("sku_id"),
+            target.product_id.label("product_id"),
+            target.variant_id.label("variant_id"),
+            actual.label("actual"),
+            expected.label("expected"),
+        )
+        .join(LedgerBalance, and_(LedgerBalance.run_id == run.id, LedgerBalance.sku_id == model.id))
+        .outerjoin(tail, tail.c.sku_id == model.id)
+        .where(actual != expected)
+        .order_by(model.id)
+        .limit(batch_size)
+    )
+    if after_sku is not None:
+        stmt = stmt.where(model.id > after_sku)
+    result = await db.execute(stmt)
+    return [Mismatch(**row._mapping) for row in result]
+
+
+async def _repair(db: AsyncSession, target: _Target, mode: str, batch: list[Mismatch]) -> int:
+    if mode == "ledger":
+        # Sayaç deftere eşitlenir; arada değişmiş satırlara dokunulmaz.
+        table = target.model.__table__
+        result = await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_sku_id"), func.coalesce(table.c.stock, 0) == bindparam("b_actual"))
+            .values(stock=bindparam("b_expected")),
+            [{"b_sku_id": m.sku_id, "b_actual": m.actual, "b_expected": m.expected} for m in batch],
+        )
+        return result.rowcount
+    # mode == "counter": sayaç doğru kabul edilir, farkı kapatan hareket deftere yazılır.
+    await db.execute(
+        insert(InventoryMovement),
+        [
+            {
+                "product_id": m.product_id,
+                "variant_id": m.variant_id,
+                "change": m.diff,
+                "reason": "reconciliation",
+                "notes": f"Sayaç {m.actual}, defter {m.expected}.",
+            }
+            for m in batch
+        ],
+    )
+    return len(batch)
+
+
+async def reconcile_stock(
+    db: AsyncSession,
+    mode: str = "report",
+    lag_seconds: float = 60,
+    batch_size: int = 1000,
+    sample_size: int = 20,
+    now: datetime | None = None,
+) -> ReconciliationReport:
+    """
+    mode="report": sadece raporlar.
+    mode="ledger": sayaçları defter toplamına eşitler.
+    mode="counter": sayaçları doğru kabul edip farkı "reconciliation" hareketiyle deftere yazar.
+
+    Watermark, commit'i geciken hareketleri kaçırmamak için `now - lag_seconds` alınır.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Geçersiz mod: {mode}")
+
+    previous = (
+        await db.execute(
+            select(ReconciliationRun)
+            .where(ReconciliationRun.finished_at.is_not(None))
+            .order_by(ReconciliationRun.finished_at.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+
+    through = (now or datetime.utcnow()) - timedelta(seconds=lag_seconds)
+    if previous is not None and through < previous.through:
+        through = previous.through
+
+    run = ReconciliationRun(through=through, mode=mode)
+    db.add(run)
+    await db.flush()
+    report = ReconciliationReport(
+        run_id=run.id, mode=mode, through=through, incremental=previous is not None
+    )
+
+    for target in _targets():
+        await _write_checkpoint(db, target, run, previous)
+        await db.commit()
+        report.checked += await db.scalar(select(func.count()).select_from(target.model))
+
+        after_sku = None
+        while True:
+            batch = await _mismatch_page(db, target, run, after_sku, batch_size)
+            if not batch:
+                break
+            after_sku = batch[-1].sku_id
+            report.mismatches += len(batch)
+            report.samples.extend(batch[: max(sample_size - len(report.samples), 0)])
+            if mode != "report":
+                report.repaired += await _repair(db, target, mode, batch)
+                await db.commit()
+            if len(batch) < batch_size:
+                break
+
+    run.checked = report.checked
+    run.mismatches = report.mismatches
+    run.repaired = report.repaired
+    run.finished_at = datetime.utcnow()
+    # Sadece son checkpoint gerekli; eski / yarım kalmış koşuların bakiyeleri silinir.
+    await db.execute(delete(LedgerBalance).where(LedgerBalance.run_id != run.id))
+    await db.commit()
+    return report
@@ -0,0 +1,359 @@
+"""
+Uçtan uca yük testi: gerçek ASGI uygulamasını senaryolarla sürer.
+
+    python -m benchmarks.load --database-url sqlite+aiosqlite:///./bench.db \\
+        --seed-orders 20000 --requests 500 --concurrency 10 --output results.json
+
+Senaryolar: browse_catalog, login, checkout, admin_dashboard, webhook_burst.
+Her senaryo için RPS, p50/p95/p99 gecikme ve istek başına sorgu sayısı
+JSON olarak yazılır; iki koşunun çıktısı doğrudan diff'lenebilir.
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import statistics
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+SCENARIOS = ["browse_catalog", "login", "checkout", "admin_dashboard", "webhook_burst"]
+BENCH_WEBHOOK_SECRET = "whsec_benchmark"
+
+
+@dataclass
+class ScenarioResult:
+    latencies: list[float] = field(default_factory=list)
+    queries: list[int] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        count = len(self.latencies)
+        if not count:
+            return {"requests": 0, "errors": self.errors}
+        ordered = sorted(self.latencies)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(int(p * count), count - 1)] * 1000, 3)
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "rps": round(count / self.elapsed, 2) if self.elapsed else None,
+            "latency_ms": {
+                "mean": round(statistics.fmean(ordered) * 1000, 3),
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(ordered[-1] * 1000, 3),
+            },
+            "queries_per_request": {
+                "mean": round(statistics.fmean(self.queries), 2),
+                "max": max(self.queries),
+            },
+        }
+
+
+@dataclass
+class Fixtures:
+    admin_token: str
+    customer_token: str
+    customer_email: str
+    product_ids: list[str]
+    checkout_product_ids: list[str]
+    intent_ids: list[str]
+
+
+class Runner:
+    def __init__(self, client, fixtures: Fixtures, rng: random.Random):
+        self.client = client
+        self.fixtures = fixtures
+        self.rng = rng
+
+    async def request(self, result: ScenarioResult, method: str, url: str, **kwargs) -> None:
+        from app.db.instrumentation import collect_queries
+
+        start = time.perf_counter()
+        with collect_queries() as stats:
+            response = await self.client.request(method, url, **kwargs)
+        result.latencies.append(time.perf_counter() - start)
+        result.queries.append(stats.count)
+        if response.status_code >= 400:
+            result.errors += 1
+
+    def auth(self, token: str) -> dict:
+        return {"Authorization": f"Bearer {token}"}
+
+    # ───────────────── scenarios ─────────────────
+
+    async def browse_catalog(self, result: ScenarioResult) -> None:
+        headers = self.auth(self.fixtures.customer_token)
+        product_id = self.rng.choice(self.fixtures.product_ids)
+        await self.request(result, "GET", "/api/v1/categories/", headers=headers)
+        await self.request(
+            result,
+            "GET",
+            f"/api/v1/products/?skip={self.rng.randrange(0, 500)}&limit=50",
+            headers=headers,
+        )
+        await self.request(result, "GET", f"/api/v1/products/{product_id}", headers=headers)
+        await self.request(
+            result, "GET", f"/api/v1/products/{product_id}/variants", headers=headers
+        )
+
+    async def login(self, result: ScenarioResult) -> None:
+        from app.db.seed import SEED_PASSWORD
+
+        await self.request(
+            result,
+            "POST",
+            "/api/v1/auth/login",
+            json={"email": self.fixtures.customer_email, "password": SEED_PASSWORD},
+        )
+
+    async def checkout(self, result: ScenarioResult) -> None:
+        items = [
+            {"product_id": product_id, "quantity": 1}
+            for product_id in self.rng.sample(
+                self.fixtures.checkout_product_ids,
+                k=min(self.rng.randint(1, 3), len(self.fixtures.checkout_product_ids)),
+            )
+        ]
+        await self.request(
+            result,
+            "POST",
+            "/api/v1/orders/",
+            json={"items": items},
+            headers=self.auth(self.fixtures.customer_token),
+        )
+
+    async def admin_dashboard(self, result: ScenarioResult) -> None:
+        headers = self.auth(self.fixtures.admin_token)
+        await self.request(result, "GET", "/api/v1/stats/overview", headers=headers)
+        await self.request(
+            result,
+            "GET",
+            "/api/v1/stats/sales?start_date=2025-01-01&end_date=2025-12-31&group_by=day",
+            headers=headers,
+        )
+        await self.request(result, "GET", "/api/v1/stats/top-products?limit=10", headers=headers)
+        await self.request(result, "GET", "/api/v1/orders/?limit=20", headers=headers)
+        await self.request(result, "GET", "/api/v1/inventory/low-stock", headers=headers)
+
+    async def webhook_burst(self, result: ScenarioResult) -> None:
+        intent_id = self.rng.choice(self.fixtures.intent_ids)
+        payload = json.dumps(
+            {
+                "id": f"evt_{uuid.UUID(int=self.rng.getrandbits(128)).hex}",
+                "object": "event",
+                "type": self.rng.choice(
+                    ["payment_intent.succeeded", "payment_intent.payment_failed"]
+                ),
+                "data": {"object": {"id": intent_id, "object": "payment_intent"}},
+            }
+        )
+        timestamp = int(time.time())
+        signature = hmac.new(
+            BENCH_WEBHOOK_SECRET.encode(),
+            f"{timestamp}.{payload}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        await self.request(
+            result,
+            "POST",
+            "/api/v1/payments/webhook",
+            content=payload,
+            headers={
+                "Stripe-Signature": f"t={timestamp},v1={signature}",
+                "Content-Type": "application/json",
+            },
+        )
+
+
+async def load_fixtures(client) -> Fixtures:
+    from sqlalchemy import select
+
+    from app.db.seed import SEED_PASSWORD
+    from app.db.session import async_session_maker
+    from app.models.payment import Payment
+    from app.models.product import Product
+    from app.models.user import User
+    from app.models.variant import ProductVariant
+
+    async with async_session_maker() as db:
+        admin_email = (
+            await db.execute(select(User.email).where(User.is_superuser.is_(True)).limit(1))
+        ).scalar_one()
+        customer_email = (
+            await db.execute(
+                select(User.email)
+                .where(User.is_superuser.is_(False), User.is_active.is_(True))
+                .limit(1)
+            )
+        ).scalar_one()
+        product_ids = [
+            str(pid)
+            for pid in (
+                await db.execute(select(Product.id).where(Product.is_active.is_(True)).limit(500))
+            ).scalars()
+        ]
+        has_variants = select(ProductVariant.id).where(ProductVariant.product_id == Product.id)
+        checkout_product_ids = [
+            str(pid)
+            for pid in (
+                await db.execute(
+                    select(Product.id)
+                    .where(
+                        Product.is_active.is_(True),
+                        Product.stock > 100,
+                        ~has_variants.exists(),
+                    )
+                    .limit(200)
+                )
+            ).scalars()
+        ]
+        intent_ids = list(
+            (
+                await db.execute(
+                    select(Payment.intent_id).where(Payment.intent_id.is_not(None)).limit(500)
+                )
+            ).scalars()
+        )
+
+    tokens = []
+    for email in (admin_email, customer_email):
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": email, "password": SEED_PASSWORD}
+        )
+        response.raise_for_status()
+        tokens.append(response.json()["access_token"])
+
+    return Fixtures(
+        admin_token=tokens[0],
+        customer_token=tokens[1],
+        customer_email=customer_email,
+        product_ids=product_ids,
+        checkout_product_ids=checkout_product_ids,
+        intent_ids=intent_ids,
+    )
+
+
+async def run_scenario(
+    runner_factory,
+    name: str,
+    iterations: int,
+    concurrency: int,
+    warmup: int,
+) -> ScenarioResult:
+    result = ScenarioResult()
+    warmup_result = ScenarioResult()
+    remaining = iterations
+
+    async def worker(runner: Runner) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await getattr(runner, name)(result)
+
+    warm_runner = runner_factory(0)
+    for _ in range(warmup):
+        await getattr(warm_runner, name)(warmup_result)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(runner_factory(i + 1)) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="API yük testi / benchmark")
+    parser.add_argument("--database-url", default=None, help="Varsayılan: DATABASE_URL")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="Senaryo başına iterasyon")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--seed-orders",
+        type=int,
+        default=0,
+        help="> 0 ise önce bu kadar siparişle veri seti üretilir (tablolar sıfırlanır)",
+    )
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    # app import edilmeden önce: engine bu URL ile kurulur
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # Webhook imzaları bu secret ile üretilir; gerçek Stripe'a istek gitmez.
+    os.environ["STRIPE_SECRET_KEY"] = "sk_test_benchmark"
+    os.environ["STRIPE_WEBHOOK_SECRET"] = BENCH_WEBHOOK_SECRET
+
+    import logging
+
+    from httpx import ASGITransport, AsyncClient
+
+    from app.db.seed import SeedConfig, seed
+    from app.db.session import engine
+    from app.main import app
+
+    logging.getLogger("app.sql").setLevel(logging.ERROR)
+
+    if args.seed_orders:
+        await seed(
+            engine,
+            SeedConfig(
+                users=max(args.seed_orders // 20, 10),
+                products=max(args.seed_orders // 100, 10),
+                orders=args.seed_orders,
+                seed=args.seed,
+            ),
+            reset=True,
+        )
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    results = {}
+    async with AsyncClient(
+        transport=ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://benchmark",
+        timeout=60,
+    ) as client:
+        fixtures = await load_fixtures(client)
+
+        def runner_factory(index: int) -> Runner:
+            return Runner(client, fixtures, random.Random(args.seed * 1000 + index))
+
+        for name in scenarios:
+            if name not in SCENARIOS:
+                raise SystemExit(f"Bilinmeyen senaryo: {name}")
+            result = await run_scenario(
+                runner_factory, name, args.requests, args.concurrency, args.warmup
+            )
+            results[name] = result.summary()
+            print(f"{name}: {json.dumps(results[name])}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "iterations_per_scenario": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Sonuçlar yazıldı: {args.output}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,293 @@
+"""
+crud katmanındaki sıcak fonksiyonlar için mikro benchmark'lar.
+
+    python -m benchmarks.micro --database-url sqlite+aiosqlite:///./bench.db --seed-orders 20000 \\
+        --save-baseline micro-baseline.json
+    python -m benchmarks.micro --database-url sqlite+aiosqlite:///./bench.db \\
+        --baseline micro-baseline.json --threshold 0.2
+
+Her benchmark için süre (median / min) ve tracemalloc ile ayrı bir turda
+ölçülen tepe bellek kullanımı raporlanır. --baseline verilirse median süresi
+threshold'dan fazla kötüleşen benchmark'lar listelenir ve çıkış kodu 1 olur.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+SIZES = [10, 100, 500]
+
+
+@dataclass
+class Bench:
+    name: str
+    # Her çağrıda yeni bir session ile çalışacak coroutine fabrikası
+    run: Callable[..., Awaitable]
+    mutates: bool = False
+
+
+async def measure(session_factory, bench: Bench, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        async with session_factory(bench.mutates) as db:
+            start = time.perf_counter()
+            await bench.run(db)
+            timings.append(time.perf_counter() - start)
+
+    # Bellek ölçümü ayrı turda: tracemalloc süre ölçümünü bozmasın
+    async with session_factory(bench.mutates) as db:
+        tracemalloc.start()
+        await bench.run(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "min_ms": round(min(timings) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+def build_benches(fixtures: dict) -> list[Bench]:
+    from app.core.security import verify_password
+    from app.core.serialization import dump_list
+    from app.crud.inventory import adjust_variant_stock, get_low_stock_products
+    from app.crud.order import create_order, get_orders
+    from app.crud.stats import get_overview_stats
+    from app.db.seed import SEED_PASSWORD
+    from app.schemas.order import OrderCreate, OrderItemCreate, OrderOut
+
+    async def check_password(db):
+        verify_password(SEED_PASSWORD, fixtures["password_hash"])
+
+    benches = [
+        Bench("get_overview_stats", get_overview_stats),
+        Bench("get_low_stock_products", lambda db: get_low_stock_products(db, threshold=10)),
+        Bench("verify_password", check_password),
+    ]
+    for size in SIZES:
+        benches.append(Bench(f"get_orders[{size}]", lambda db, size=size: get_orders(db, limit=size)))
+
+    for size in SIZES:
+        orders = fixtures["orders"][:size]
+
+        async def serialize_default(db, orders=orders):
+            await fastapi_default_json(OrderOut, orders)
+
+        async def serialize_fast(db, orders=orders):
+            dump_list(OrderOut, orders)
+
+        benches.append(Bench(f"OrderOut.serialize_default[{size}]", serialize_default))
+        benches.append(Bench(f"OrderOut.serialize[{size}]", serialize_fast))
+
+    for item_count in (1, 5):
+        product_ids = fixtures["checkout_product_ids"][:item_count]
+
+        async def place_order(db, product_ids=product_ids):
+            await create_order(
+                db,
+                OrderCreate(
+                    user_id=fixtures["user_id"],
+                    items=[OrderItemCreate(product_id=pid, quantity=1) for pid in product_ids],
+                ),
+                enforce_active=False,
+            )
+
+        benches.append(Bench(f"create_order[{item_count} items]", place_order, mutates=True))
+
+    if fixtures["variant_id"] is not None:
+        benches.append(
+            Bench(
+                "adjust_variant_stock",
+                lambda db: adjust_variant_stock(db, fixtures["variant_id"], 1, "benchmark"),
+                mutates=True,
+            )
+        )
+    return benches
+
+
+async def load_fixtures(session_maker) -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.models.order import Order
+    from app.models.product import Product
+    from app.models.user import User
+    from app.models.variant import ProductVariant
+
+    async with session_maker() as db:
+        user = (await db.execute(select(User).limit(1))).scalar_one()
+        has_variants = select(ProductVariant.id).where(ProductVariant.product_id == Product.id)
+        checkout_product_ids = list(
+            (
+                await db.execute(
+                    select(Product.id)
+                    .where(~has_variants.exists())
+                    .order_by(Product.stock.desc())
+                    .limit(5)
+                )
+            ).scalars()
+        )
+        variant_id = (await db.execute(select(ProductVariant.id).limit(1))).scalar_one_or_none()
+        orders = list(
+            (
+                await db.execute(
+                    select(Order)
+                    .options(selectinload(Order.items), selectinload(Order.events))
+                    .order_by(Order.created_at.desc())
+                    .limit(max(SIZES))
+                )
+            ).scalars()
+        )
+    return {
+        "user_id": user.id,
+        "password_hash": user.hashed_password,
+        "checkout_product_ids": checkout_product_ids,
+        "variant_id": variant_id,
+        "orders": orders,
+    }
+
+
+async def fastapi_default_json(model, rows) -> bytes:
+    """response_model=List[model] yolunun aynısı: doğrula, encode et, json.dumps."""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+
+    field = create_model_field(name="Response", type_=list[model], mode="serialization")
+    content = await serialize_response(field=field, response_content=rows, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def serialization_matches(orders) -> bool:
+    from app.core.serialization import dump_list
+    from app.schemas.order import OrderOut
+
+    return await fastapi_default_json(OrderOut, orders) == dump_list(OrderOut, orders)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"{name:<32}{'-':>14}{current['median_ms']:>14.3f}{'new':>10}")
+            continue
+        ratio = current["median_ms"] / previous["median_ms"] - 1 if previous["median_ms"] else 0
+        flag = " !" if ratio > threshold else ""
+        print(
+            f"{name:<32}{previous['median_ms']:>14.3f}{current['median_ms']:>14.3f}"
+            f"{ratio * 100:>9.1f}%{flag}"
+        )
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="crud mikro benchmark'ları")
+    parser.add_argument("--database-url", default=None, help="Varsayılan: DATABASE_URL")
+    parser.add_argument("--seed-orders", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--filter", default=None, help="Sadece adında bu metin geçenler")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak baseline JSON")
+    parser.add_argument("--save-baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from contextlib import asynccontextmanager
+
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db.seed import SeedConfig, seed
+    from app.db.session import async_session_maker, engine
+
+    if args.seed_orders:
+        await seed(
+            engine,
+            SeedConfig(
+                users=max(args.seed_orders // 20, 10),
+                products=max(args.seed_orders // 100, 10),
+                orders=args.seed_orders,
+                seed=args.seed,
+            ),
+            reset=True,
+        )
+
+    # Yazan benchmark'lar dış transaction içinde koşar; commit'ler savepoint olur
+    # ve sonunda hepsi geri alınır, veri seti her turda aynı kalır.
+    write_engine = create_async_engine(engine.url)
+    if write_engine.dialect.name == "sqlite":
+        # pysqlite kendi BEGIN'ini yönettiği için SAVEPOINT'ler dış transaction'a
+        # bağlanmaz; transaction kontrolünü SQLAlchemy'ye bırakıyoruz.
+        @event.listens_for(write_engine.sync_engine, "connect")
+        def _disable_pysqlite_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(write_engine.sync_engine, "begin")
+        def _emit_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+    @asynccontextmanager
+    async def session_factory(mutates: bool):
+        if not mutates:
+            async with async_session_maker() as db:
+                yield db
+            return
+        async with write_engine.connect() as connection:
+            transaction = await connection.begin()
+            db = AsyncSession(
+                bind=connection,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            )
+            try:
+                yield db
+            finally:
+                await db.close()
+                await transaction.rollback()
+
+    fixtures = await load_fixtures(async_session_maker)
+    results = {}
+    if not await serialization_matches(fixtures["orders"]):
+        print("Hızlı serileştirme FastAPI çıktısıyla byte olarak aynı değil!")
+        return 1
+    for bench in build_benches(fixtures):
+        if args.filter and args.filter not in bench.name:
+            continue
+        results[bench.name] = await measure(session_factory, bench, args.repeat)
+        print(f"{bench.name}: {json.dumps(results[bench.name])}")
+
+    await write_engine.dispose()
+    await engine.dispose()
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegresyon (> %{args.threshold * 100:.0f}): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,5 +1,6 @@
 """Pytest fixtures and configuration."""
 import asyncio
+import uuid
 from typing import AsyncGenerator, Generator
 
 import pytest
@@ -10,12 +11,15 @@ from sqlalchemy.orm import sessionmaker
 
 from app.db.base import Base
 from app.main import app
-from app.api.deps import get_db_session
+from app.api.deps import get_db_session, get_read_db_session
 from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.user import User
 
 
 # Use SQLite for tests
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+TEST_PASSWORD = "admin123"
 
 
 @pytest.fixture(scope="session")
@@ -63,6 +67,12 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
     
     app.dependency_overrides[get_db_session] = override_get_db
+    app.dependency_overrides[get_read_db_session] = override_get_db
+    # Idempotency middleware'i kendi session'larını açar: test veritabanına yönlendir
+    default_session_maker = app.state.idempotency_session_maker
+    app.state.idempotency_session_maker = sessionmaker(
+        db_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
     
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -71,3 +81,48 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield ac
     
     app.dependency_overrides.clear()
+    app.state.idempotency_session_maker = default_session_maker
+
+
+async def _create_user(db: AsyncSession, is_superuser: bool) -> User:
+    # The database is shared by the whole session: every user gets a unique email
+    kind = "admin" if is_superuser else "user"
+    user = User(
+        email=f"{kind}-{uuid.uuid4()}@example.com",
+        hashed_password=get_password_hash(TEST_PASSWORD),
+        full_name=f"Test {kind.title()}",
+        is_active=True,
+        is_superuser=is_superuser,
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def _auth_headers(client: AsyncClient, user: User) -> dict:
+    response = await client.post("/api/v1/auth/login", json={"email": user.email, "password": TEST_PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def admin_user(db_session: AsyncSession) -> User:
+    """A fresh superuser for this test."""
+    return await _create_user(db_session, is_superuser=True)
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client: AsyncClient, admin_user: User) -> dict:
+    """Authorization header of `admin_user`."""
+    return await _auth_headers(client, admin_user)
+
+
+@pytest_asyncio.fixture
+async def regular_user(db_session: AsyncSession) -> User:
+    """A fresh, non-admin user for this test."""
+    return await _create_user(db_session, is_superuser=False)
+
+
+@pytest_asyncio.fixture
+async def user_headers(client: AsyncClient, regular_user: User) -> dict:
+    """Authorization header of `regular_user`."""
+    return await _auth_headers(client, regular_user)
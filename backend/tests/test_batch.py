@@ -0,0 +1,137 @@
+"""Batch endpoint: many sub-requests in one call."""
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db_session, get_read_db_session
+from app.db.instrumentation import assert_max_queries
+from app.db.session import get_db, get_read_db
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_sequential_batch_shares_principal_and_session(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    name = f"Batch {uuid.uuid4().hex[:8]}"
+
+    with assert_max_queries(50) as stats:
+        response = await client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "create", "method": "POST", "path": "/categories/", "body": {"name": name}},
+                    {"id": "list", "path": "/categories/?limit=500"},
+                    {"id": "missing", "path": "/categories/not-a-uuid"},
+                    {
+                        "id": "nested",
+                        "method": "POST",
+                        "path": "/batch",
+                        "body": {"requests": [{"path": "/ping"}]},
+                    },
+                    {"id": "stream", "path": "/inventory/alerts/stream"},
+                ]
+            },
+            headers=admin_headers,
+        )
+    assert response.status_code == 200
+    results = {item["id"]: item for item in response.json()["responses"]}
+    assert list(results) == ["create", "list", "missing", "nested", "stream"]
+
+    assert results["create"]["status"] == 201
+    assert results["create"]["body"]["name"] == name
+    # Aynı session: yeni kategori bir sonraki alt istekte görünür
+    assert name in {category["name"] for category in results["list"]["body"]}
+    assert results["missing"]["status"] in (404, 405, 422)
+    assert results["nested"]["status"] == 400
+    assert results["stream"]["status"] == 400
+
+    # Kullanıcı yalnızca batch isteğinde bir kez yüklendi
+    user_lookups = sum(
+        count for statement, count in stats.statements.items() if "FROM users" in statement
+    )
+    assert user_lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_batch_keeps_request_order(
+    client: AsyncClient, db_session: AsyncSession, user_headers: dict
+):
+    response = await client.post(
+        "/api/v1/batch",
+        json={
+            "parallel": True,
+            "requests": [
+                {"path": "/ping"},
+                {"path": "/does-not-exist"},
+                {"path": "/inventory/movements"},
+                {"id": "last", "path": "/ping"},
+            ],
+        },
+        headers=user_headers,
+    )
+    assert response.status_code == 200
+    responses = response.json()["responses"]
+    # Yetki alt istek bazında, batch'i çağıran (admin olmayan) kullanıcıyla
+    assert [item["status"] for item in responses] == [200, 404, 403, 200]
+    assert responses[0]["body"] == {"message": "pong"}
+    assert responses[3]["id"] == "last"
+
+    response = await client.post("/api/v1/batch", json={"requests": [{"path": "/ping"}]})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_sequential_batch_reads_use_read_session(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    # Replika yerine aynı veritabanına ayrı bir engine: okumaları ayırt etmek için
+    read_engine = create_async_engine(db_session.bind.url)
+    read_statements = []
+    event.listen(
+        read_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: read_statements.append(statement),
+    )
+    read_maker = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        yield db_session
+
+    async def override_get_read_db():
+        async with read_maker() as session:
+            yield session
+
+    overrides = dict(app.dependency_overrides)
+    del app.dependency_overrides[get_db_session]
+    del app.dependency_overrides[get_read_db_session]
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    name = f"Batch read {uuid.uuid4().hex[:8]}"
+    try:
+        response = await client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "create", "method": "POST", "path": "/categories/", "body": {"name": name}},
+                    {"id": "list", "path": "/categories/?limit=500"},
+                ]
+            },
+            headers=admin_headers,
+        )
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(overrides)
+        await read_engine.dispose()
+
+    assert response.status_code == 200
+    results = {item["id"]: item for item in response.json()["responses"]}
+    assert results["create"]["status"] == 201
+    assert name in {category["name"] for category in results["list"]["body"]}
+    # Liste okuma session'ından, oluşturma primary session'ından geçti
+    assert any("FROM categories" in statement for statement in read_statements)
+    assert not any(statement.lstrip().upper().startswith("INSERT") for statement in read_statements)
@@ -0,0 +1,137 @@
+"""Bulk order status transitions."""
+import uuid
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.order import create_order
+from app.db.instrumentation import assert_max_queries
+from app.models.inventory import InventoryMovement, OrderEvent, StockReservation
+from app.models.order import Order
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate
+
+
+async def _orders(db: AsyncSession, status: str, count: int) -> list[Order]:
+    orders = [Order(status=status, total_amount=Decimal("10")) for _ in range(count)]
+    db.add_all(orders)
+    await db.commit()
+    return orders
+
+
+async def _event_types(db: AsyncSession, order_id) -> list[str]:
+    result = await db.execute(select(OrderEvent.type).where(OrderEvent.order_id == order_id))
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_bulk_ship_runs_in_constant_statements(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    paid = await _orders(db_session, "paid", 50)
+    items = [
+        {"order_id": str(o.id), "status": "shipped", "tracking_number": f"TR{i}", "carrier": "Yurtiçi"}
+        for i, o in enumerate(paid)
+    ]
+
+    # Sipariş sayısından bağımsız: auth + SELECT + UPDATE + INSERT
+    with assert_max_queries(5):
+        response = await client.post(
+            "/api/v1/orders/bulk-status", json={"items": items}, headers=admin_headers
+        )
+    assert response.status_code == 200
+    assert response.json() == {"updated": 50, "unchanged": 0, "rejected": []}
+
+    first = paid[0]
+    await db_session.refresh(first)
+    assert (first.status, first.tracking_number, first.carrier) == ("shipped", "TR0", "Yurtiçi")
+    assert first.shipped_at is not None
+    assert await _event_types(db_session, first.id) == ["shipped"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_rejects_invalid_rows_and_applies_the_rest(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    (delivered,) = await _orders(db_session, "delivered", 1)
+    (shipped,) = await _orders(db_session, "shipped", 1)
+    product = Product(name="Bulk Product", price=Decimal("4"), stock=10)
+    db_session.add(product)
+    await db_session.commit()
+    pending = await create_order(db_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)]))
+    missing = uuid.uuid4()
+
+    response = await client.post(
+        "/api/v1/orders/bulk-status",
+        json={
+            "items": [
+                {"order_id": str(delivered.id), "status": "pending"},
+                {"order_id": str(missing), "status": "shipped"},
+                {"order_id": str(shipped.id), "status": "teleported"},
+                {"order_id": str(shipped.id), "status": "shipped", "tracking_number": "NEW1"},
+                {"order_id": str(pending.id), "status": "cancelled"},
+                {"order_id": str(pending.id), "status": "paid"},
+            ]
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["updated"], body["unchanged"]) == (1, 1)
+    assert {r["order_id"]: r["detail"] for r in body["rejected"]} == {
+        str(delivered.id): "Geçersiz geçiş: delivered -> pending",
+        str(missing): "Sipariş bulunamadı.",
+        str(shipped.id): "Geçersiz durum: teleported",
+        str(pending.id): "Sipariş listede birden fazla kez var.",
+    }
+
+    await db_session.refresh(shipped)
+    await db_session.refresh(pending)
+    assert (shipped.status, shipped.tracking_number) == ("shipped", "NEW1")
+    assert pending.status == "cancelled"
+    assert await _event_types(db_session, shipped.id) == []
+    assert await db_session.scalar(
+        select(func.count()).select_from(StockReservation).where(StockReservation.order_id == pending.id)
+    ) == 0
+    # İptal edilen pending siparişin rezerve stoğu geri döner
+    await db_session.refresh(product)
+    assert product.stock == 10
+
+
+@pytest.mark.asyncio
+async def test_bulk_cancel_releases_reservations(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    product = Product(name="Bulk Reserved", price=Decimal("4"), stock=10)
+    db_session.add(product)
+    await db_session.commit()
+    orders = [
+        await create_order(db_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=2)]))
+        for _ in range(3)
+    ]
+    statuses = ["cancelled", "cancelled", "paid"]
+
+    response = await client.post(
+        "/api/v1/orders/bulk-status",
+        json={"items": [{"order_id": str(o.id), "status": s} for o, s in zip(orders, statuses)]},
+        headers=admin_headers,
+    )
+    assert response.json()["updated"] == 3
+
+    await db_session.refresh(product)
+    assert product.stock == 8  # yalnızca ödenen siparişin 2 adedi düşük kalır
+    released = await db_session.scalars(
+        select(InventoryMovement.ref_order_id).where(
+            InventoryMovement.product_id == product.id, InventoryMovement.reason == "reservation_released"
+        )
+    )
+    assert sorted(released.all()) == sorted([orders[0].id, orders[1].id])
+    remaining = await db_session.scalar(
+        select(func.count())
+        .select_from(StockReservation)
+        .where(StockReservation.order_id.in_([o.id for o in orders]))
+    )
+    assert remaining == 0
@@ -0,0 +1,118 @@
+"""Idempotency-Key handling for order and payment POSTs."""
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.idempotency import delete_expired_idempotency_keys
+from app.models.idempotency import IdempotencyKey
+from app.models.order import Order
+from app.models.product import Product
+from app.models.user import User
+from app.services.idempotency import dump_headers, request_hash, stored_response
+
+
+async def _orders(db: AsyncSession, user: User) -> int:
+    return await db.scalar(select(func.count()).select_from(Order).where(Order.user_id == user.id))
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response(
+    client: AsyncClient, db_session: AsyncSession, admin_user: User, admin_headers: dict
+):
+    user, headers = admin_user, admin_headers
+    product = Product(name="Idempotent Kupa", price=Decimal("10"), stock=10)
+    db_session.add(product)
+    await db_session.commit()
+    body = {"items": [{"product_id": str(product.id), "quantity": 2}]}
+    headers = {**headers, "Idempotency-Key": "checkout-1"}
+
+    first = await client.post("/api/v1/orders/", json=body, headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = await client.post("/api/v1/orders/", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert retry.headers["content-type"] == first.headers["content-type"]
+    assert await _orders(db_session, user) == 1
+    await db_session.refresh(product)
+    assert product.stock == 8
+
+    # Aynı anahtar, farklı gövde
+    changed = await client.post(
+        "/api/v1/orders/",
+        json={"items": [{"product_id": str(product.id), "quantity": 3}]},
+        headers=headers,
+    )
+    assert changed.status_code == 422
+    assert await _orders(db_session, user) == 1
+
+    # Anahtar kullanıcı + route kapsamlı: başka anahtar yeni sipariş oluşturur
+    other = await client.post(
+        "/api/v1/orders/", json=body, headers={**headers, "Idempotency-Key": "checkout-2"}
+    )
+    assert other.status_code == 201
+    assert other.json()["id"] != first.json()["id"]
+    assert await _orders(db_session, user) == 2
+
+
+@pytest.mark.asyncio
+async def test_in_flight_lock_and_expiry(
+    client: AsyncClient, db_session: AsyncSession, admin_user: User, admin_headers: dict
+):
+    user, headers = admin_user, admin_headers
+    headers = {**headers, "Idempotency-Key": "intent-1", "Content-Type": "application/json"}
+    body = b'{"order_id": "%s"}' % str(uuid.uuid4()).encode()
+    pk = (user.id, "intent-1", "/payments/create-intent")
+    now = datetime.utcnow()
+    db_session.add(
+        IdempotencyKey(
+            user_id=user.id,
+            key="intent-1",
+            route="/payments/create-intent",
+            request_hash=request_hash(body),
+            status="in_progress",
+            created_at=now,
+            expires_at=now + timedelta(hours=24),
+        )
+    )
+    await db_session.commit()
+
+    # İlk istek hâlâ işleniyor
+    response = await client.post("/api/v1/payments/create-intent", content=body, headers=headers)
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+
+    response = await client.post("/api/v1/payments/create-intent", content=b"{}", headers=headers)
+    assert response.status_code == 422
+
+    # Süresi dolan kayıtlar temizlenir
+    assert await delete_expired_idempotency_keys(db_session, now=now + timedelta(hours=25)) >= 1
+    assert await db_session.get(IdempotencyKey, pk, populate_existing=True) is None
+
+
+def test_stored_response_replays_raw_headers():
+    raw_headers = [
+        (b"content-type", b"application/json"),
+        (b"set-cookie", b"a=1"),
+        (b"set-cookie", b"b=2"),
+        (b"location", b"/api/v1/orders/1"),
+    ]
+    record = SimpleNamespace(
+        response_status=201,
+        response_body=zlib.compress(b"{}"),
+        response_headers=dump_headers(raw_headers),
+    )
+    response = stored_response(record)
+    assert response.status_code == 201
+    assert response.body == b"{}"
+    assert response.raw_headers == [*raw_headers, (b"idempotent-replayed", b"true")]
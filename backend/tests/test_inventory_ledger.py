@@ -0,0 +1,134 @@
+"""Inventory ledger export, stock snapshots and point-in-time stock."""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.inventory import create_stock_snapshots, get_stock_at
+from app.models.inventory import InventoryMovement, StockSnapshot
+from app.models.product import Product
+from app.models.variant import ProductVariant
+
+
+@pytest_asyncio.fixture
+async def ledger(db_session: AsyncSession):
+    product = Product(name="Ledger Product", price=Decimal("5"), stock=7)
+    db_session.add(product)
+    await db_session.flush()
+    variant = ProductVariant(
+        product_id=product.id, sku=f"LEDGER-{uuid.uuid4().hex[:8]}", name="Ledger / M", stock=4
+    )
+    db_session.add(variant)
+    await db_session.flush()
+    for day, change, variant_id in (
+        (1, 10, None),
+        (5, -2, None),
+        (10, -1, None),
+        (2, 5, variant.id),
+        (8, -1, variant.id),
+    ):
+        db_session.add(
+            InventoryMovement(
+                product_id=product.id,
+                variant_id=variant_id,
+                change=change,
+                reason="initial" if change > 0 else "order",
+                created_at=datetime(2026, 1, day, 12, 0),
+            )
+        )
+    await db_session.commit()
+    return product, variant
+
+
+@pytest.mark.asyncio
+async def test_stock_at_walks_back_from_current_without_snapshot(db_session: AsyncSession, ledger):
+    product, variant = ledger
+    result = await get_stock_at(db_session, datetime(2026, 1, 3), product_id=product.id)
+    assert result["stock"] == 10
+    assert result["source"] == "current"
+
+    result = await get_stock_at(db_session, datetime(2026, 1, 3), variant_id=variant.id)
+    assert result["stock"] == 5
+    assert result["product_id"] == product.id
+
+
+@pytest.mark.asyncio
+async def test_stock_at_uses_latest_snapshot(db_session: AsyncSession, ledger):
+    product, _ = ledger
+    db_session.add_all(
+        [
+            StockSnapshot(product_id=product.id, stock=10, taken_at=datetime(2026, 1, 2)),
+            StockSnapshot(product_id=product.id, stock=8, taken_at=datetime(2026, 1, 6)),
+        ]
+    )
+    await db_session.commit()
+
+    result = await get_stock_at(db_session, datetime(2026, 1, 12), product_id=product.id)
+    assert result["stock"] == 7
+    assert result["source"] == "snapshot"
+    assert result["checkpoint"] == datetime(2026, 1, 6)
+
+    result = await get_stock_at(db_session, datetime(2026, 1, 5, 18), product_id=product.id)
+    assert result["stock"] == 8
+    assert result["checkpoint"] == datetime(2026, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_create_stock_snapshots_covers_products_and_variants(db_session: AsyncSession, ledger):
+    product, variant = ledger
+    taken_at = datetime(2030, 1, 1)
+    count = await create_stock_snapshots(db_session, taken_at=taken_at, batch_size=2)
+
+    total = await db_session.scalar(
+        select(func.count()).select_from(StockSnapshot).where(StockSnapshot.taken_at == taken_at)
+    )
+    assert count == total
+    rows = (
+        await db_session.execute(
+            select(StockSnapshot.variant_id, StockSnapshot.stock).where(
+                StockSnapshot.product_id == product.id, StockSnapshot.taken_at == taken_at
+            )
+        )
+    ).all()
+    assert sorted(rows, key=lambda r: r.variant_id is not None) == [(None, 7), (variant.id, 4)]
+
+
+@pytest.mark.asyncio
+async def test_ledger_export_and_stock_at_endpoint(
+    client: AsyncClient, ledger, admin_headers: dict
+):
+    product, _ = ledger
+    headers = admin_headers
+
+    response = await client.get(
+        f"/api/v1/inventory/movements/export?product_id={product.id}", headers=headers
+    )
+    assert response.status_code == 200
+    movements = [json.loads(line) for line in response.text.splitlines()]
+    assert [m["change"] for m in movements] == [10, 5, -2, -1, -1]  # en eskiden yeniye
+
+    response = await client.get(
+        f"/api/v1/inventory/movements/export?format=csv&product_id={product.id}"
+        "&end_date=2026-01-05",
+        headers=headers,
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["change"] for row in rows] == ["10", "5", "-2"]
+
+    response = await client.get(
+        f"/api/v1/inventory/stock-at?product_id={product.id}&at=2026-01-03T00:00:00Z",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.json()["stock"] == 10
+
+    response = await client.get("/api/v1/inventory/stock-at?at=2026-01-03", headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,64 @@
+"""Tests for the DB pool prewarm and keep-warm task."""
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import keep_warm as keep_warm_module
+from app.db.keep_warm import keep_warm, prewarm_pool
+
+
+def _count_connects(engine) -> list:
+    connects = []
+    event.listen(engine.sync_engine, "connect", lambda *args: connects.append(args))
+    return connects
+
+
+async def test_prewarm_opens_min_connections(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}", pool_size=5)
+    connects = _count_connects(engine)
+    try:
+        await prewarm_pool(engine, 3)
+
+        assert len(connects) == 3
+        # Açılan bağlantılar pool'a geri döner
+        assert engine.pool.checkedin() == 3
+        assert engine.pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+async def test_prewarm_disabled_opens_nothing(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    connects = _count_connects(engine)
+    try:
+        await prewarm_pool(engine, 0)
+
+        assert connects == []
+    finally:
+        await engine.dispose()
+
+
+async def test_keep_warm_pings_and_stops_on_cancel(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'warm.db'}")
+    pings = []
+    ping = keep_warm_module._ping
+
+    async def counting_ping(target):
+        pings.append(target)
+        await ping(target)
+
+    monkeypatch.setattr(keep_warm_module, "_ping", counting_ping)
+    task = asyncio.create_task(keep_warm(engine, 0.01))
+    try:
+        async with asyncio.timeout(2):
+            while len(pings) < 2:
+                await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        results = await asyncio.gather(task, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert task.cancelled()
+    assert engine.pool.checkedout() == 0
+    await engine.dispose()
@@ -0,0 +1,56 @@
+"""X-Total-Count on paginated lists: exact / estimated counts and the count cache."""
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.counts import count_cache, total_count
+from app.models.product import Product
+
+
+@pytest.mark.asyncio
+async def test_list_total_header_is_cached_per_filter(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    db_session.add_all([Product(name=f"Count {i}", price=Decimal("5"), stock=1) for i in range(3)])
+    await db_session.commit()
+    count_cache.clear()
+    expected = await db_session.scalar(select(func.count()).select_from(Product))
+
+    response = await client.get("/api/v1/products/?limit=2&with_total=true", headers=admin_headers)
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == str(expected)
+    assert response.headers["X-Total-Count-Exact"] == "true"
+
+    # Başka sayfa aynı filtre: cache'ten gelir, yeni ürün TTL dolana kadar görünmez
+    db_session.add(Product(name="Count late", price=Decimal("5"), stock=1))
+    await db_session.commit()
+    response = await client.get("/api/v1/products/?skip=2&limit=2&with_total=true", headers=admin_headers)
+    assert response.headers["X-Total-Count"] == str(expected)
+
+    count_cache.clear()
+    response = await client.get("/api/v1/products/?with_total=true", headers=admin_headers)
+    assert response.headers["X-Total-Count"] == str(expected + 1)
+
+    # Varsayılan: toplam hesaplanmaz
+    response = await client.get("/api/v1/products/", headers=admin_headers)
+    assert "X-Total-Count" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_total_count_above_exact_limit(db_session: AsyncSession, monkeypatch):
+    db_session.add_all([Product(name=f"Big {i}", price=Decimal("5"), stock=1) for i in range(4)])
+    await db_session.commit()
+    count_cache.clear()
+    monkeypatch.setattr(settings, "LIST_COUNT_EXACT_LIMIT", 2)
+    expected = await db_session.scalar(select(func.count()).select_from(Product))
+
+    # SQLite'ta planner tahmini yok: limit aşılınca tam sayım yapılır
+    total, exact = await total_count(db_session, select(Product.id).order_by(Product.name).limit(10))
+    assert (total, exact) == (expected, True)
+
+    stmt = select(Product.id).where(Product.name == "Big 0")
+    assert await total_count(db_session, stmt) == (1, True)
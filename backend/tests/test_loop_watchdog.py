@@ -0,0 +1,38 @@
+"""Tests for the event loop watchdog."""
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_watchdog import LoopWatchdog
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_captures_blocking_stack():
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+    await watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_call()
+        await asyncio.sleep(0.05)
+    finally:
+        await watchdog.stop()
+
+    assert watchdog.last_report is not None
+    assert "blocking_call" in watchdog.last_report
+
+
+@pytest.mark.asyncio
+async def test_watchdog_quiet_when_loop_is_free():
+    watchdog = LoopWatchdog(threshold=0.2, interval=0.01)
+    await watchdog.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await watchdog.stop()
+
+    assert watchdog.last_report is None
@@ -0,0 +1,25 @@
+"""Tests for the Prometheus /metrics endpoint."""
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_route_templates(client: AsyncClient):
+    await client.get("/health")
+    await client.get(f"/api/v1/orders/{uuid.uuid4()}")
+    # Parametre değeri sabit bir segmentle aynı olsa da şablon bozulmaz
+    await client.get("/api/v1/orders/v1")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    # Gerçek id değil şablon label olarak kullanılır
+    assert 'route="/api/v1/orders/{order_id}",status="401"' in body
+    assert "{order_id}/orders" not in body
+    assert "http_requests_in_flight" in body
+    assert "event_loop_lag_seconds" in body
@@ -0,0 +1,209 @@
+"""Cold-order archival: archive tables, compressed files and the stats rollup."""
+import gzip
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.archive import (
+    ArchivedOrderStat,
+    order_events_archive,
+    order_items_archive,
+    orders_archive,
+    refunds_archive,
+)
+from app.models.inventory import InventoryMovement, OrderEvent
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment, Refund
+from app.models.product import Product
+from app.models.user import User
+from app.services.order_archive import archive_cutoff, archive_orders
+
+
+def _order(
+    product: Product, status: str, created_at: datetime, total: str = "40", user: User | None = None
+) -> Order:
+    order = Order(
+        user_id=user.id if user else None, status=status, total_amount=Decimal(total), created_at=created_at
+    )
+    order.items = [
+        OrderItem(
+            product_id=product.id,
+            quantity=2,
+            unit_price=Decimal(total) / 2,
+            line_total=Decimal(total),
+        )
+    ]
+    order.events = [OrderEvent(type=status, description="test")]
+    return order
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_closed_orders_and_keeps_stats(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    product = Product(name=f"Archive {uuid.uuid4().hex[:8]}", price=Decimal("20"), stock=100)
+    db_session.add(product)
+    await db_session.flush()
+    old_delivered = _order(product, "delivered", datetime(2020, 3, 10, 12))
+    old_refunded = _order(product, "refunded", datetime(2020, 3, 20, 12), total="30")
+    old_pending = _order(product, "pending", datetime(2020, 4, 1, 12))
+    recent = _order(product, "delivered", datetime.utcnow())
+    db_session.add_all([old_delivered, old_refunded, old_pending, recent])
+    await db_session.flush()
+    payment = Payment(
+        order_id=old_refunded.id, intent_id=f"pi_{uuid.uuid4().hex}", status="succeeded", amount=Decimal("30")
+    )
+    db_session.add(payment)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            Refund(payment_id=payment.id, order_id=old_refunded.id, status="succeeded", amount=Decimal("30")),
+            InventoryMovement(product_id=product.id, change=-2, reason="order", ref_order_id=old_delivered.id),
+        ]
+    )
+    await db_session.commit()
+
+    before = (await client.get("/api/v1/stats/overview", headers=admin_headers)).json()
+    report = await archive_orders(db_session, months=12, now=datetime(2021, 5, 1))
+
+    archived = {old_delivered.id, old_refunded.id}
+    assert report.orders >= 2
+    assert not (await db_session.scalars(select(Order.id).where(Order.id.in_(archived)))).all()
+    hot = set(await db_session.scalars(select(Order.id).where(Order.id.in_([old_pending.id, recent.id]))))
+    assert hot == {old_pending.id, recent.id}
+
+    rows = (await db_session.execute(select(orders_archive).where(orders_archive.c.id.in_(archived)))).all()
+    assert {row.id for row in rows} == archived
+    items = (await db_session.execute(select(order_items_archive).where(order_items_archive.c.product_id == product.id))).all()
+    assert {item.order_id for item in items} == archived
+    assert all(item.order_created_at.month == 3 for item in items)
+    events = await db_session.scalars(select(order_events_archive.c.order_id).where(order_events_archive.c.order_id.in_(archived)))
+    assert set(events) == archived
+    refunds = await db_session.scalars(select(refunds_archive.c.order_id).where(refunds_archive.c.order_id == old_refunded.id))
+    assert list(refunds) == [old_refunded.id]
+    # Defter arşivlenmez; sipariş referansı korunur
+    movement = await db_session.scalar(select(InventoryMovement.ref_order_id).where(InventoryMovement.product_id == product.id))
+    assert movement == old_delivered.id
+
+    # Overview arşiv toplamıyla aynı kalır; tarih filtreli raporlar arşivi de okur
+    after = (await client.get("/api/v1/stats/overview", headers=admin_headers)).json()
+    assert after == before
+    response = await client.get(
+        "/api/v1/stats/sales?start_date=2020-03-01&end_date=2020-03-31&group_by=day", headers=admin_headers
+    )
+    assert response.json() == [{"date": "2020-03-10", "revenue": 40.0, "order_count": 1}]
+    response = await client.get(
+        "/api/v1/stats/top-products?start_date=2020-01-01&end_date=2020-12-31", headers=admin_headers
+    )
+    assert [row["product_id"] for row in response.json()] == [str(product.id)]
+
+    # Tekrar çalıştırma bir şey taşımaz, toplamları iki kez eklemez
+    assert (await archive_orders(db_session, months=12, now=datetime(2021, 5, 1))).orders == 0
+    assert (await client.get("/api/v1/stats/overview", headers=admin_headers)).json() == before
+
+
+@pytest.mark.asyncio
+async def test_archive_to_compressed_files(db_session: AsyncSession, tmp_path):
+    product = Product(name=f"Archive file {uuid.uuid4().hex[:8]}", price=Decimal("20"), stock=100)
+    db_session.add(product)
+    await db_session.flush()
+    orders = [_order(product, "cancelled", datetime(2019, 7, day, 9), total="10") for day in (1, 2, 3)]
+    db_session.add_all(orders)
+    await db_session.commit()
+    ids = [o.id for o in orders]
+    stat_before = await db_session.get(ArchivedOrderStat, (datetime(2019, 7, 1).date(), "cancelled"))
+    before = (stat_before.order_count, stat_before.revenue) if stat_before else (0, 0)
+
+    # batch_size=1: her batch dosyaya ayrı bir gzip member ekler
+    report = await archive_orders(
+        db_session, months=12, batch_size=1, output_dir=tmp_path, now=datetime(2020, 8, 1)
+    )
+    assert report.orders == 3
+    assert report.files == [str(tmp_path / "orders-201907.ndjson.gz")]
+    assert report.rows["order_items"] == 3
+
+    with gzip.open(tmp_path / "orders-201907.ndjson.gz", "rt", encoding="utf-8") as handle:
+        documents = [json.loads(line) for line in handle]
+    assert [doc["id"] for doc in documents] == [str(order_id) for order_id in ids]
+    assert documents[0]["order_items"][0]["quantity"] == 2
+    assert documents[0]["order_events"][0]["type"] == "cancelled"
+    assert documents[0]["payments"] == []
+
+    remaining = await db_session.scalars(select(Order.id).where(Order.id.in_(ids)))
+    assert remaining.all() == []
+    archived = await db_session.scalars(select(orders_archive.c.id).where(orders_archive.c.id.in_(ids)))
+    assert archived.all() == []
+    stat = await db_session.get(ArchivedOrderStat, (datetime(2019, 7, 1).date(), "cancelled"), populate_existing=True)
+    assert (stat.order_count - before[0], stat.revenue - before[1]) == (3, Decimal("30"))
+
+    assert archive_cutoff(3, now=datetime(2026, 2, 15)) == datetime.fromisoformat("2025-11-01T00:00:00+00:00")
+
+
+@pytest.mark.asyncio
+async def test_archived_orders_stay_readable(
+    client: AsyncClient, db_session: AsyncSession, regular_user: User, user_headers: dict
+):
+    product = Product(name=f"Archive read {uuid.uuid4().hex[:8]}", price=Decimal("20"), stock=100)
+    db_session.add(product)
+    await db_session.flush()
+    old = _order(product, "delivered", datetime(2018, 6, 1, 12), user=regular_user)
+    older = _order(product, "cancelled", datetime(2018, 5, 1, 12), total="20", user=regular_user)
+    recent = _order(product, "pending", datetime.utcnow(), user=regular_user)
+    db_session.add_all([old, older, recent])
+    await db_session.commit()
+    await archive_orders(db_session, months=12, now=datetime(2019, 8, 1))
+    assert not (await db_session.scalars(select(Order.id).where(Order.id.in_([old.id, older.id])))).all()
+
+    # Detay arşive düşer: kalemler ve olaylar dahil
+    response = await client.get(f"/api/v1/orders/{old.id}", headers=user_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "delivered"
+    assert [item["product_id"] for item in body["items"]] == [str(product.id)]
+    assert [event["type"] for event in body["events"]] == ["delivered"]
+    response = await client.get(f"/api/v1/orders/{old.id}?fields=status", headers=user_headers)
+    assert response.json() == {"id": str(old.id), "status": "delivered"}
+
+    # Kullanıcının listesi sıcak + arşiv, created_at sırasıyla; sayfalama ikisini birlikte kayar
+    response = await client.get("/api/v1/orders/?with_total=true", headers=user_headers)
+    assert [row["id"] for row in response.json()] == [str(recent.id), str(old.id), str(older.id)]
+    assert response.headers["X-Total-Count"] == "3"
+    response = await client.get("/api/v1/orders/?skip=1&limit=1&status=cancelled", headers=user_headers)
+    assert response.json() == []
+    response = await client.get("/api/v1/orders/?limit=1&status=cancelled", headers=user_headers)
+    assert [row["id"] for row in response.json()] == [str(older.id)]
+
+    # Ne sıcak tabloda ne arşivde
+    response = await client.get(f"/api/v1/orders/{uuid.uuid4()}", headers=user_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_includes_archived_orders(
+    client: AsyncClient, db_session: AsyncSession, regular_user: User, admin_headers: dict
+):
+    product = Product(name=f"Archive export {uuid.uuid4().hex[:8]}", price=Decimal("20"), stock=100)
+    db_session.add(product)
+    await db_session.flush()
+    archived = _order(product, "delivered", datetime(2017, 2, 10, 12), user=regular_user)
+    hot = _order(product, "paid", datetime(2017, 2, 20, 12), user=regular_user)
+    db_session.add_all([archived, hot])
+    await db_session.commit()
+    await archive_orders(db_session, months=12, now=datetime(2018, 6, 1))
+    assert await db_session.scalar(select(Order.id).where(Order.id == archived.id)) is None
+
+    response = await client.get(
+        f"/api/v1/orders/export?user_id={regular_user.id}&start_date=2017-02-01&end_date=2017-02-28",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    documents = [json.loads(line) for line in response.text.splitlines()]
+    assert [doc["order_id"] for doc in documents] == [str(archived.id), str(hot.id)]
+    assert documents[0]["status"] == "delivered"
+    assert [item["product_id"] for item in documents[0]["items"]] == [str(product.id)]
@@ -0,0 +1,135 @@
+"""Streaming order export (NDJSON / CSV, gzip)."""
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.services.export import accepts_gzip
+
+
+@pytest_asyncio.fixture
+async def export_data(db_session: AsyncSession, admin_headers: dict):
+    customer = User(email=f"export-{uuid.uuid4()}@example.com", hashed_password="x", full_name="Export")
+    product = Product(name="Export Product", price=Decimal("12.50"), stock=100)
+    db_session.add_all([customer, product])
+    await db_session.flush()
+
+    for day, status, quantities in (
+        (1, "paid", [1, 2]),
+        (2, "cancelled", [3]),
+        (20, "shipped", [1]),
+    ):
+        order = Order(
+            user_id=customer.id,
+            status=status,
+            total_amount=Decimal("12.50") * sum(quantities),
+            created_at=datetime(2026, 3, day, 12, 0),
+        )
+        db_session.add(order)
+        await db_session.flush()
+        for quantity in quantities:
+            db_session.add(
+                OrderItem(
+                    order_id=order.id,
+                    product_id=product.id,
+                    quantity=quantity,
+                    unit_price=Decimal("12.50"),
+                    line_total=Decimal("12.50") * quantity,
+                )
+            )
+    await db_session.commit()
+    return customer, admin_headers
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_groups_items_per_order(client: AsyncClient, export_data):
+    customer, headers = export_data
+    response = await client.get(
+        f"/api/v1/orders/export?user_id={customer.id}",
+        headers={**headers, "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert [o["status"] for o in orders] == ["paid", "cancelled", "shipped"]
+    assert [len(o["items"]) for o in orders] == [2, 1, 1]
+    assert orders[0]["user_email"] == customer.email
+    assert orders[0]["total_amount"] == "37.50"
+    assert orders[0]["items"][0]["unit_price"] == "12.50"
+
+
+@pytest.mark.asyncio
+async def test_export_csv_filters_by_date_and_status(client: AsyncClient, export_data):
+    customer, headers = export_data
+    response = await client.get(
+        f"/api/v1/orders/export?format=csv&user_id={customer.id}"
+        "&start_date=2026-03-01&end_date=2026-03-02&status=paid,shipped",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2  # 1 Mart'taki paid siparişin iki kalemi
+    assert {row["status"] for row in rows} == {"paid"}
+    assert sorted(row["quantity"] for row in rows) == ["1", "2"]
+
+    response = await client.get(
+        f"/api/v1/orders/export?user_id={customer.id}&end_date=9999-12-31", headers=headers
+    )
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_gzip(client: AsyncClient, export_data):
+    customer, headers = export_data
+    response = await client.get(
+        f"/api/v1/orders/export?user_id={customer.id}",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx gzip'i açar; içerik aynı NDJSON olmalı
+    assert len(response.text.splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_respects_gzip_q_zero(client: AsyncClient, export_data):
+    customer, headers = export_data
+    response = await client.get(
+        f"/api/v1/orders/export?user_id={customer.id}",
+        headers={**headers, "Accept-Encoding": "gzip;q=0, identity"},
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert len(response.text.splitlines()) == 3
+
+
+def test_accepts_gzip():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip; q=0.0, *;q=1")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("")
+
+
+@pytest.mark.asyncio
+async def test_export_requires_admin(client: AsyncClient):
+    response = await client.get("/api/v1/orders/export")
+    assert response.status_code == 401
@@ -0,0 +1,116 @@
+"""Live order feed: one catch-up per worker, cursor resume, replay dedup."""
+from datetime import timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from sqlalchemy import create_mock_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.routes_orders import order_feed
+from app.core.config import settings
+from app.db.base import Base
+from app.crud.order import create_order, update_order_status
+from app.models.inventory import OrderEvent
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderUpdateStatus
+from app.services.events import EventBroker, broker
+from app.services.feed import make_cursor, parse_cursor
+from app.services.order_feed import TOPIC, OrderFeed
+
+
+async def _order(db: AsyncSession):
+    product = Product(name="Feed Product", price=Decimal("7"), stock=50)
+    db.add(product)
+    await db.commit()
+    return await create_order(db, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)]))
+
+
+def _feed(db: AsyncSession, local: EventBroker) -> OrderFeed:
+    return OrderFeed(sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False), local)
+
+
+def _received(subscription, order) -> list[str]:
+    types = []
+    while not subscription.queue.empty():
+        event = subscription.queue.get_nowait()
+        if event.data["order_id"] == str(order.id):
+            types.append(event.type)
+    return types
+
+
+@pytest.mark.asyncio
+async def test_catch_up_publishes_committed_events_once(db_session: AsyncSession):
+    local = EventBroker()
+    feed = _feed(db_session, local)
+    await feed.prime()
+
+    with local.subscribe([TOPIC]) as subscription:
+        order = await _order(db_session)
+        await update_order_status(db_session, order, OrderUpdateStatus(status="paid"))
+        await feed.catch_up()
+        assert _received(subscription, order) == ["created", "paid"]
+
+        # Örtüşme penceresi yeniden okunur ama aynı olay iki kez yayınlanmaz
+        await feed.catch_up()
+        assert _received(subscription, order) == []
+
+        # created_at'i watermark'tan eski, geç commit edilen olay yine yakalanır
+        db_session.add(
+            OrderEvent(order_id=order.id, type="shipped", created_at=feed.watermark - timedelta(seconds=2))
+        )
+        await db_session.commit()
+        await feed.catch_up()
+        assert _received(subscription, order) == ["shipped"]
+
+
+@pytest.mark.asyncio
+async def test_feed_resumes_from_cursor_and_skips_replayed_live_events(db_session: AsyncSession):
+    order = await _order(db_session)
+    created = order.events[0]
+    await update_order_status(db_session, order, OrderUpdateStatus(status="paid"))
+    await update_order_status(db_session, order, OrderUpdateStatus(status="shipped"))
+
+    stream = order_feed(
+        cursor=make_cursor(created.created_at, created.id), last_event_id=None, db=db_session, current_user=None
+    )
+    replayed = [await stream.__anext__() for _ in range(2)]
+    assert [e.event for e in replayed] == ["paid", "shipped"]
+    assert parse_cursor(replayed[-1].id)[1] == UUID(replayed[-1].data["id"])
+
+    # Geçmişte gönderilen olay canlı kanaldan da gelirse atlanır
+    pending = stream.__anext__()
+    broker.publish(TOPIC, "shipped", replayed[-1].data)
+    live = {**replayed[-1].data, "id": "live", "type": "delivered", "cursor": "c"}
+    broker.publish(TOPIC, "delivered", live)
+    assert (await pending).event == "delivered"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_feed_asks_for_reset_when_too_far_behind(db_session: AsyncSession, monkeypatch):
+    order = await _order(db_session)
+    created = order.events[0]
+    for status in ("paid", "shipped"):
+        await update_order_status(db_session, order, OrderUpdateStatus(status=status))
+    monkeypatch.setattr(settings, "ORDER_FEED_REPLAY_LIMIT", 1)
+
+    stream = order_feed(
+        cursor=make_cursor(created.created_at, created.id), last_event_id=None, db=db_session, current_user=None
+    )
+    assert (await stream.__anext__()).event == "reset"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+def test_create_all_installs_notify_trigger_on_postgres():
+    # init_db / create_all ile kurulan veritabanı da migration'daki NOTIFY trigger'ını alır
+    statements = []
+    engine = create_mock_engine(
+        "postgresql+asyncpg://", lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect)))
+    )
+    Base.metadata.create_all(engine, checkfirst=False)
+    ddl = " ".join(statements)
+    assert "FUNCTION notify_order_events()" in ddl
+    assert "CREATE TRIGGER order_events_notify AFTER INSERT ON order_events" in ddl
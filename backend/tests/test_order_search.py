@@ -0,0 +1,103 @@
+"""Order search filters on GET /orders/ and the indexes behind them."""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.order import order_search_conditions
+from app.db.explain import assert_no_seq_scan
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.models.variant import ProductVariant
+from app.schemas.order import OrderSearch
+
+
+@pytest.mark.asyncio
+async def test_order_search_filters_combine(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    tag = uuid.uuid4().hex[:8]
+    alice = User(email=f"alice-{tag}@example.com", hashed_password="x", full_name=f"Alice {tag}")
+    bob = User(email=f"bob-{tag}@example.com", hashed_password="x", full_name=f"Bob {tag}")
+    mug = Product(name="Search Kupa", sku=f"MUG-{tag}", price=Decimal("10"), stock=100)
+    shirt = Product(name="Search Tişört", sku=f"TSH-{tag}", price=Decimal("50"), stock=100)
+    db_session.add_all([alice, bob, mug, shirt])
+    await db_session.flush()
+    large = ProductVariant(product_id=shirt.id, name="L", sku=f"TSH-L-{tag}")
+    db_session.add(large)
+    await db_session.flush()
+
+    def order(user, status, total, day, product, variant=None, tracking=None):
+        o = Order(
+            user_id=user.id,
+            status=status,
+            total_amount=Decimal(total),
+            created_at=datetime(2026, 3, day, 12),
+            tracking_number=tracking,
+        )
+        o.items = [
+            OrderItem(
+                product_id=product.id,
+                variant_id=variant.id if variant else None,
+                quantity=1,
+                unit_price=Decimal(total),
+                line_total=Decimal(total),
+            )
+        ]
+        return o
+
+    orders = [
+        order(alice, "paid", "10", 1, mug),
+        order(alice, "shipped", "50", 5, shirt, large, tracking=f"TRK-{tag}"),
+        order(bob, "paid", "60", 10, shirt),
+        order(bob, "cancelled", "10", 20, mug),
+    ]
+    db_session.add_all(orders)
+    await db_session.commit()
+    ids = [str(o.id) for o in orders]
+
+    async def search(query: str) -> list[str]:
+        response = await client.get(f"/api/v1/orders/?limit=500&{query}", headers=admin_headers)
+        assert response.status_code == 200, response.text
+        return sorted(row["id"] for row in response.json() if row["id"] in ids)
+
+    assert await search(f"customer=alice-{tag.upper()}") == sorted(ids[:2])
+    assert await search(f"customer=Bob%20{tag}&status=paid") == [ids[2]]
+    assert await search(f"sku=TSH-L-{tag}") == [ids[1]]
+    assert await search(f"sku=TSH-{tag}") == sorted(ids[1:3])
+    assert await search(f"product_id={mug.id}&start_date=2026-03-02") == [ids[3]]
+    assert await search(f"tracking_number=TRK-{tag}") == [ids[1]]
+    assert await search(f"sku=MUG-{tag}&min_total=5&max_total=10&end_date=2026-03-19") == [ids[0]]
+    # Bitiş günü dahil; en büyük tarih taşmaz
+    assert await search(f"product_id={mug.id}&end_date=9999-12-31") == sorted([ids[0], ids[3]])
+    # LIKE jokerleri harfiyen aranır
+    assert await search(f"customer={tag}%25") == []
+
+    response = await client.get(
+        f"/api/v1/orders/?customer={tag}&status=paid,shipped&with_total=true", headers=admin_headers
+    )
+    assert response.headers["X-Total-Count"] == "3"
+
+    response = await client.get("/api/v1/orders/?min_total=20&max_total=10", headers=admin_headers)
+    assert response.status_code == 400
+    response = await client.get(
+        "/api/v1/orders/?start_date=2026-03-10&end_date=2026-03-01", headers=admin_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_order_search_uses_indexes(db_session: AsyncSession):
+    search = OrderSearch(
+        tracking_number="TRK-PLAN",
+        sku="SKU-PLAN",
+        statuses=["shipped"],
+        start=datetime(2026, 1, 1),
+    )
+    stmt = select(Order).where(*order_search_conditions(search)).limit(50)
+    await assert_no_seq_scan(db_session, stmt, "orders", "order_items", "products", "product_variants")
@@ -0,0 +1,105 @@
+"""Bulk price / activation rules."""
+import uuid
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.price_rule import PriceRuleRun
+from app.models.product import Product
+from app.models.variant import ProductVariant
+
+
+@pytest_asyncio.fixture
+async def catalog(db_session: AsyncSession):
+    category = Category(name=f"Sezon {uuid.uuid4().hex[:8]}")
+    db_session.add(category)
+    await db_session.flush()
+    coat = Product(name="Mont", price=Decimal("100.00"), stock=5, category_id=category.id)
+    scarf = Product(name="Atkı", price=Decimal("20.00"), stock=5, category_id=category.id)
+    other = Product(name="Kupa", price=Decimal("100.00"), stock=5)
+    db_session.add_all([coat, scarf, other])
+    await db_session.flush()
+    override = ProductVariant(product_id=coat.id, name="XL", price_override=Decimal("120.00"))
+    inherit = ProductVariant(product_id=coat.id, name="M")
+    db_session.add_all([override, inherit])
+    await db_session.commit()
+    return category, coat, scarf, other, override, inherit
+
+
+@pytest.mark.asyncio
+async def test_dry_run_previews_without_writing(
+    client: AsyncClient, db_session: AsyncSession, catalog, admin_headers: dict
+):
+    category, coat, scarf, *_ = catalog
+
+    response = await client.post(
+        "/api/v1/products/price-rules",
+        json={"filter": {"category_id": str(category.id)}, "percent": "-15", "ending": "0.99"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["dry_run"], body["products_matched"], body["variants_matched"]) == (True, 2, 1)
+    assert {row["name"]: Decimal(row["new_price"]) for row in body["sample"]} == {
+        "Mont": Decimal("85.99"),
+        "Atkı": Decimal("17.99"),
+    }
+
+    await db_session.refresh(coat)
+    assert coat.price == Decimal("100.00")
+
+
+@pytest.mark.asyncio
+async def test_apply_updates_filtered_products_and_overrides(
+    client: AsyncClient, db_session: AsyncSession, catalog, admin_headers: dict
+):
+    category, coat, scarf, other, override, inherit = catalog
+
+    response = await client.post(
+        "/api/v1/products/price-rules?dry_run=false",
+        json={
+            "filter": {"category_id": str(category.id), "min_price": "50"},
+            "percent": "-15",
+            "ending": "0.99",
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["products_matched"], body["variants_matched"]) == (1, 1)
+
+    for obj in (coat, scarf, other, override, inherit):
+        await db_session.refresh(obj)
+    assert (coat.price, scarf.price, other.price) == (Decimal("85.99"), Decimal("20.00"), Decimal("100.00"))
+    assert (override.price_override, inherit.price_override) == (Decimal("102.99"), None)
+
+    run = await db_session.get(PriceRuleRun, uuid.UUID(body["run_id"]))
+    assert run.rule["percent"] == "-15" and (run.products_updated, run.variants_updated) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_activation_rule_and_validation(
+    client: AsyncClient, db_session: AsyncSession, catalog, admin_headers: dict
+):
+    category, coat, scarf, *_ = catalog
+
+    response = await client.post(
+        "/api/v1/products/price-rules", json={"filter": {}, "percent": "10"}, headers=admin_headers
+    )
+    assert response.status_code == 422
+
+    response = await client.post(
+        "/api/v1/products/price-rules?dry_run=false",
+        json={"filter": {"category_id": str(category.id)}, "is_active": False},
+        headers=admin_headers,
+    )
+    assert response.json()["products_matched"] == 2
+    active = await db_session.scalars(
+        select(Product.is_active).where(Product.category_id == category.id)
+    )
+    assert set(active) == {False}
@@ -0,0 +1,109 @@
+"""Bulk product import: streaming CSV/JSONL, upsert by SKU, resumable jobs."""
+import json
+import os
+import uuid
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.product_import import claim_import_job, create_import_job
+from app.models.category import Category
+from app.models.inventory import InventoryMovement
+from app.models.product import Product
+from app.models.variant import ProductVariant
+from app.services.product_import import run_import_job
+
+
+async def _movements(db: AsyncSession, **filters) -> list[tuple[str, int]]:
+    stmt = select(InventoryMovement.reason, InventoryMovement.change).filter_by(**filters)
+    return [tuple(row) for row in await db.execute(stmt.order_by(InventoryMovement.created_at))]
+
+
+@pytest.mark.asyncio
+async def test_csv_import_creates_products_variants_and_reports_row_errors(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    tag = uuid.uuid4().hex[:8]
+    content = (
+        "sku,name,price,stock,category,variant_sku,variant_name,variant_stock,variant_attributes\n"
+        f'T-{tag},Tişört,99.90,0,Giyim {tag},T-{tag}-RM,Kırmızı / M,5,"{{""color"": ""Red""}}"\n'
+        f"T-{tag},Tişört,99.90,0,Giyim {tag},T-{tag}-BL,Mavi / L,3,\n"
+        f"K-{tag},Kupa,25,40,Mutfak {tag},,,,\n"
+        f"B-{tag},Bozuk,-1,5,,,,,\n"
+    )
+
+    response = await client.post(
+        "/api/v1/products/import",
+        files={"file": ("catalog.csv", content.encode(), "text/csv")},
+        headers=admin_headers,
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    job = (await client.get(f"/api/v1/products/import/{job_id}", headers=admin_headers)).json()
+    assert job["status"] == "completed"
+    assert (job["total_rows"], job["rows_processed"], job["error_count"]) == (4, 4, 1)
+    assert (job["products_created"], job["variants_created"]) == (2, 2)
+
+    errors = (await client.get(f"/api/v1/products/import/{job_id}/errors", headers=admin_headers)).json()
+    assert len(errors) == 1 and errors[0]["row_number"] == 4 and errors[0]["message"].startswith("price")
+
+    shirt = await db_session.scalar(select(Product).where(Product.sku == f"T-{tag}"))
+    category = await db_session.get(Category, shirt.category_id)
+    assert category.name == f"Giyim {tag}"
+    variants = (
+        await db_session.execute(
+            select(ProductVariant.sku, ProductVariant.stock, ProductVariant.attributes)
+            .where(ProductVariant.product_id == shirt.id)
+            .order_by(ProductVariant.sku)
+        )
+    ).all()
+    assert [tuple(v) for v in variants] == [
+        (f"T-{tag}-BL", 3, {}),
+        (f"T-{tag}-RM", 5, {"color": "Red"}),
+    ]
+    mug = await db_session.scalar(select(Product).where(Product.sku == f"K-{tag}"))
+    assert await _movements(db_session, product_id=mug.id) == [("initial", 40)]
+    assert await db_session.scalar(select(Product).where(Product.sku == f"B-{tag}")) is None
+
+
+@pytest.mark.asyncio
+async def test_interrupted_jsonl_import_resumes_from_checkpoint_and_upserts(
+    db_session: AsyncSession, tmp_path
+):
+    tag = uuid.uuid4().hex[:8]
+    existing = Product(name="Eski", sku=f"E-{tag}", price=Decimal("10"), stock=10)
+    db_session.add(existing)
+    await db_session.commit()
+
+    path = tmp_path / "catalog.jsonl"
+    lines = [
+        {"sku": f"S-{tag}", "name": "Checkpoint öncesi", "price": "1"},
+        {"sku": f"E-{tag}", "name": "Yeni ad", "price": "12.5", "stock": 7},
+        "{bozuk",
+        {"sku": f"N-{tag}", "name": "Yeni", "price": "3", "stock": 2},
+    ]
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n\n")
+
+    job = await create_import_job(db_session, path=str(path), format="jsonl")
+    # İlk satır commit edildikten sonra worker ölmüş gibi
+    job.rows_processed = 1
+    await db_session.commit()
+
+    session_maker = sessionmaker(db_session.bind, class_=type(db_session), expire_on_commit=False)
+    await run_import_job(session_maker, job.id, chunk_size=1)
+
+    await db_session.refresh(job)
+    assert (job.status, job.total_rows, job.rows_processed, job.error_count) == ("completed", 4, 4, 1)
+    assert (job.products_created, job.products_updated) == (1, 1)
+    assert not os.path.exists(path)
+    assert not await claim_import_job(db_session, job.id)
+
+    assert await db_session.scalar(select(Product).where(Product.sku == f"S-{tag}")) is None
+    await db_session.refresh(existing)
+    assert (existing.name, existing.price, existing.stock) == ("Yeni ad", Decimal("12.50"), 7)
+    assert (await _movements(db_session, product_id=existing.id))[-1] == ("adjustment", -3)
@@ -0,0 +1,33 @@
+"""Query budget tests for hot endpoints."""
+import pytest
+from httpx import AsyncClient
+
+from app.db.instrumentation import assert_max_queries
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client: AsyncClient):
+    """Every response carries the per-request DB timing."""
+    response = await client.get("/health")
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="0 queries"' in response.headers["server-timing"]
+
+
+@pytest.mark.asyncio
+async def test_stats_overview_query_budget(client: AsyncClient, admin_headers: dict):
+    with assert_max_queries(6):
+        response = await client.get("/api/v1/stats/overview", headers=admin_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_orders_list_query_budget(client: AsyncClient, admin_headers: dict):
+    with assert_max_queries(4):
+        response = await client.get("/api/v1/orders/", headers=admin_headers)
+    assert response.status_code == 200
+
+
+def test_assert_max_queries_reports_overrun():
+    with pytest.raises(AssertionError, match="at most 0 queries, got 1"):
+        with assert_max_queries(0) as stats:
+            stats.record("SELECT 1", 0.001)
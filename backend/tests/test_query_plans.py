@@ -0,0 +1,113 @@
+"""EXPLAIN-based guards: hot queries must not fall back to sequential scans."""
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.crud.inventory import latest_snapshot_query
+from app.db.explain import assert_no_seq_scan, explain
+from app.models.inventory import InventoryMovement
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+
+
+@pytest_asyncio.fixture
+async def seeded(db_session: AsyncSession):
+    user = User(email=f"plans-{uuid.uuid4()}@example.com", hashed_password="x", full_name="Plans")
+    product = Product(name="Plan Product", price=Decimal("10"), stock=100)
+    db_session.add_all([user, product])
+    await db_session.flush()
+
+    start = datetime(2026, 1, 1)
+    for i in range(50):
+        order = Order(
+            user_id=user.id,
+            status="paid" if i % 3 else "cancelled",
+            total_amount=Decimal("10"),
+            created_at=start + timedelta(days=i),
+        )
+        db_session.add(order)
+        await db_session.flush()
+        db_session.add(
+            OrderItem(
+                order_id=order.id,
+                product_id=product.id,
+                quantity=1,
+                unit_price=Decimal("10"),
+                line_total=Decimal("10"),
+            )
+        )
+        db_session.add(
+            InventoryMovement(product_id=product.id, change=-1, reason="order", ref_order_id=order.id)
+        )
+    await db_session.commit()
+    return user, product
+
+
+@pytest.mark.asyncio
+async def test_orders_by_user_uses_indexes(db_session: AsyncSession, seeded):
+    user, _ = seeded
+    stmt = (
+        select(Order)
+        .where(Order.user_id == user.id)
+        .options(selectinload(Order.items), selectinload(Order.events))
+        .order_by(Order.created_at.desc())
+        .limit(50)
+    )
+    await assert_no_seq_scan(db_session, stmt, "orders", "order_items", "order_events")
+
+
+@pytest.mark.asyncio
+async def test_product_delete_check_uses_index(db_session: AsyncSession, seeded):
+    _, product = seeded
+    stmt = select(OrderItem.id).where(OrderItem.product_id == product.id).limit(1)
+    await assert_no_seq_scan(db_session, stmt, "order_items")
+
+
+@pytest.mark.asyncio
+async def test_top_products_date_range_uses_indexes(db_session: AsyncSession, seeded):
+    stmt = (
+        select(Product.id, func.sum(OrderItem.line_total))
+        .join(OrderItem, Product.id == OrderItem.product_id)
+        .join(Order, OrderItem.order_id == Order.id)
+        .where(
+            Order.status.notin_(["cancelled", "refunded"]),
+            Order.created_at >= datetime(2026, 1, 10),
+            Order.created_at <= datetime(2026, 1, 20),
+        )
+        .group_by(Product.id)
+    )
+    await assert_no_seq_scan(db_session, stmt, "orders", "order_items")
+
+
+@pytest.mark.asyncio
+async def test_latest_inventory_movements_use_index(db_session: AsyncSession, seeded):
+    stmt = select(InventoryMovement).order_by(InventoryMovement.created_at.desc()).limit(50)
+    await assert_no_seq_scan(db_session, stmt, "inventory_movements")
+
+
+@pytest.mark.asyncio
+async def test_stock_at_snapshot_lookup_uses_index(db_session: AsyncSession, seeded):
+    _, product = seeded
+    at = datetime(2026, 3, 1)
+    for variant_id in (None, uuid.uuid4()):
+        stmt = latest_snapshot_query(at, product.id, variant_id)
+        await assert_no_seq_scan(db_session, stmt, "stock_snapshots")
+        plan = await explain(db_session, stmt)
+        assert "ix_stock_snapshots_product_variant_taken_at" in plan[0].plan
+
+
+@pytest.mark.asyncio
+async def test_seq_scan_is_detected(db_session: AsyncSession, seeded):
+    """Index'i olmayan bir filtre harness tarafından yakalanmalı."""
+    stmt = select(Order).where(Order.carrier == "Yurtiçi")
+    plans = await explain(db_session, stmt)
+    assert plans[0].seq_scans == ["orders"]
+    with pytest.raises(AssertionError, match="Sequential scan on orders"):
+        await assert_no_seq_scan(db_session, stmt, "orders")
@@ -0,0 +1,39 @@
+"""Tests for read replica routing."""
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.session import ReadReplica, async_session_maker, pick_read_session_maker
+
+
+class BrokenReplica(ReadReplica):
+    async def measure_lag(self) -> float:
+        raise ConnectionError("replica down")
+
+
+class LaggingReplica(ReadReplica):
+    async def measure_lag(self) -> float:
+        return 3600.0
+
+
+@pytest.mark.asyncio
+async def test_without_replicas_uses_primary():
+    assert await pick_read_session_maker([]) is async_session_maker
+
+
+@pytest.mark.asyncio
+async def test_fresh_replica_is_used():
+    replica = ReadReplica(create_async_engine("sqlite+aiosqlite://"))
+    assert await pick_read_session_maker([replica]) is replica.session_maker
+    await replica.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_broken_replicas_fall_back_to_primary():
+    replicas = [
+        BrokenReplica(create_async_engine("sqlite+aiosqlite://")),
+        LaggingReplica(create_async_engine("sqlite+aiosqlite://")),
+    ]
+    assert await pick_read_session_maker(replicas) is async_session_maker
+    assert not any(r.healthy for r in replicas)
+    for replica in replicas:
+        await replica.engine.dispose()
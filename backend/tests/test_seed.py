@@ -0,0 +1,132 @@
+"""Tests for the synthetic dataset generator."""
+from datetime import date
+
+import pytest
+from sqlalchemy import JSON, func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.bulk_copy import copy_records
+from app.db import seed as seed_module
+from app.db.seed import SEED_TABLES, BulkWriter, DatasetGenerator, SeedConfig, ZipfSampler, seed, seed_months
+from app.models.category import Category
+from app.models.order import Order
+from app.models.product import Product
+from app.models.user import User
+from app.models.variant import ProductVariant
+
+CATALOG_TABLES = (User.__table__, Category.__table__, Product.__table__, ProductVariant.__table__)
+
+
+async def _seed_and_read(path, config: SeedConfig):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        counts = await seed(engine, config)
+        async with engine.connect() as conn:
+            orders = (
+                await conn.execute(select(Order.id, Order.total_amount).order_by(Order.id))
+            ).all()
+            stock = (await conn.execute(select(func.sum(Product.stock)))).scalar_one()
+    finally:
+        await engine.dispose()
+    return counts, orders, stock
+
+
+@pytest.mark.asyncio
+async def test_seed_is_deterministic(tmp_path):
+    config = SeedConfig(users=20, products=15, orders=60, categories=3, batch_size=25, seed=7)
+
+    counts, first, first_stock = await _seed_and_read(tmp_path / "a.db", config)
+    _, second, second_stock = await _seed_and_read(tmp_path / "b.db", config)
+
+    assert counts["orders"] == 60
+    assert counts["users"] == 20
+    assert counts["order_items"] >= 60
+    assert first == second
+    assert first_stock == second_stock
+
+
+@pytest.mark.asyncio
+async def test_seed_differs_by_seed(tmp_path):
+    base = dict(users=10, products=10, orders=20, categories=2)
+    _, first, _ = await _seed_and_read(tmp_path / "a.db", SeedConfig(**base, seed=1))
+    _, second, _ = await _seed_and_read(tmp_path / "b.db", SeedConfig(**base, seed=2))
+    assert first != second
+
+
+@pytest.mark.asyncio
+async def test_copy_records_for_every_seeded_table(tmp_path):
+    # Postgres COPY yolu: asyncpg'ye giden kayıtlar her tablo için kurulabilmeli
+    config = SeedConfig(users=5, products=10, orders=20, categories=2, variant_product_ratio=1.0, seed=3)
+    generator = DatasetGenerator(config)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'c.db'}")
+    try:
+        async with engine.connect() as connection:
+            writer = BulkWriter(connection)
+            catalog = await generator.generate_catalog(writer)
+            products = ZipfSampler(config.products, config.product_zipf_s, generator.rng)
+            customers = ZipfSampler(config.users, config.customer_zipf_s, generator.rng)
+            for _ in range(config.orders):
+                generator.generate_order(writer, catalog, products, customers)
+            await generator.generate_initial_movements(writer, catalog)
+    finally:
+        await engine.dispose()
+
+    for table in SEED_TABLES:
+        rows = writer.buffers.get(table)
+        assert rows, table.name
+        columns, records = copy_records(rows)
+        assert set(columns) <= set(table.c.keys())
+        for record in records:
+            for name, value in zip(columns, record):
+                assert not isinstance(value, (dict, list)), (table.name, name)
+                if isinstance(table.c[name].type, JSON) and value is not None:
+                    assert isinstance(value, str), (table.name, name)
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_written_in_batches(tmp_path, monkeypatch):
+    config = SeedConfig(users=30, products=40, orders=10, categories=3, batch_size=8, seed=5)
+    peaks = []
+    flush = BulkWriter.flush
+
+    async def tracking_flush(self):
+        catalog_rows = sum(len(rows) for table, rows in self.buffers.items() if table in CATALOG_TABLES)
+        if catalog_rows:
+            peaks.append(catalog_rows)
+        await flush(self)
+
+    monkeypatch.setattr(BulkWriter, "flush", tracking_flush)
+    counts, _, _ = await _seed_and_read(tmp_path / "b.db", config)
+
+    # Katalog tek seferde değil, batch_size'lık parçalarla yazılır
+    assert len(peaks) > (config.users + config.products) // config.batch_size
+    # Bir ürün ve varyantları aynı parçada kalır; tampon batch'i en fazla bir ürün kadar aşar
+    assert max(peaks) < config.batch_size + config.max_variants_per_product + 1
+    assert counts["users"] == 30
+    assert counts["products"] == 40
+
+    _, batched, batched_stock = await _seed_and_read(tmp_path / "a.db", config)
+    _, whole, whole_stock = await _seed_and_read(
+        tmp_path / "w.db", SeedConfig(users=30, products=40, orders=10, categories=3, seed=5)
+    )
+    assert batched == whole
+    assert batched_stock == whole_stock
+
+
+@pytest.mark.asyncio
+async def test_seed_opens_movement_partitions(tmp_path, monkeypatch):
+    calls = []
+
+    async def record(connection, table, months, with_default=False):
+        calls.append((table, list(months), with_default))
+        return []
+
+    monkeypatch.setattr(seed_module, "ensure_month_partitions", record)
+    config = SeedConfig(
+        users=3, products=3, orders=5, categories=1, start=date(2024, 1, 1), end=date(2024, 3, 15)
+    )
+    await _seed_and_read(tmp_path / "p.db", config)
+
+    months = [date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert seed_months(config) == months
+    assert calls == [("inventory_movements", months, True)]
@@ -0,0 +1,60 @@
+"""Fast list serialization must stay byte-identical to FastAPI's response_model path."""
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.serialization import dump_list, list_adapter
+from app.crud.order import create_order, get_orders
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderOut
+from app.schemas.product import ProductOut
+
+
+async def _default_json(model, rows) -> bytes:
+    field = create_model_field(name="Response", type_=list[model], mode="serialization")
+    content = await serialize_response(field=field, response_content=rows, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+@pytest.mark.asyncio
+async def test_dump_list_matches_response_model_output(db_session: AsyncSession):
+    user = User(email=f"serialize-{uuid.uuid4()}@example.com", hashed_password="x", full_name="Şule Çağ")
+    product = Product(name="Türkçe ürün ğüşiöç", price=Decimal("19.90"), stock=50)
+    db_session.add_all([user, product])
+    await db_session.commit()
+    for quantity in (1, 3):
+        await create_order(
+            db_session,
+            OrderCreate(
+                user_id=user.id,
+                items=[OrderItemCreate(product_id=product.id, quantity=quantity)],
+            ),
+        )
+
+    orders = await get_orders(db_session, limit=50)
+    assert orders
+    assert dump_list(OrderOut, orders) == await _default_json(OrderOut, orders)
+    await db_session.refresh(product)
+    assert dump_list(ProductOut, [product]) == await _default_json(ProductOut, [product])
+
+
+def test_list_adapter_is_cached():
+    assert list_adapter(OrderOut) is list_adapter(OrderOut)
+
+
+@pytest.mark.asyncio
+async def test_orders_endpoint_uses_compact_json(client: AsyncClient, admin_headers: dict):
+    response = await client.get("/api/v1/orders/", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == json.dumps(
+        response.json(), ensure_ascii=False, separators=(",", ":")
+    ).encode()
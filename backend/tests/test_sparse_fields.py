@@ -0,0 +1,75 @@
+"""Sparse fieldsets (?fields=) on order, product and variant reads."""
+import uuid
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.order import create_order
+from app.db.instrumentation import collect_queries
+from app.models.product import Product
+from app.models.variant import ProductVariant
+from app.schemas.order import OrderCreate, OrderItemCreate
+
+
+@pytest.mark.asyncio
+async def test_order_fields_skip_relationship_loads(
+    client: AsyncClient, db_session: AsyncSession, admin_headers: dict
+):
+    product = Product(name="Fields Kupa", price=Decimal("10"), stock=10)
+    db_session.add(product)
+    await db_session.commit()
+    order = await create_order(
+        db_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=1)])
+    )
+
+    with collect_queries() as stats:
+        response = await client.get("/api/v1/orders/?fields=status,total_amount", headers=admin_headers)
+    assert response.status_code == 200
+    assert all(set(row) == {"id", "status", "total_amount"} for row in response.json())
+    statements = " ".join(stats.statements)
+    assert "order_items" not in statements and "order_events" not in statements
+    assert "orders.carrier" not in statements
+
+    response = await client.get(f"/api/v1/orders/{order.id}?fields=items", headers=admin_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"id", "items"}
+    assert body["items"][0]["quantity"] == 1
+
+    # Alan verilmezse yanıt değişmez
+    response = await client.get(f"/api/v1/orders/{order.id}", headers=admin_headers)
+    assert {"items", "events", "carrier"} <= set(response.json())
+
+    response = await client.get("/api/v1/orders/?fields=status,password", headers=admin_headers)
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_product_and_variant_fields(client: AsyncClient, db_session: AsyncSession, admin_headers: dict):
+    product = Product(name="Fields Mont", description="Uzun açıklama", price=Decimal("100"), stock=3)
+    db_session.add(product)
+    await db_session.flush()
+    db_session.add(ProductVariant(product_id=product.id, name="XL", sku=f"FLD-{uuid.uuid4().hex[:8]}"))
+    await db_session.commit()
+
+    with collect_queries() as stats:
+        response = await client.get(f"/api/v1/products/{product.id}?fields=name,price", headers=admin_headers)
+    body = response.json()
+    assert set(body) == {"id", "name", "price"}
+    assert Decimal(body["price"]) == Decimal("100")
+    assert "products.description" not in " ".join(stats.statements)
+
+    response = await client.get("/api/v1/products/?fields=name&limit=500", headers=admin_headers)
+    assert all(set(row) == {"id", "name"} for row in response.json())
+
+    response = await client.get(
+        f"/api/v1/products/{product.id}/variants?fields=sku,stock", headers=admin_headers
+    )
+    assert [set(row) for row in response.json()] == [{"id", "sku", "stock"}]
+    variant_id = response.json()[0]["id"]
+
+    response = await client.get(f"/api/v1/variants/{variant_id}?fields=name", headers=admin_headers)
+    assert response.json() == {"id": variant_id, "name": "XL"}
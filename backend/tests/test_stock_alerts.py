@@ -0,0 +1,147 @@
+"""Per-SKU reorder thresholds and the low-stock alert stream."""
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.routes_inventory import stream_stock_alerts
+from app.crud.inventory import adjust_product_stock, get_low_stock_products, get_stock_alert_feed
+from app.crud.order import create_order
+from app.models.product import Product
+from app.models.variant import ProductVariant
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.events import EventBroker, SubscriptionOverflow
+from app.services.feed import make_cursor
+from app.services.stock_alerts import TOPIC, StockAlertFeed
+
+
+async def _product(db: AsyncSession, stock: int, threshold: int = 10) -> Product:
+    product = Product(
+        name=f"Alert {uuid.uuid4().hex[:8]}", price=Decimal("5"), stock=stock, reorder_threshold=threshold
+    )
+    db.add(product)
+    await db.commit()
+    return product
+
+
+async def _feed(db: AsyncSession, local: EventBroker) -> StockAlertFeed:
+    feed = StockAlertFeed(sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False), local)
+    await feed.prime()
+    return feed
+
+
+def _drain(subscription, product: Product) -> list[tuple[str, int]]:
+    events = []
+    while not subscription.queue.empty():
+        event = subscription.queue.get_nowait()
+        if event.data["product_id"] == str(product.id):
+            events.append((event.type, event.data["stock"]))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_low_stock_uses_per_sku_threshold(db_session: AsyncSession):
+    relaxed = await _product(db_session, stock=5, threshold=3)
+    strict = await _product(db_session, stock=5, threshold=5)
+
+    ids = {p.id for p in await get_low_stock_products(db_session)}
+    assert strict.id in ids and relaxed.id not in ids
+
+    # Sabit eşik verilirse eski davranış
+    ids = {p.id for p in await get_low_stock_products(db_session, threshold=10)}
+    assert {strict.id, relaxed.id} <= ids
+
+
+@pytest.mark.asyncio
+async def test_adjustment_publishes_only_threshold_crossings(db_session: AsyncSession):
+    product = await _product(db_session, stock=12, threshold=10)
+    local = EventBroker()
+    feed = await _feed(db_session, local)
+    received = []
+    with local.subscribe([TOPIC]) as subscription:
+        for change in (-1, -2, -1, 10):  # 11: üstünde, 9: eşik geçildi, 8: zaten altında, 18: toparlandı
+            await adjust_product_stock(db_session, product.id, change, "sayım")
+            await feed.catch_up()
+            received += _drain(subscription, product)
+    assert received == [("low_stock", 9), ("restocked", 18)]
+    assert local.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_order_crossing_is_published_after_commit(db_session: AsyncSession):
+    product = await _product(db_session, stock=4, threshold=2)
+    local = EventBroker()
+    feed = await _feed(db_session, local)
+    with local.subscribe([TOPIC]) as subscription:
+        await create_order(
+            db_session, OrderCreate(items=[OrderItemCreate(product_id=product.id, quantity=3)])
+        )
+        await feed.catch_up()
+        assert _drain(subscription, product) == [("low_stock", 1)]
+
+        # Rollback edilen değişiklik yayınlanmaz
+        product.stock = 20
+        await db_session.flush()
+        await db_session.rollback()
+        await feed.catch_up()
+        assert _drain(subscription, product) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_core_updates_are_covered(db_session: AsyncSession):
+    product = await _product(db_session, stock=50, threshold=5)
+    variant = ProductVariant(product_id=product.id, sku=f"ALERT-{uuid.uuid4().hex[:8]}", name="V", stock=15)
+    db_session.add(variant)
+    await db_session.commit()
+    local = EventBroker()
+    feed = await _feed(db_session, local)
+    with local.subscribe([TOPIC]) as subscription:
+        # ORM'siz toplu UPDATE'ler (içe aktarım, fiyat kuralı, başka worker) da uyarı üretir
+        await db_session.execute(update(Product).where(Product.id == product.id).values(stock=3))
+        await db_session.execute(
+            update(ProductVariant).where(ProductVariant.id == variant.id).values(reorder_threshold=20)
+        )
+        await db_session.commit()
+        await feed.catch_up()
+        events = [subscription.queue.get_nowait() for _ in range(subscription.queue.qsize())]
+    mine = {(e.data["kind"], e.type, e.data["stock"]) for e in events if e.data["product_id"] == str(product.id)}
+    assert mine == {("product", "low_stock", 3), ("variant", "low_stock", 15)}
+
+
+@pytest.mark.asyncio
+async def test_alert_stream_resumes_from_cursor(db_session: AsyncSession):
+    product = await _product(db_session, stock=12, threshold=10)
+    await adjust_product_stock(db_session, product.id, -5, "sayım")
+    # SQLite trigger'ının zaman damgası milisaniye çözünürlüklü
+    await asyncio.sleep(0.002)
+    await adjust_product_stock(db_session, product.id, 5, "tedarik")
+    alerts = [
+        row
+        for row in await get_stock_alert_feed(db_session, limit=100000)
+        if row["product_id"] == product.id
+    ]
+    assert [row["type"] for row in alerts] == ["low_stock", "restocked"]
+
+    first = alerts[0]
+    stream = stream_stock_alerts(
+        cursor=make_cursor(first["created_at"], first["id"]), last_event_id=None, db=db_session, current_user=None
+    )
+    replayed = await stream.__anext__()
+    assert (replayed.event, replayed.data["stock"]) == ("restocked", 12)
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_overflows_without_blocking_publisher():
+    local = EventBroker()
+    with local.subscribe(["inventory"], max_queue=2) as subscription:
+        for i in range(5):
+            local.publish("inventory", "low_stock", {"n": i})
+        assert [(await subscription.get()).data["n"] for _ in range(2)] == [0, 1]
+        with pytest.raises(SubscriptionOverflow):
+            await subscription.get()
+    assert local.subscriber_count == 0
@@ -0,0 +1,182 @@
+"""TTL stock reservations for unpaid orders."""
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.inventory import release_expired_reservations
+from app.crud.order import confirm_order_payment, create_order, update_order_status
+from app.crud.payment import create_payment
+from app.models.inventory import InventoryMovement, OrderEvent, StockReservation
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderUpdateStatus
+
+
+async def _pending_order(db: AsyncSession, *products: Product, quantity: int = 2):
+    return await create_order(
+        db,
+        OrderCreate(items=[OrderItemCreate(product_id=p.id, quantity=quantity) for p in products]),
+    )
+
+
+async def _products(db: AsyncSession, count: int = 1) -> list[Product]:
+    products = [Product(name=f"Reserved {i}", price=Decimal("10"), stock=10) for i in range(count)]
+    db.add_all(products)
+    await db.commit()
+    return products
+
+
+async def _reservations(db: AsyncSession, order_id) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(StockReservation).where(StockReservation.order_id == order_id)
+    )
+
+
+async def _release_all(db: AsyncSession, batch_size: int = 500) -> None:
+    later = datetime.utcnow() + timedelta(minutes=settings.STOCK_RESERVATION_TTL_MINUTES + 1)
+    while await release_expired_reservations(db, now=later, batch_size=batch_size):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_expired_reservation_releases_stock_and_cancels(db_session: AsyncSession):
+    first, second = await _products(db_session, 2)
+    order = await _pending_order(db_session, first, second)
+    assert await _reservations(db_session, order.id) == 2
+
+    # Süresi dolmamış rezervasyona dokunulmaz
+    await release_expired_reservations(db_session, batch_size=500)
+    await db_session.refresh(order)
+    await db_session.refresh(first)
+    assert (order.status, first.stock) == ("pending", 8)
+
+    # batch_size=1 olsa bile sipariş yarım bırakılmaz
+    await _release_all(db_session, batch_size=1)
+    await db_session.refresh(order)
+    await db_session.refresh(first)
+    await db_session.refresh(second)
+    assert order.status == "cancelled"
+    assert (first.stock, second.stock) == (10, 10)
+    assert await _reservations(db_session, order.id) == 0
+
+    reasons = (
+        await db_session.execute(
+            select(InventoryMovement.reason, InventoryMovement.change).where(
+                InventoryMovement.ref_order_id == order.id
+            )
+        )
+    ).all()
+    assert sorted(reasons) == sorted(
+        [("order", -2), ("order", -2), ("reservation_expired", 2), ("reservation_expired", 2)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_payment_converts_reservation(db_session: AsyncSession):
+    (product,) = await _products(db_session)
+    order = await _pending_order(db_session, product)
+
+    assert await confirm_order_payment(db_session, order.id)
+    assert await _reservations(db_session, order.id) == 0
+
+    await _release_all(db_session)
+    await db_session.refresh(order)
+    await db_session.refresh(product)
+    assert order.status == "paid"
+    assert product.stock == 8
+
+    # İkinci onay (ör. tekrar gelen webhook) bir şey değiştirmez
+    assert not await confirm_order_payment(db_session, order.id)
+
+
+@pytest.mark.asyncio
+async def test_webhook_after_expiry_does_not_resurrect_order(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(settings, "STRIPE_SECRET_KEY", "sk_test_reservations")
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", "whsec_reservations")
+    (product,) = await _products(db_session)
+
+    async def post_succeeded(intent_id: str):
+        payload = json.dumps(
+            {
+                "id": f"evt_{uuid.uuid4().hex}",
+                "object": "event",
+                "type": "payment_intent.succeeded",
+                "data": {"object": {"id": intent_id, "object": "payment_intent"}},
+            }
+        )
+        timestamp = int(time.time())
+        signature = hmac.new(
+            b"whsec_reservations", f"{timestamp}.{payload}".encode(), hashlib.sha256
+        ).hexdigest()
+        return await client.post(
+            "/api/v1/payments/webhook",
+            content=payload,
+            headers={
+                "Stripe-Signature": f"t={timestamp},v1={signature}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    intent_paid, intent_late = f"pi_{uuid.uuid4().hex}", f"pi_{uuid.uuid4().hex}"
+    paid = await _pending_order(db_session, product, quantity=1)
+    await create_payment(db_session, paid.id, paid.total_amount, intent_id=intent_paid)
+
+    response = await post_succeeded(intent_paid)
+    assert response.status_code == 200
+    await db_session.refresh(paid)
+    assert paid.status == "paid"
+    assert await _reservations(db_session, paid.id) == 0
+
+    late = await _pending_order(db_session, product, quantity=1)
+    await create_payment(db_session, late.id, late.total_amount, intent_id=intent_late)
+    await _release_all(db_session)
+
+    response = await post_succeeded(intent_late)
+    assert response.status_code == 200
+    await db_session.refresh(late)
+    await db_session.refresh(product)
+    assert late.status == "cancelled"
+    assert product.stock == 9  # sadece ödenen siparişin düşüşü kalıcı
+
+    events = (
+        await db_session.execute(select(OrderEvent.type).where(OrderEvent.order_id == late.id))
+    ).scalars().all()
+    assert "payment_after_cancel" in events
+
+
+@pytest.mark.asyncio
+async def test_manual_cancel_releases_reservation(db_session: AsyncSession):
+    first, second = await _products(db_session, 2)
+    cancelled = await _pending_order(db_session, first)
+    paid = await _pending_order(db_session, second)
+
+    await update_order_status(db_session, cancelled, OrderUpdateStatus(status="cancelled"))
+    await update_order_status(db_session, paid, OrderUpdateStatus(status="paid"))
+    await db_session.refresh(first)
+    await db_session.refresh(second)
+    # İptal stoğu geri verir; ödenen siparişin düşüşü kalıcıdır
+    assert (first.stock, second.stock) == (10, 8)
+    assert await _reservations(db_session, cancelled.id) == 0
+    assert await _reservations(db_session, paid.id) == 0
+
+    movements = await db_session.execute(
+        select(InventoryMovement.reason, InventoryMovement.change).where(
+            InventoryMovement.ref_order_id == cancelled.id
+        )
+    )
+    assert sorted(movements.all()) == [("order", -2), ("reservation_released", 2)]
+    # Sweeper aynı stoğu ikinci kez geri vermez
+    await _release_all(db_session)
+    await db_session.refresh(first)
+    assert first.stock == 10